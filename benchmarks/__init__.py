@@ -0,0 +1 @@
+# Suíte de benchmarks de sort/, search/ e hash/ (python -m benchmarks)
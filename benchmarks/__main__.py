@@ -0,0 +1,142 @@
+"""
+Suíte de benchmarks de sort/, search/ e hash/.
+
+Uso (a partir da raiz do projeto):
+    python -m benchmarks executar [--grupos sort search hash] [--algoritmos merge ...]
+                                  [--entradas aleatoria ...] [--tipos int str ...]
+                                  [--tamanhos 100 1000 ...]
+                                  [--repeticoes 7] [--aquecimento 1] [--tempo-max 10]
+                                  [--saida resultados.json]
+    python -m benchmarks comparar antigo.json novo.json [--limiar 0.1]
+    python -m benchmarks adaptativo resultados.json [--limite 1.5]
+    python -m benchmarks paralelo [--tamanhos 10000 ...] [--processos 1 2 4 ...] [--tipo int]
+
+O comando comparar termina com código 1 se houver alguma regressão; o comando
+adaptativo, se a ordenação adaptativa passar do limite em relação à melhor
+escolha fixa de alguma entrada.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.comparacao import REGRESSAO, ESTAVEL, carregar, comparar, comparar_com_melhor
+from benchmarks.paralelo import medir_aceleracao
+from benchmarks.suite import ENTRADAS_SORT, TAMANHOS, TIPOS_SORT, executar, selecionar
+
+
+def _formatar_ns(ns):
+    for unidade, escala in (("s", 1e9), ("ms", 1e6), ("µs", 1e3)):
+        if ns >= escala:
+            return f"{ns / escala:.3f} {unidade}"
+    return f"{ns:.0f} ns"
+
+
+def _entrada(resultado):
+    tipo = resultado.get("tipo")
+    return resultado["entrada"] + (f" ({tipo})" if tipo and tipo != "int" else "")
+
+
+def _exibir(resultado):
+    prefixo = f"{resultado['grupo']:<7}{resultado['algoritmo']:<30}{_entrada(resultado):<31}{resultado['n']:>10,}"
+    if "erro" in resultado:
+        print(f"{prefixo}   ERRO: {resultado['erro']}", flush=True)
+    else:
+        print(f"{prefixo}{_formatar_ns(resultado['mediana_ns']):>14}  IQR {_formatar_ns(resultado['iqr_ns']):>12}"
+              f"  ({resultado['repeticoes']}x)", flush=True)
+
+
+def _executar(argumentos):
+    casos = selecionar(argumentos.grupos, argumentos.algoritmos)
+    if not casos:
+        print("Nenhum caso corresponde aos filtros.", file=sys.stderr)
+        return 2
+    print(f"{'grupo':<7}{'algoritmo':<30}{'entrada':<31}{'n':>10}{'mediana':>14}")
+    resultados = executar(casos, argumentos.tamanhos, argumentos.entradas, argumentos.repeticoes,
+                          argumentos.aquecimento, argumentos.tempo_max, argumentos.semente, _exibir,
+                          argumentos.tipos)
+    if argumentos.saida:
+        with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=1)
+        print(f"Resultados gravados em {argumentos.saida}")
+    return 0
+
+
+def _comparar(argumentos):
+    comparacoes = comparar(carregar(argumentos.antigo), carregar(argumentos.novo), argumentos.limiar)
+    regressoes = 0
+    for c in comparacoes:
+        if c["situacao"] == ESTAVEL and not argumentos.todos:
+            continue
+        razao = f"{c['razao']:.2f}x" if c["razao"] is not None else "-"
+        print(f"{c['situacao']:<11}{c['grupo']:<7}{c['algoritmo']:<30}{_entrada(c):<31}{c['n']:>10,}{razao:>9}")
+        regressoes += c["situacao"] == REGRESSAO
+    print(f"{len(comparacoes)} casos comparados, {regressoes} regressões.")
+    return 1 if regressoes else 0
+
+
+def _adaptativo(argumentos):
+    comparacoes = comparar_com_melhor(carregar(argumentos.resultados))
+    acima = 0
+    for c in comparacoes:
+        marca = " <" if c["razao"] > argumentos.limite else ""
+        print(f"{_entrada(c):<31}{c['n']:>10,}  {c['melhor']:<30}{c['razao']:>7.2f}x{marca}")
+        acima += c["razao"] > argumentos.limite
+    print(f"{len(comparacoes)} entradas, {acima} acima de {argumentos.limite:.2f}x a melhor escolha fixa.")
+    return 1 if acima else 0
+
+
+def _paralelo(argumentos):
+    print(f"{'n':>10}{'processos':>11}{'mediana':>14}{'aceleração':>12}")
+    exibir = lambda r: print(f"{r['n']:>10,}{r['processos']:>11}{_formatar_ns(r['mediana_ns']):>14}"
+                             f"{r['aceleracao']:>11.2f}x", flush=True)
+    dados = medir_aceleracao(argumentos.tamanhos, argumentos.processos, argumentos.tipo,
+                             repeticoes=argumentos.repeticoes, ao_medir=exibir)
+    limite = dados["limite_sugerido"]
+    print(f"{dados['nucleos']} núcleos; limite serial sugerido: "
+          + (f"{limite:,} elementos" if limite else "a versão paralela não venceu a serial"))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0].strip())
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    p = comandos.add_parser("executar", help="executa os benchmarks")
+    p.add_argument("--grupos", nargs="+", choices=["sort", "search", "hash"])
+    p.add_argument("--algoritmos", nargs="+", help="trechos do nome dos algoritmos")
+    p.add_argument("--entradas", nargs="+", help="formatos de entrada (ordenação: " + ", ".join(ENTRADAS_SORT) + ")")
+    p.add_argument("--tipos", nargs="+", choices=TIPOS_SORT, default=["int"], help="tipos dos valores a ordenar")
+    p.add_argument("--tamanhos", nargs="+", type=int, default=list(TAMANHOS))
+    p.add_argument("--repeticoes", type=int, default=7)
+    p.add_argument("--aquecimento", type=int, default=1)
+    p.add_argument("--tempo-max", type=float, default=10.0, help="orçamento em segundos por medição")
+    p.add_argument("--semente", type=int, default=42)
+    p.add_argument("--saida", help="arquivo JSON para os resultados")
+    p.set_defaults(funcao=_executar)
+
+    p = comandos.add_parser("comparar", help="aponta regressões entre dois arquivos de resultados")
+    p.add_argument("antigo")
+    p.add_argument("novo")
+    p.add_argument("--limiar", type=float, default=0.10, help="variação relativa mínima (padrão: 0.10)")
+    p.add_argument("--todos", action="store_true", help="mostra também os casos estáveis")
+    p.set_defaults(funcao=_comparar)
+
+    p = comandos.add_parser("adaptativo", help="compara a ordenação adaptativa com a melhor escolha fixa")
+    p.add_argument("resultados", help="arquivo gerado por executar (com --grupos sort)")
+    p.add_argument("--limite", type=float, default=1.5, help="razão máxima aceita (padrão: 1.5)")
+    p.set_defaults(funcao=_adaptativo)
+
+    p = comandos.add_parser("paralelo", help="mede a aceleração da ordenação paralela por número de processos")
+    p.add_argument("--tamanhos", nargs="+", type=int, default=[10000, 100000, 1000000])
+    p.add_argument("--processos", nargs="+", type=int, help="padrão: 1, 2, 4, ... até o número de núcleos")
+    p.add_argument("--tipo", choices=TIPOS_SORT, default="int")
+    p.add_argument("--repeticoes", type=int, default=3)
+    p.set_defaults(funcao=_paralelo)
+
+    argumentos = parser.parse_args(argv)
+    return argumentos.funcao(argumentos)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Módulo de comparação entre dois arquivos de resultados dos benchmarks.
+
+Uma diferença só é apontada como regressão (ou melhora) quando passa de duas
+barreiras ao mesmo tempo:
+1. A razão entre as medianas passa do limiar (padrão: 10%)
+2. Os intervalos interquartis não se sobrepõem, ou seja, a diferença é maior
+   que a variação normal entre repetições da mesma medição
+Assim, ruído de uma máquina ocupada não é confundido com mudança de desempenho.
+"""
+
+import json
+
+REGRESSAO = "regressão"
+MELHORA = "melhora"
+ESTAVEL = "estável"
+
+
+def carregar(caminho):
+    """
+    Lê um arquivo gerado por "python -m benchmarks executar --saida".
+
+    Args:
+        caminho: Caminho do arquivo JSON
+
+    Returns:
+        Dicionário com os metadados e a lista "resultados"
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def _chave(resultado):
+    # Só as ordenações têm "tipo"
+    return (resultado["grupo"], resultado["algoritmo"], resultado["entrada"], resultado.get("tipo"),
+            resultado["n"])
+
+
+def classificar(antigo, novo, limiar=0.10):
+    """
+    Classifica a mudança entre duas medições do mesmo caso.
+
+    Args:
+        antigo: Resultado de referência (com mediana_ns, q1_ns e q3_ns, ou erro)
+        novo: Resultado a comparar
+        limiar: Variação relativa mínima da mediana para contar como mudança
+
+    Returns:
+        REGRESSAO, MELHORA ou ESTAVEL. Um caso que passou a falhar é regressão;
+        um que deixou de falhar é melhora.
+
+    Exemplos:
+        >>> a = {"mediana_ns": 100, "q1_ns": 95, "q3_ns": 105}
+        >>> classificar(a, {"mediana_ns": 150, "q1_ns": 140, "q3_ns": 160})
+        'regressão'
+        >>> classificar(a, {"mediana_ns": 150, "q1_ns": 90, "q3_ns": 200})
+        'estável'
+    """
+    if "erro" in antigo or "erro" in novo:
+        if "erro" in novo and "erro" not in antigo:
+            return REGRESSAO
+        if "erro" in antigo and "erro" not in novo:
+            return MELHORA
+        return ESTAVEL
+    razao = novo["mediana_ns"] / max(antigo["mediana_ns"], 1)
+    if razao > 1 + limiar and novo["q1_ns"] > antigo["q3_ns"]:
+        return REGRESSAO
+    if razao < 1 / (1 + limiar) and novo["q3_ns"] < antigo["q1_ns"]:
+        return MELHORA
+    return ESTAVEL
+
+
+def comparar(antigo, novo, limiar=0.10):
+    """
+    Compara os casos presentes nos dois conjuntos de resultados.
+
+    Args:
+        antigo: Dicionário de resultados de referência (ver carregar())
+        novo: Dicionário de resultados a comparar
+        limiar: Repassado para classificar()
+
+    Returns:
+        Lista de dicionários (grupo, algoritmo, entrada, tipo, n, razao, situacao), na
+        ordem dos resultados novos. razao é novo/antigo entre as medianas (None
+        se algum dos lados falhou).
+    """
+    referencia = {_chave(r): r for r in antigo["resultados"]}
+    comparacoes = []
+    for resultado in novo["resultados"]:
+        anterior = referencia.get(_chave(resultado))
+        if anterior is None:
+            continue
+        razao = None
+        if "erro" not in anterior and "erro" not in resultado:
+            razao = resultado["mediana_ns"] / max(anterior["mediana_ns"], 1)
+        grupo, algoritmo, entrada, tipo, n = _chave(resultado)
+        comparacoes.append({"grupo": grupo, "algoritmo": algoritmo, "entrada": entrada, "tipo": tipo, "n": n,
+                            "razao": razao, "situacao": classificar(anterior, resultado, limiar)})
+    return comparacoes
+
+
+def comparar_com_melhor(resultados, algoritmo="ordenar (adaptativo)", referencias=("sorted (referência)",)):
+    """
+    Compara um algoritmo com o melhor dos demais em cada entrada do mesmo
+    arquivo de resultados (ex.: a ordenação adaptativa contra a melhor escolha
+    fixa, que muda de uma entrada para outra).
+
+    Args:
+        resultados: Dicionário de resultados (ver carregar())
+        algoritmo: Nome do algoritmo avaliado
+        referencias: Algoritmos fora da disputa (ex.: sorted(), que não é do pacote)
+
+    Returns:
+        Lista de dicionários (grupo, entrada, tipo, n, melhor, razao), um por
+        entrada em que o algoritmo e algum outro foram medidos sem erro. razao
+        é a mediana do algoritmo dividida pela do melhor dos demais.
+
+    Exemplos:
+        >>> r = {"resultados": [
+        ...     {"grupo": "sort", "algoritmo": "a", "entrada": "x", "n": 10, "mediana_ns": 50},
+        ...     {"grupo": "sort", "algoritmo": "b", "entrada": "x", "n": 10, "mediana_ns": 40},
+        ...     {"grupo": "sort", "algoritmo": "ordenar (adaptativo)", "entrada": "x", "n": 10, "mediana_ns": 60}]}
+        >>> comparar_com_melhor(r)[0]["melhor"], comparar_com_melhor(r)[0]["razao"]
+        ('b', 1.5)
+    """
+    avaliados = {}
+    melhores = {}
+    for resultado in resultados["resultados"]:
+        if "erro" in resultado or resultado["algoritmo"] in referencias:
+            continue
+        grupo, nome, entrada, tipo, n = _chave(resultado)
+        chave = (grupo, entrada, tipo, n)
+        if nome == algoritmo:
+            avaliados[chave] = resultado
+        elif chave not in melhores or resultado["mediana_ns"] < melhores[chave]["mediana_ns"]:
+            melhores[chave] = resultado
+    comparacoes = []
+    for chave, resultado in avaliados.items():
+        melhor = melhores.get(chave)
+        if melhor is None:
+            continue
+        grupo, entrada, tipo, n = chave
+        comparacoes.append({"grupo": grupo, "entrada": entrada, "tipo": tipo, "n": n,
+                            "melhor": melhor["algoritmo"],
+                            "razao": resultado["mediana_ns"] / max(melhor["mediana_ns"], 1)})
+    return comparacoes
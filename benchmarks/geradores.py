@@ -0,0 +1,280 @@
+"""
+Módulo de geradores de entradas para benchmarks e testes de ordenação e busca.
+
+Além da entrada aleatória, gera os formatos que expõem o pior (ou o melhor)
+caso de cada algoritmo:
+1. ordenada / inversa: pior caso do Quick Sort com pivô fixo e do Insertion Sort
+2. quase_ordenada: k trocas aleatórias sobre a lista ordenada (algoritmos adaptativos)
+3. dente_de_serra: sequências crescentes repetidas (várias "runs" já ordenadas)
+4. tubo_de_orgao: crescente até o meio e decrescente depois
+5. poucos_unicos / todos_iguais: muitas chaves repetidas (partições desbalanceadas)
+6. zipf: chaves com frequência proporcional a 1/posto^s, como palavras num texto
+7. matador_mediana_de_tres: permutação construída para levar o Quick Sort com
+   mediana de três ao tempo O(n²)
+
+Os valores podem ser inteiros, floats, strings ou registros Livro. As funções
+de formato produzem inteiros sob demanda (geradores), de modo que entradas de
+10^6 elementos ou mais só ocupam memória quando o chamador as materializa, de
+preferência com gerar_array, que guarda números sem um objeto por elemento.
+"""
+
+import itertools
+import math
+import random
+from array import array
+from bisect import bisect
+from functools import lru_cache
+from operator import attrgetter
+
+from biblioteca.livro import Livro
+from sort.divide_and_conquer_sorts import quick_sort_mediana_de_tres
+
+# Chave de ordenação dos registros Livro gerados
+CHAVE_LIVRO = attrgetter("titulo")
+
+
+def aleatoria(n, rng):
+    """Inteiros uniformes em [0, 10n): poucas repetições."""
+    return (rng.randrange(10 * n) for _ in range(n))
+
+
+def ordenada(n, rng=None):
+    """0, 1, ..., n-1."""
+    return iter(range(n))
+
+
+def inversa(n, rng=None):
+    """n-1, n-2, ..., 0."""
+    return iter(range(n - 1, -1, -1))
+
+
+def quase_ordenada(n, rng, k=None):
+    """
+    Lista ordenada com k trocas entre posições aleatórias.
+
+    Args:
+        n: Tamanho
+        rng: Gerador pseudoaleatório (random.Random)
+        k: Número de trocas (padrão: 1% de n, no mínimo 1)
+
+    Returns:
+        Iterador de inteiros; só as posições trocadas ficam em memória, O(k)
+    """
+    if k is None:
+        k = max(1, n // 100)
+    trocadas = {}
+    for _ in range(k if n > 1 else 0):
+        i, j = rng.randrange(n), rng.randrange(n)
+        trocadas[i], trocadas[j] = trocadas.get(j, j), trocadas.get(i, i)
+    return (trocadas.get(i, i) for i in range(n))
+
+
+def dente_de_serra(n, rng=None, periodo=None):
+    """
+    Sequências crescentes 0, 1, ..., periodo-1 repetidas.
+
+    Args:
+        n: Tamanho
+        periodo: Tamanho de cada sequência (padrão: raiz quadrada de n)
+    """
+    periodo = periodo or max(1, math.isqrt(n))
+    return (i % periodo for i in range(n))
+
+
+def tubo_de_orgao(n, rng=None):
+    """0, 1, ..., n/2 e de volta a 0 (crescente e depois decrescente)."""
+    return (i if i < n - i else n - 1 - i for i in range(n))
+
+
+def poucos_unicos(n, rng, k=10):
+    """Inteiros uniformes entre k valores distintos."""
+    return (rng.randrange(k) for _ in range(n))
+
+
+def todos_iguais(n, rng=None):
+    """n cópias do mesmo valor."""
+    return itertools.repeat(0, n)
+
+
+def zipf(n, rng, s=1.1, universo=None):
+    """
+    Inteiros de 0 a universo-1 em que o valor v aparece com frequência
+    proporcional a 1 / (v + 1)^s: poucos valores muito frequentes e uma cauda
+    longa de valores raros.
+
+    Args:
+        n: Tamanho
+        rng: Gerador pseudoaleatório (random.Random)
+        s: Expoente (quanto maior, mais concentrada a distribuição)
+        universo: Número de valores possíveis (padrão: min(n, 10^5)); a tabela
+                  de probabilidades acumuladas ocupa O(universo)
+
+    Returns:
+        Iterador de inteiros, sorteados por busca binária na tabela acumulada
+    """
+    universo = universo or max(1, min(n, 100000))
+    acumuladas = array("d", itertools.accumulate(1 / (v + 1) ** s for v in range(universo)))
+    total = acumuladas[-1]
+    return (min(bisect(acumuladas, rng.random() * total), universo - 1) for _ in range(n))
+
+
+def adversario_quicksort(ordenar, n):
+    """
+    Constrói uma entrada que leva uma implementação de Quick Sort ao pior caso.
+
+    Usa o "adversário assassino" de McIlroy (A Killer Adversary for Quicksort,
+    1999): ordena n itens cujos valores ainda não foram decididos ("gás"), e cada
+    comparação entre dois itens indecisos fixa um deles com o menor valor ainda
+    livre, escolhendo o que parece ser o candidato a pivô. O pivô acaba sempre
+    entre os menores elementos, e repetir a ordenação com os valores decididos
+    reproduz exatamente as mesmas comparações. Funciona para qualquer escolha de
+    pivô entre um número constante de candidatos (primeiro, mediana de três...).
+
+    Args:
+        ordenar: Função de ordenação que compara os elementos com <, <=, > ou >=
+        n: Tamanho da entrada
+
+    Returns:
+        Lista com uma permutação de 0..n-1
+
+    Complexidade:
+    - Tempo: o da própria ordenação no pior caso, O(n²) para o Quick Sort
+    """
+    gas = n
+    valores = [gas] * n
+    solidos = 0
+    candidato = 0
+
+    def comparar(x, y):
+        nonlocal solidos, candidato
+        if valores[x] == gas and valores[y] == gas:
+            congelado = x if x == candidato else y
+            valores[congelado] = solidos
+            solidos += 1
+        if valores[x] == gas:
+            candidato = x
+        elif valores[y] == gas:
+            candidato = y
+        return valores[x] - valores[y]
+
+    class Item:
+        __slots__ = ("i",)
+
+        def __init__(self, i):
+            self.i = i
+
+        def __lt__(self, outro):
+            return comparar(self.i, outro.i) < 0
+
+        def __le__(self, outro):
+            return comparar(self.i, outro.i) <= 0
+
+        def __gt__(self, outro):
+            return comparar(self.i, outro.i) > 0
+
+        def __ge__(self, outro):
+            return comparar(self.i, outro.i) >= 0
+
+    ordenar([Item(i) for i in range(n)])
+    # Itens que nunca foram decididos ficam com os maiores valores
+    for i in range(n):
+        if valores[i] == gas:
+            valores[i] = solidos
+            solidos += 1
+    return valores
+
+
+@lru_cache(maxsize=8)
+def _matador(n):
+    return tuple(adversario_quicksort(quick_sort_mediana_de_tres, n))
+
+
+def matador_mediana_de_tres(n, rng=None):
+    """
+    Permutação de 0..n-1 que leva quick_sort_mediana_de_tres a O(n²).
+
+    Gerada com adversario_quicksort, o que custa O(n²): use n de até ~10^4.
+    O resultado é guardado em cache para os últimos tamanhos pedidos.
+    """
+    return iter(_matador(n))
+
+
+FORMATOS = {
+    "aleatoria": aleatoria,
+    "ordenada": ordenada,
+    "inversa": inversa,
+    "quase_ordenada": quase_ordenada,
+    "dente_de_serra": dente_de_serra,
+    "tubo_de_orgao": tubo_de_orgao,
+    "poucos_unicos": poucos_unicos,
+    "zipf": zipf,
+    "todos_iguais": todos_iguais,
+    "matador_mediana_de_tres": matador_mediana_de_tres,
+}
+
+# Formatos cuja geração é quadrática
+MAX_N_FORMATO = {"matador_mediana_de_tres": 10000}
+
+
+def _livros(inteiros):
+    # O título segue o inteiro (com largura fixa, a ordem alfabética é a numérica)
+    # e o código, a posição
+    for i, x in enumerate(inteiros):
+        yield Livro(f"Livro {x:010d}", f"Autor {x % 1000}", f"L{i}")
+
+
+TIPOS = {
+    "int": lambda inteiros: inteiros,
+    "float": lambda inteiros: (x + 0.5 for x in inteiros),
+    "str": lambda inteiros: (f"item{x:010d}" for x in inteiros),
+    "livro": _livros,
+}
+
+
+def gerar(formato, n, tipo="int", semente=42, **parametros):
+    """
+    Gera uma entrada sob demanda.
+
+    Args:
+        formato: Nome em FORMATOS (ex.: "quase_ordenada")
+        n: Tamanho
+        tipo: "int", "float", "str" ou "livro" (ordene livros com key=CHAVE_LIVRO).
+              A ordem relativa dos valores é a mesma para todos os tipos.
+        semente: Semente do gerador pseudoaleatório, para entradas reproduzíveis
+        **parametros: Parâmetros do formato (ex.: k=10 em quase_ordenada)
+
+    Returns:
+        Iterador com os n valores
+
+    Exemplos:
+        >>> list(gerar("tubo_de_orgao", 6))
+        [0, 1, 2, 2, 1, 0]
+        >>> list(gerar("dente_de_serra", 6, tipo="float", periodo=3))
+        [0.5, 1.5, 2.5, 0.5, 1.5, 2.5]
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconhecido: {formato}")
+    if tipo not in TIPOS:
+        raise ValueError(f"Tipo desconhecido: {tipo}")
+    return TIPOS[tipo](FORMATOS[formato](n, random.Random(semente), **parametros))
+
+
+def gerar_lista(formato, n, tipo="int", semente=42, **parametros):
+    """Como gerar, mas já materializada em uma lista."""
+    return list(gerar(formato, n, tipo, semente, **parametros))
+
+
+def gerar_array(formato, n, tipo="int", semente=42, **parametros):
+    """
+    Como gerar, mas em um array.array: 8 bytes por elemento, em vez de um objeto
+    Python por elemento (cerca de 36 bytes para int, com o ponteiro da lista).
+
+    Args:
+        tipo: "int" (typecode "q") ou "float" (typecode "d")
+
+    Returns:
+        array.array com os n valores
+    """
+    if tipo not in ("int", "float"):
+        raise ValueError("gerar_array só aceita os tipos numéricos 'int' e 'float'")
+    return array("q" if tipo == "int" else "d", gerar(formato, n, tipo, semente, **parametros))
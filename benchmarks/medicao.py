@@ -0,0 +1,117 @@
+"""
+Módulo de medição de tempo dos benchmarks.
+
+Toda medição segue o mesmo protocolo:
+1. Aquecimento: execuções descartadas, que estabilizam caches e o alocador
+2. Repetições: cada execução é cronometrada com time.perf_counter_ns, com a
+   preparação da entrada (ex.: cópia da lista) fora do intervalo medido e o
+   coletor de lixo desligado, como faz o módulo timeit
+3. Resumo: mediana e intervalo interquartil (IQR), que não se deixam levar por
+   execuções atípicas (interrupções do sistema, outro processo na CPU) como a
+   média e o desvio padrão
+"""
+
+import gc
+import time
+
+# Mínimo de repetições mesmo quando o orçamento de tempo é curto
+MIN_REPETICOES = 3
+
+
+def quartil(ordenadas, q):
+    """
+    Calcula um quantil por interpolação linear entre as posições vizinhas
+    (o método "inclusive" de statistics.quantiles, o mesmo do Excel e do NumPy).
+
+    Args:
+        ordenadas: Lista não vazia de valores em ordem crescente
+        q: Fração entre 0 e 1 (0.25 = primeiro quartil, 0.5 = mediana)
+
+    Returns:
+        O quantil q das amostras
+
+    Exemplos:
+        >>> quartil([1, 2, 3, 4], 0.5)
+        2.5
+        >>> quartil([10, 20, 30, 40, 50], 0.25)
+        20.0
+    """
+    posicao = (len(ordenadas) - 1) * q
+    inteira = int(posicao)
+    if inteira + 1 >= len(ordenadas):
+        return float(ordenadas[-1])
+    fracao = posicao - inteira
+    return ordenadas[inteira] + (ordenadas[inteira + 1] - ordenadas[inteira]) * fracao
+
+
+def resumir(amostras_ns):
+    """
+    Resume os tempos de uma medição.
+
+    Args:
+        amostras_ns: Tempos de cada repetição, em nanossegundos
+
+    Returns:
+        Dicionário com mediana_ns, q1_ns, q3_ns, iqr_ns, min_ns, max_ns e repeticoes
+
+    Exemplos:
+        >>> resumir([5, 1, 3, 2, 4])["mediana_ns"]
+        3.0
+    """
+    ordenadas = sorted(amostras_ns)
+    q1, q3 = quartil(ordenadas, 0.25), quartil(ordenadas, 0.75)
+    return {
+        "mediana_ns": quartil(ordenadas, 0.5),
+        "q1_ns": q1,
+        "q3_ns": q3,
+        "iqr_ns": q3 - q1,
+        "min_ns": ordenadas[0],
+        "max_ns": ordenadas[-1],
+        "repeticoes": len(ordenadas),
+    }
+
+
+def medir(executar, preparar=None, repeticoes=7, aquecimento=1, tempo_max=None):
+    """
+    Mede o tempo de executar(preparar()) várias vezes.
+
+    Args:
+        executar: Função que recebe o estado preparado; só ela é cronometrada
+        preparar: Função sem argumentos chamada antes de cada execução, fora do
+                  tempo medido (padrão: estado None)
+        repeticoes: Número de execuções cronometradas
+        aquecimento: Número de execuções descartadas antes das medidas (mínimo 1:
+                     a primeira também estima o custo de cada execução)
+        tempo_max: Orçamento aproximado em segundos para as repetições. Se a
+                   execução de aquecimento indicar que ele seria ultrapassado,
+                   o número de repetições cai para até MIN_REPETICOES.
+
+    Returns:
+        Tupla (resumo, resultado), com o resumo de resumir() e o resultado da
+        última execução de aquecimento (para conferir a saída fora do tempo medido)
+    """
+    preparar = preparar or (lambda: None)
+    resultado = None
+    duracao = 0
+    for _ in range(max(1, aquecimento)):
+        estado = preparar()
+        duracao, resultado = _cronometrar(executar, estado)
+    if tempo_max is not None and duracao * repeticoes > tempo_max * 1e9:
+        repeticoes = max(MIN_REPETICOES, min(repeticoes, int(tempo_max * 1e9 // max(duracao, 1))))
+
+    amostras = []
+    for _ in range(repeticoes):
+        estado = preparar()
+        amostras.append(_cronometrar(executar, estado)[0])
+    return resumir(amostras), resultado
+
+
+def _cronometrar(executar, estado):
+    gc.collect()
+    gc.disable()
+    try:
+        inicio = time.perf_counter_ns()
+        resultado = executar(estado)
+        return time.perf_counter_ns() - inicio, resultado
+    finally:
+        gc.enable()
@@ -0,0 +1,81 @@
+"""
+Módulo de medição da aceleração da ordenação paralela (sort/parallel_sorts.py).
+
+Para cada tamanho de lista, mede a ordenação serial (sort.adaptive_sort.ordenar)
+e a paralela com cada número de processos, e calcula a aceleração
+(tempo serial / tempo paralelo). O menor tamanho a partir do qual a versão
+paralela vence a serial é o limite sugerido para LIMITE_SERIAL.
+
+A aceleração tem um teto, mesmo com muitos núcleos: a mescla final dos trechos
+é feita no processo principal, em O(n log p), e pela lei de Amdahl limita o
+ganho à razão entre o custo da ordenação serial e o da mescla.
+"""
+
+import os
+
+from benchmarks.geradores import gerar_lista
+from benchmarks.medicao import medir
+from sort.adaptive_sort import ordenar
+from sort.parallel_sorts import merge_sort_paralelo
+
+TAMANHOS = (10000, 100000, 1000000)
+
+
+def processos_padrao():
+    """
+    Retorna 1, 2, 4, ... até o número de núcleos da máquina (incluído).
+    """
+    nucleos = os.cpu_count() or 1
+    processos = []
+    p = 1
+    while p < nucleos:
+        processos.append(p)
+        p *= 2
+    return processos + [nucleos]
+
+
+def medir_aceleracao(tamanhos=TAMANHOS, processos=None, tipo="int", entrada="aleatoria",
+                     repeticoes=3, semente=42, ao_medir=None):
+    """
+    Mede a ordenação paralela contra a serial em cada tamanho e número de processos.
+
+    Args:
+        tamanhos: Tamanhos de lista
+        processos: Números de processos (padrão: processos_padrao())
+        tipo: Tipo dos valores (ver benchmarks.geradores.TIPOS); int e float
+              usam memória compartilhada, os demais vão serializados
+        entrada: Formato de entrada (ver benchmarks.geradores.FORMATOS)
+        repeticoes: Repetições de cada medição
+        semente: Semente das entradas
+        ao_medir: Função chamada com cada resultado assim que ele fica pronto
+
+    Returns:
+        Dicionário com "resultados" (um item por n e processos, com mediana_ns
+        e aceleracao; processos=1 é a versão serial) e "limite_sugerido" (menor
+        n a partir do qual a versão paralela sempre venceu, ou None)
+    """
+    processos = processos or processos_padrao()
+    resultados = []
+    limite = None
+    for n in sorted(tamanhos):
+        lista = gerar_lista(entrada, n, tipo, semente)
+        serial, _ = medir(ordenar, lambda: lista, repeticoes, aquecimento=0)
+        linha = [{"n": n, "processos": 1, "mediana_ns": serial["mediana_ns"], "aceleracao": 1.0}]
+        for p in processos:
+            if p == 1:
+                continue
+            resumo, _ = medir(lambda dados: merge_sort_paralelo(dados, processos=p, limite_serial=0),
+                              lambda: lista, repeticoes, aquecimento=0)
+            linha.append({"n": n, "processos": p, "mediana_ns": resumo["mediana_ns"],
+                          "aceleracao": serial["mediana_ns"] / max(resumo["mediana_ns"], 1)})
+        for resultado in linha:
+            resultados.append(resultado)
+            if ao_medir:
+                ao_medir(resultado)
+        vence = any(r["aceleracao"] > 1 for r in linha[1:])
+        if vence and limite is None:
+            limite = n
+        elif not vence:
+            limite = None
+    return {"nucleos": os.cpu_count(), "tipo": tipo, "entrada": entrada,
+            "resultados": resultados, "limite_sugerido": limite}
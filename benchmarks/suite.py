@@ -0,0 +1,278 @@
+"""
+Módulo com os casos de benchmark de sort/, search/ e hash/.
+
+Cada caso combina um algoritmo com os formatos de entrada em que faz sentido
+medi-lo e um tamanho máximo: algoritmos O(n²) param em 10^4 elementos (em 10^6
+levariam horas), os demais vão até 10^6, exceto nas entradas que são o seu pior
+caso quadrático (ex.: lista ordenada para o Quick Sort com pivô fixo). As
+entradas de ordenação vêm de benchmarks.geradores. A saída de cada algoritmo é conferida
+uma vez por tamanho, fora do tempo medido: um resultado errado (ou uma exceção,
+como RecursionError) é registrado como erro em vez de tempo.
+"""
+
+import platform
+import random
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+from typing import Callable
+
+from benchmarks.geradores import FORMATOS, MAX_N_FORMATO, gerar_lista
+from benchmarks.medicao import medir
+from hash.hash_map import HashMap, HashMapEndAberto
+from search.search_algorithms import busca_binaria, busca_binaria_recursiva, busca_sequencial
+from sort.adaptive_sort import ordenar
+from sort.divide_and_conquer_sorts import merge_sort, merge_sort_in_place, quick_sort, quick_sort_mediana_de_tres
+from sort.insertion_sorts import insertion_sort, insertion_sort_binario, shell_sort
+from sort.radix_sorts import counting_sort, radix_sort_lsd, radix_sort_msd
+from sort.simple_sorts import bubble_sort, bubble_sort_otimizado, selection_sort
+
+TAMANHOS = (100, 1000, 10000, 100000, 1000000)
+MAX_N_QUADRATICO = 10000
+# Consultas por medição de busca (a busca sequencial custa O(n) cada)
+CONSULTAS = 100
+VERSAO_FORMATO = 1
+
+
+@dataclass(frozen=True)
+class Caso:
+    grupo: str                  # "sort", "search" ou "hash"
+    algoritmo: str
+    executar: Callable          # executar(estado): a parte cronometrada
+    entradas: tuple             # formatos de entrada medidos
+    max_n: int = max(TAMANHOS)
+    construir: Callable = None  # construir(dados): uma vez por tamanho e entrada
+    preparar: Callable = None   # preparar(base): antes de cada repetição
+    verificar: Callable = None  # verificar(dados, resultado) -> bool
+    entradas_quadraticas: tuple = ()  # limitadas a MAX_N_QUADRATICO
+    tipos: tuple = None         # tipos de valor aceitos (sort); None: todos
+
+
+# ---------------------------------------------------------------------------
+# Entradas
+# ---------------------------------------------------------------------------
+
+def _busca(entrada, n, rng, tipo=None):
+    # Lista ordenada de pares; as consultas são todas presentes (pares) ou
+    # todas ausentes (ímpares, o pior caso da busca sequencial)
+    lista = list(range(0, 2 * n, 2))
+    consultas = [2 * rng.randrange(n) for _ in range(CONSULTAS)]
+    if entrada == "ausentes":
+        consultas = [c + 1 for c in consultas]
+    return lista, consultas
+
+
+def _chaves(entrada, n, rng, tipo=None):
+    if entrada == "sequencial":
+        return list(range(n))
+    return [f"chave{x}" for x in rng.sample(range(n * 10), n)]
+
+
+def gerar(grupo, entrada, n, semente=42, tipo="int"):
+    """
+    Gera os dados de um caso de benchmark.
+
+    Args:
+        grupo: "sort", "search" ou "hash"
+        entrada: Formato da entrada (ex.: "aleatoria", "ordenada")
+        n: Tamanho da entrada
+        semente: Semente do gerador pseudoaleatório, para entradas reproduzíveis
+        tipo: Tipo dos valores a ordenar ("int", "float" ou "str"); só para sort
+
+    Returns:
+        Lista de valores (sort), tupla (lista ordenada, consultas) (search) ou
+        lista de chaves distintas (hash)
+    """
+    if grupo == "sort":
+        return gerar_lista(entrada, n, tipo, semente)
+    return {"search": _busca, "hash": _chaves}[grupo](entrada, n, random.Random(semente))
+
+
+# ---------------------------------------------------------------------------
+# Casos
+# ---------------------------------------------------------------------------
+
+ENTRADAS_SORT = tuple(FORMATOS)
+TIPOS_SORT = ("int", "float", "str")
+
+
+def _caso_sort(algoritmo, funcao, max_n=max(TAMANHOS), entradas_quadraticas=(), tipos=None):
+    # Os algoritmos in-place retornam a própria lista; merge_sort_in_place
+    # retorna None para listas de 0 ou 1 elemento
+    return Caso("sort", algoritmo, lambda lista: funcao(lista) or lista, ENTRADAS_SORT, max_n,
+                preparar=list, verificar=lambda dados, resultado: resultado == sorted(dados),
+                entradas_quadraticas=entradas_quadraticas, tipos=tipos)
+
+
+def _caso_busca(algoritmo, funcao, max_n=max(TAMANHOS)):
+    def executar(base):
+        lista, consultas = base
+        return [funcao(lista, c) for c in consultas]
+
+    def verificar(dados, resultado):
+        lista, consultas = dados
+        return all((p == -1) if c % 2 else (lista[p] == c) for c, p in zip(consultas, resultado))
+
+    return Caso("search", algoritmo, executar, ("presentes", "ausentes"), max_n, verificar=verificar)
+
+
+def _caso_hash(algoritmo, classe, operacao):
+    if operacao == "inserir":
+        def executar(mapa_chaves):
+            mapa, chaves = mapa_chaves
+            for chave in chaves:
+                mapa.inserir(chave, chave)
+            return mapa
+
+        return Caso("hash", f"{algoritmo}.inserir", executar, ("aleatoria", "sequencial"),
+                    preparar=lambda chaves: (classe(), chaves),
+                    verificar=lambda chaves, mapa: all(mapa.buscar(c) == c for c in chaves))
+
+    def construir(chaves):
+        mapa = classe()
+        for chave in chaves:
+            mapa.inserir(chave, chave)
+        return mapa, chaves
+
+    def executar(mapa_chaves):
+        mapa, chaves = mapa_chaves
+        return [mapa.buscar(chave) for chave in chaves]
+
+    return Caso("hash", f"{algoritmo}.buscar", executar, ("aleatoria", "sequencial"),
+                construir=construir, verificar=lambda chaves, valores: valores == chaves)
+
+
+class _Dicionario(dict):
+    # dict com a interface de HashMap, como referência
+    inserir = dict.__setitem__
+    buscar = dict.get
+
+
+CASOS = [
+    _caso_sort("selection_sort", selection_sort, MAX_N_QUADRATICO),
+    _caso_sort("bubble_sort", bubble_sort, MAX_N_QUADRATICO),
+    _caso_sort("bubble_sort_otimizado", bubble_sort_otimizado, MAX_N_QUADRATICO),
+    _caso_sort("insertion_sort", insertion_sort, MAX_N_QUADRATICO),
+    _caso_sort("insertion_sort_binario", insertion_sort_binario, MAX_N_QUADRATICO),
+    _caso_sort("shell_sort", shell_sort),
+    _caso_sort("merge_sort", merge_sort),
+    _caso_sort("merge_sort_in_place", merge_sort_in_place),
+    _caso_sort("merge_sort_in_place (sem buffer)", partial(merge_sort_in_place, sem_buffer=True)),
+    # Com o último elemento como pivô e "<=" na partição, só a entrada aleatória
+    # (sem repetições longas nem ordem prévia) escapa de partições desbalanceadas
+    _caso_sort("quick_sort", quick_sort,
+               entradas_quadraticas=tuple(e for e in ENTRADAS_SORT if e != "aleatoria")),
+    _caso_sort("quick_sort_mediana_de_tres", quick_sort_mediana_de_tres,
+               entradas_quadraticas=("matador_mediana_de_tres",)),
+    _caso_sort("counting_sort", counting_sort, tipos=("int",)),
+    _caso_sort("radix_sort_lsd", radix_sort_lsd, tipos=("int",)),
+    _caso_sort("radix_sort_msd", radix_sort_msd, tipos=("str",)),
+    _caso_sort("ordenar (adaptativo)", ordenar),
+    _caso_sort("sorted (referência)", sorted),
+    _caso_busca("busca_sequencial", busca_sequencial, 100000),
+    _caso_busca("busca_binaria", busca_binaria),
+    _caso_busca("busca_binaria_recursiva", busca_binaria_recursiva),
+    _caso_hash("HashMap", HashMap, "inserir"),
+    _caso_hash("HashMap", HashMap, "buscar"),
+    _caso_hash("HashMapEndAberto", HashMapEndAberto, "inserir"),
+    _caso_hash("HashMapEndAberto", HashMapEndAberto, "buscar"),
+    _caso_hash("dict (referência)", _Dicionario, "inserir"),
+    _caso_hash("dict (referência)", _Dicionario, "buscar"),
+]
+
+
+def selecionar(grupos=None, algoritmos=None):
+    """
+    Filtra os casos registrados.
+
+    Args:
+        grupos: Grupos a manter (ex.: ["sort"]); None mantém todos
+        algoritmos: Trechos de nome de algoritmo (ex.: ["merge", "HashMap."]);
+                    None mantém todos
+
+    Returns:
+        Lista de casos, na ordem de CASOS
+    """
+    return [caso for caso in CASOS
+            if (not grupos or caso.grupo in grupos)
+            and (not algoritmos or any(a in caso.algoritmo for a in algoritmos))]
+
+
+def _combinacoes(casos, n, entradas, tipos):
+    # (caso, entrada, tipo) a medir com tamanho n, respeitando os limites de cada um
+    for caso in casos:
+        for entrada in caso.entradas:
+            if entradas and entrada not in entradas:
+                continue
+            limite = MAX_N_QUADRATICO if entrada in caso.entradas_quadraticas else caso.max_n
+            if caso.grupo == "sort":
+                limite = min(limite, MAX_N_FORMATO.get(entrada, limite))
+            if n > limite:
+                continue
+            for tipo in (tipos if caso.grupo == "sort" else (None,)):
+                if caso.tipos and tipo not in caso.tipos:
+                    continue
+                yield caso, entrada, tipo
+
+
+def executar(casos=None, tamanhos=TAMANHOS, entradas=None, repeticoes=7, aquecimento=1,
+             tempo_max=10.0, semente=42, ao_medir=None, tipos=("int",)):
+    """
+    Executa os benchmarks e devolve os resultados em formato serializável (JSON).
+
+    Os dados de cada (grupo, entrada, tipo, n) são gerados uma vez e
+    compartilhados entre os algoritmos do grupo, que assim medem exatamente a
+    mesma entrada.
+
+    Args:
+        casos: Casos a executar (padrão: todos)
+        tamanhos: Tamanhos de entrada; cada caso ignora os acima do seu max_n
+        entradas: Formatos de entrada a manter (padrão: todos os de cada caso)
+        repeticoes, aquecimento, tempo_max: Repassados para medicao.medir
+        semente: Semente das entradas pseudoaleatórias
+        ao_medir: Função chamada com cada resultado assim que ele fica pronto
+                  (ex.: para exibir o progresso)
+        tipos: Tipos dos valores nas ordenações (TIPOS_SORT); search e hash
+               usam sempre as próprias chaves
+
+    Returns:
+        Dicionário com metadados do ambiente, parâmetros e a lista "resultados",
+        um item por (grupo, algoritmo, entrada, n) — mais o tipo, nas
+        ordenações — com o resumo da medição ou a chave "erro"
+    """
+    casos = CASOS if casos is None else casos
+    resultados = []
+    for n in sorted(tamanhos):
+        dados_por_entrada = {}
+        for caso, entrada, tipo in _combinacoes(casos, n, entradas, tipos):
+            chave = (caso.grupo, entrada, tipo)
+            if chave not in dados_por_entrada:
+                dados_por_entrada[chave] = gerar(caso.grupo, entrada, n, semente, tipo or "int")
+            dados = dados_por_entrada[chave]
+            resultado = {"grupo": caso.grupo, "algoritmo": caso.algoritmo, "entrada": entrada, "n": n}
+            if tipo:
+                resultado["tipo"] = tipo
+            try:
+                base = caso.construir(dados) if caso.construir else dados
+                preparar = (lambda: caso.preparar(base)) if caso.preparar else (lambda: base)
+                resumo, saida = medir(caso.executar, preparar, repeticoes, aquecimento, tempo_max)
+                if caso.verificar and not caso.verificar(dados, saida):
+                    resultado["erro"] = "resultado incorreto"
+                else:
+                    resultado.update(resumo)
+            except (RecursionError, MemoryError) as erro:
+                resultado["erro"] = type(erro).__name__
+            resultados.append(resultado)
+            if ao_medir:
+                ao_medir(resultado)
+    return {
+        "versao": VERSAO_FORMATO,
+        "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementacao": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "processador": platform.processor() or platform.machine(),
+        "parametros": {"tamanhos": sorted(tamanhos), "repeticoes": repeticoes, "aquecimento": aquecimento,
+                       "tempo_max": tempo_max, "semente": semente, "tipos": list(tipos)},
+        "resultados": resultados,
+    }
@@ -0,0 +1,145 @@
+import os
+import sys
+from array import array
+
+# Permite usar os pacotes sort/ e search/ da raiz do projeto
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from livro import Livro
+from sort.adaptive_sort import ordenar
+from search.search_algorithms import busca_binaria
+
+COLUNAS = ("titulo", "autor", "codigo")
+
+
+class TabelaStrings:
+    # Strings empacotadas em um único bytearray UTF-8; a i-ésima string ocupa
+    # dados[offsets[i]:offsets[i + 1]]. Não há um objeto str por registro.
+    def __init__(self):
+        self.dados = bytearray()
+        self.offsets = array("Q", [0])
+
+    def adicionar(self, texto):
+        self.dados += texto.encode("utf-8")
+        self.offsets.append(len(self.dados))
+        return len(self.offsets) - 2
+
+    def __getitem__(self, i):
+        return self.dados[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+
+class LivroVisao:
+    # Visão leve de um registro do Acervo: lê as colunas sob demanda
+    __slots__ = ("acervo", "indice")
+
+    def __init__(self, acervo, indice):
+        self.acervo = acervo
+        self.indice = indice
+
+    @property
+    def titulo(self):
+        return self.acervo.titulo(self.indice)
+
+    @property
+    def autor(self):
+        return self.acervo.autor(self.indice)
+
+    @property
+    def codigo(self):
+        return self.acervo.codigo(self.indice)
+
+    def para_livro(self):
+        return Livro(self.titulo, self.autor, self.codigo)
+
+    def __str__(self):
+        return f"{self.titulo} ({self.autor}) [Código: {self.codigo}]"
+
+
+class ColunaOrdenada:
+    # Sequência somente leitura com os valores de uma coluna na ordem de um índice;
+    # permite aplicar busca_binaria sem materializar a coluna
+    def __init__(self, valor, ordem):
+        self.valor = valor
+        self.ordem = ordem
+
+    def __getitem__(self, posicao):
+        return self.valor(self.ordem[posicao])
+
+    def __len__(self):
+        return len(self.ordem)
+
+
+class Acervo:
+    # Armazenamento colunar do catálogo: títulos e códigos em tabelas de strings
+    # empacotadas; autores codificados por dicionário (cada autor distinto é
+    # guardado uma vez e cada livro guarda só o número do autor)
+    def __init__(self):
+        self.titulos = TabelaStrings()
+        self.codigos = TabelaStrings()
+        self.autores = TabelaStrings()
+        self.autor_ids = array("I")
+        self._indice_autor = {}  # autor: posição em self.autores
+        self._ordens = {}        # coluna: índices dos registros ordenados por ela
+
+    @classmethod
+    def de_livros(cls, livros):
+        acervo = cls()
+        for livro in livros:
+            acervo.adicionar(livro.titulo, livro.autor, livro.codigo)
+        return acervo
+
+    def adicionar(self, titulo, autor, codigo):
+        id_autor = self._indice_autor.get(autor)
+        if id_autor is None:
+            id_autor = self.autores.adicionar(autor)
+            self._indice_autor[autor] = id_autor
+        self.autor_ids.append(id_autor)
+        self.codigos.adicionar(codigo)
+        self._ordens.clear()
+        return self.titulos.adicionar(titulo)
+
+    def titulo(self, i):
+        return self.titulos[i]
+
+    def autor(self, i):
+        return self.autores[self.autor_ids[i]]
+
+    def codigo(self, i):
+        return self.codigos[i]
+
+    def ordenar_por(self, coluna="titulo"):
+        # Ordena os índices dos registros (não os registros) com a ordenação
+        # adaptativa, que é estável e aproveita colunas já quase ordenadas
+        # (ex.: códigos de uma exportação do catálogo); o resultado fica em
+        # cache até a próxima inserção
+        if coluna not in COLUNAS:
+            raise ValueError(f"Coluna inválida: {coluna}")
+        if coluna not in self._ordens:
+            indices = ordenar(range(len(self)), key=getattr(self, coluna))
+            self._ordens[coluna] = array("I", indices)
+        return self._ordens[coluna]
+
+    def buscar(self, coluna, valor):
+        # Busca binária sobre a coluna ordenada; retorna uma LivroVisao ou None
+        ordem = self.ordenar_por(coluna)
+        posicao = busca_binaria(ColunaOrdenada(getattr(self, coluna), ordem), valor)
+        return self[ordem[posicao]] if posicao != -1 else None
+
+    def em_ordem(self, coluna="titulo"):
+        for i in self.ordenar_por(coluna):
+            yield self[i]
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return LivroVisao(self, i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield LivroVisao(self, i)
+
+    def __len__(self):
+        return len(self.titulos)
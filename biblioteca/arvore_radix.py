@@ -0,0 +1,170 @@
+class NodoRadix:
+    __slots__ = ("rotulo", "filhos", "titulo", "codigos")
+
+    def __init__(self, rotulo=""):
+        self.rotulo = rotulo  # trecho do título na aresta que chega a este nó
+        self.filhos = {}      # primeiro caractere do rótulo: nó filho, em ordem alfabética
+        self.titulo = None    # título completo, se algum termina neste nó
+        self.codigos = []     # códigos dos livros com esse título
+
+
+class ArvoreRadix:
+    # Árvore radix (trie compactada) de títulos: cada aresta guarda um trecho de
+    # texto e todo nó interno sem título tem pelo menos dois filhos. Os filhos de
+    # cada nó ficam em ordem alfabética, então um percurso em pré-ordem lista os
+    # títulos em ordem lexicográfica e completar() para após os k primeiros:
+    # O(|prefixo| + k) nós visitados.
+    def __init__(self):
+        self.raiz = NodoRadix()
+        self.tamanho = 0
+
+    @classmethod
+    def construir(cls, livros_ordenados):
+        # Construção em lote a partir de livros já ordenados por título (ex.: a
+        # saída de BST.em_ordem()). Mantém a pilha do caminho até o título anterior:
+        # cada novo título só sobe até o maior prefixo comum com o anterior e vira
+        # o último filho ali, sem descer a partir da raiz nem reordenar filhos.
+        arvore = cls()
+        pilha = [(arvore.raiz, 0)]  # (nó, comprimento do texto até ele)
+        anterior = ""
+        for livro in livros_ordenados:
+            titulo = livro.titulo
+            if titulo < anterior:
+                raise ValueError("Os livros precisam estar ordenados por título")
+            comum = 0
+            limite = min(len(titulo), len(anterior))
+            while comum < limite and titulo[comum] == anterior[comum]:
+                comum += 1
+
+            ultimo = None
+            while pilha[-1][1] > comum:
+                ultimo = pilha.pop()[0]
+            topo, profundidade = pilha[-1]
+            if profundidade < comum:
+                # O prefixo comum termina no meio da aresta de `ultimo`: divide-a
+                meio = NodoRadix(ultimo.rotulo[:comum - profundidade])
+                ultimo.rotulo = ultimo.rotulo[comum - profundidade:]
+                meio.filhos[ultimo.rotulo[0]] = ultimo
+                topo.filhos[meio.rotulo[0]] = meio
+                pilha.append((meio, comum))
+                topo = meio
+
+            if comum == len(titulo):
+                nodo = topo  # título repetido (ou vazio)
+            else:
+                nodo = NodoRadix(titulo[comum:])
+                topo.filhos[nodo.rotulo[0]] = nodo
+                pilha.append((nodo, len(titulo)))
+            arvore._marcar(nodo, titulo, livro.codigo)
+            anterior = titulo
+        return arvore
+
+    def inserir(self, titulo, codigo):
+        nodo = self.raiz
+        i = 0
+        while i < len(titulo):
+            filho = nodo.filhos.get(titulo[i])
+            if filho is None:
+                novo = NodoRadix(titulo[i:])
+                self._adicionar_filho(nodo, novo)
+                nodo = novo
+                break
+            comum = self._prefixo_comum(filho.rotulo, titulo, i)
+            if comum < len(filho.rotulo):
+                meio = NodoRadix(filho.rotulo[:comum])
+                filho.rotulo = filho.rotulo[comum:]
+                meio.filhos[filho.rotulo[0]] = filho
+                nodo.filhos[meio.rotulo[0]] = meio
+                filho = meio
+            nodo = filho
+            i += comum
+        self._marcar(nodo, titulo, codigo)
+
+    def remover(self, titulo, codigo):
+        caminho = [self.raiz]
+        i = 0
+        while i < len(titulo):
+            filho = caminho[-1].filhos.get(titulo[i])
+            if filho is None or not titulo.startswith(filho.rotulo, i):
+                return False
+            caminho.append(filho)
+            i += len(filho.rotulo)
+        nodo = caminho[-1]
+        if nodo.titulo != titulo or codigo not in nodo.codigos:
+            return False
+        nodo.codigos.remove(codigo)
+        self.tamanho -= 1
+        if nodo.codigos:
+            return True
+        nodo.titulo = None
+        # Recompacta: remove a folha vazia e funde com o filho o nó que ficou
+        # sem título e com um único filho
+        j = len(caminho) - 1
+        if not nodo.filhos and j > 0:
+            del caminho[j - 1].filhos[nodo.rotulo[0]]
+            j -= 1
+        nodo = caminho[j]
+        if j > 0 and nodo.titulo is None and len(nodo.filhos) == 1:
+            unico = next(iter(nodo.filhos.values()))
+            unico.rotulo = nodo.rotulo + unico.rotulo
+            caminho[j - 1].filhos[unico.rotulo[0]] = unico
+        return True
+
+    def buscar(self, titulo):
+        # Códigos dos livros com exatamente esse título: O(|titulo|)
+        nodo = self.raiz
+        i = 0
+        while i < len(titulo):
+            nodo = nodo.filhos.get(titulo[i])
+            if nodo is None or not titulo.startswith(nodo.rotulo, i):
+                return []
+            i += len(nodo.rotulo)
+        return list(nodo.codigos) if nodo.titulo == titulo else []
+
+    def completar(self, prefixo, k=10):
+        # Os k primeiros (titulo, codigo) que começam com o prefixo, em ordem
+        nodo = self.raiz
+        i = 0
+        while i < len(prefixo):
+            filho = nodo.filhos.get(prefixo[i])
+            if filho is None:
+                return []
+            comum = self._prefixo_comum(filho.rotulo, prefixo, i)
+            if i + comum < len(prefixo) and comum < len(filho.rotulo):
+                return []
+            nodo = filho
+            i += comum
+        resultado = []
+        pilha = [nodo]
+        while pilha and len(resultado) < k:
+            nodo = pilha.pop()
+            for codigo in nodo.codigos:
+                resultado.append((nodo.titulo, codigo))
+            pilha.extend(reversed(nodo.filhos.values()))
+        return resultado[:k]
+
+    def __len__(self):
+        return self.tamanho
+
+    def _marcar(self, nodo, titulo, codigo):
+        nodo.titulo = titulo
+        nodo.codigos.append(codigo)
+        self.tamanho += 1
+
+    @staticmethod
+    def _prefixo_comum(rotulo, texto, inicio):
+        comum = 0
+        limite = min(len(rotulo), len(texto) - inicio)
+        while comum < limite and rotulo[comum] == texto[inicio + comum]:
+            comum += 1
+        return comum
+
+    @staticmethod
+    def _adicionar_filho(nodo, filho):
+        # Mantém os filhos em ordem alfabética (na construção em lote o novo filho
+        # é sempre o maior, então só a inserção avulsa precisa reordenar)
+        chave = filho.rotulo[0]
+        ordenar = bool(nodo.filhos) and chave < next(reversed(nodo.filhos))
+        nodo.filhos[chave] = filho
+        if ordenar:
+            nodo.filhos = dict(sorted(nodo.filhos.items()))
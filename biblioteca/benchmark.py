@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Benchmarks do Sistema de Biblioteca Digital
+Uso: python benchmark.py [nome] [n]   (sem nome, executa todos)
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from acervo import Acervo
+from bst import BST
+from catalogo_mmap import CatalogoMapeado, gravar_catalogo
+from fila_prioridade import FilaPrioridade
+from grafo import Grafo
+from indice_textual import IndiceTextual
+from livro import Livro
+from persistencia import salvar, carregar
+from recomendador import Recomendador
+from servico import Biblioteca
+from servidor import ServidorBiblioteca, gerar_carga
+from usuario import Usuario
+from wal import LogEscrita, ler
+
+
+class LivroLegado:
+    # Layout anterior de Livro: __dict__ por instância e lista de espera sempre alocada
+    def __init__(self, titulo, autor, codigo):
+        self.titulo = titulo
+        self.autor = autor
+        self.codigo = codigo
+        self.fila_espera = []
+
+
+class UsuarioLegado:
+    def __init__(self, nome, id):
+        self.nome = nome
+        self.id = id
+
+
+def _bytes_por_registro(fabrica, n):
+    # Mede, com tracemalloc, a memória retida por n registros criados por fabrica(i)
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    registros = [fabrica(i) for i in range(n)]
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del registros
+    return total / n
+
+
+def benchmark_memoria(n=100000):
+    print(f"=== MEMÓRIA POR REGISTRO ({n} registros) ===")
+    # Os autores se repetem (1000 distintos), mas cada string é criada de novo,
+    # como acontece ao ler o catálogo de um arquivo
+    casos = [
+        ("Livro (antes)", lambda i: LivroLegado(f"Título {i}", f"Autor {i % 1000}", f"L{i:07d}")),
+        ("Livro (depois)", lambda i: Livro(f"Título {i}", f"Autor {i % 1000}", f"L{i:07d}")),
+        ("Usuario (antes)", lambda i: UsuarioLegado(f"Usuário {i}", f"U{i:07d}")),
+        ("Usuario (depois)", lambda i: Usuario(f"Usuário {i}", f"U{i:07d}")),
+    ]
+    resultados = {}
+    for nome, fabrica in casos:
+        resultados[nome] = _bytes_por_registro(fabrica, n)
+        print(f"   {nome.ljust(20)}: {resultados[nome]:8.1f} bytes/registro")
+    # Acervo colunar: um único conjunto de arrays para todos os registros
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    acervo = Acervo()
+    for i in range(n):
+        acervo.adicionar(f"Título {i}", f"Autor {i % 1000}", f"L{i:07d}")
+    resultados["Acervo (colunar)"] = (tracemalloc.get_traced_memory()[0] - inicio) / n
+    tracemalloc.stop()
+    del acervo
+    print(f"   {'Acervo (colunar)'.ljust(20)}: {resultados['Acervo (colunar)']:8.1f} bytes/registro")
+    for tipo in ("Livro", "Usuario"):
+        antes, depois = resultados[f"{tipo} (antes)"], resultados[f"{tipo} (depois)"]
+        print(f"   {tipo}: economia de {100 * (1 - depois / antes):.1f}%")
+    return resultados
+
+
+def benchmark_recomendacao(n=200000):
+    print(f"=== RECOMENDAÇÃO ({n} empréstimos) ===")
+    random.seed(42)
+    livros = max(1000, n // 20)
+    recomendador = Recomendador(Grafo(), janela=10)
+    inicio = time.perf_counter()
+    for _ in range(n):
+        # Popularidade desigual: poucos livros concentram muitos empréstimos
+        codigo = f"L{int(livros * random.random() ** 2)}"
+        recomendador.registrar_emprestimo(f"U{random.randrange(n // 10)}", codigo)
+    tempo_carga = time.perf_counter() - inicio
+    arestas = sum(len(v) for v in recomendador.grafo.livros.values()) // 2
+    print(f"   Grafo: {len(recomendador.grafo.livros)} livros, {arestas} arestas ({tempo_carga:.2f} s)")
+
+    consultas = [f"L{random.randrange(livros)}" for _ in range(200)]
+    tempos = []
+    for codigo in consultas:
+        inicio = time.perf_counter()
+        recomendador.recomendar(codigo, 10)
+        tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    print(f"   Consulta: mediana {1000 * tempos[len(tempos) // 2]:.2f} ms, "
+          f"p99 {1000 * tempos[int(len(tempos) * 0.99)]:.2f} ms")
+    return tempos
+
+
+def benchmark_grafo_lote(n=500000):
+    print(f"=== INSERÇÃO DE ARESTAS NO GRAFO ({n} pares) ===")
+    random.seed(42)
+    livros = max(1000, n // 200)
+
+    def sortear():
+        # Popularidade desigual, como num log real: os mesmos pares se repetem
+        return f"L{int(livros * random.random() ** 3)}"
+
+    pares = [(sortear(), sortear()) for _ in range(n)]
+    # Cestas de 2 a 6 livros (em média ~7 pares por cesta)
+    cestas = [[sortear() for _ in range(random.randint(2, 6))] for _ in range(n // 7)]
+
+    resultados = {}
+    for nome, inserir in [
+        ("adicionar_relacao", lambda g: [g.adicionar_relacao(c1, c2) for c1, c2 in pares]),
+        ("adicionar_relacoes", lambda g: g.adicionar_relacoes(pares)),
+        ("cestas (por par)", lambda g: [g.adicionar_relacao(c1, c2)
+                                        for cesta in cestas
+                                        for j, c1 in enumerate(cesta) for c2 in cesta[j + 1:]]),
+        ("adicionar_cestas", lambda g: g.adicionar_cestas(cestas)),
+    ]:
+        grafo = Grafo()
+        inicio = time.perf_counter()
+        inserir(grafo)
+        resultados[nome] = time.perf_counter() - inicio
+        print(f"   {nome.ljust(20)}: {resultados[nome]:.3f} s")
+    print(f"   Ganho em pares: {resultados['adicionar_relacao'] / resultados['adicionar_relacoes']:.1f}x, "
+          f"em cestas: {resultados['cestas (por par)'] / resultados['adicionar_cestas']:.1f}x")
+    return resultados
+
+
+def benchmark_busca_textual(n=200000):
+    print(f"=== BUSCA TEXTUAL ({n} títulos) ===")
+    random.seed(42)
+    silabas = ["ba", "ca", "da", "fe", "go", "lu", "ma", "ni", "po", "ra", "sa", "te", "vi", "ção", "çu"]
+    vocabulario = list({"".join(random.choices(silabas, k=random.randint(2, 5))) for _ in range(50000)})
+    indice = IndiceTextual()
+    titulos = []
+    inicio = time.perf_counter()
+    for i in range(n):
+        titulo = " ".join(random.choices(vocabulario, k=random.randint(1, 5)))
+        titulos.append(titulo)
+        indice.adicionar(f"L{i}", titulo, f"Autor {i % 5000}")
+    print(f"   Construção: {time.perf_counter() - inicio:.2f} s ({len(indice.postings)} tokens)")
+
+    def consulta_exata():
+        return random.choice(titulos)
+
+    def consulta_prefixo():
+        palavras = random.choice(titulos).split()
+        return " ".join(palavras[:-1] + [palavras[-1][:3]])
+
+    def consulta_com_erro():
+        palavras = random.choice(titulos).split()
+        palavra = palavras[0]
+        return palavra[:2] + "x" + palavra[3:] + (" " + palavras[1] if len(palavras) > 1 else "")
+
+    resultados = {}
+    for nome, gerar in [("exata", consulta_exata), ("prefixo", consulta_prefixo), ("com erro", consulta_com_erro)]:
+        tempos = []
+        for _ in range(300):
+            consulta = gerar()
+            inicio = time.perf_counter()
+            indice.buscar(consulta)
+            tempos.append(time.perf_counter() - inicio)
+        tempos.sort()
+        resultados[nome] = tempos
+        print(f"   {nome.ljust(10)}: mediana {1000 * tempos[len(tempos) // 2]:.3f} ms, "
+              f"p99 {1000 * tempos[int(len(tempos) * 0.99)]:.3f} ms")
+    return resultados
+
+
+def benchmark_snapshot(n=1000000):
+    print(f"=== SNAPSHOT DO ESTADO ({n} livros) ===")
+    random.seed(42)
+    livros = [Livro(f"Título {random.random():.12f}", f"Autor {i % 5000}", f"L{i:07d}") for i in range(n)]
+    usuarios = {f"U{i}": Usuario(f"Usuário {i}", f"U{i}", i % 7 == 0) for i in range(max(1, n // 10))}
+    ids = list(usuarios)
+    recomendador = Recomendador(Grafo(), janela=10)
+    emprestimos = [(random.choice(ids), f"L{int(n * random.random() ** 2):07d}") for _ in range(n // 5)]
+    recomendador.registrar_emprestimos(emprestimos)
+    filas = {livro.codigo: FilaPrioridade() for livro in livros}
+    for id_usuario, codigo in emprestimos[:n // 20]:
+        if usuarios[id_usuario] not in filas[codigo]:
+            filas[codigo].enfileirar(usuarios[id_usuario], 1)
+
+    # Reconstrução antiga: reinserir um a um na BST, O(n log n)
+    inicio = time.perf_counter()
+    bst = BST()
+    for livro in livros:
+        bst.inserir(livro)
+    tempo_reinsercao = time.perf_counter() - inicio
+    print(f"   Reinserção na BST : {tempo_reinsercao:.2f} s")
+
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "biblioteca.snap")
+        inicio = time.perf_counter()
+        salvar(caminho, livros, usuarios, bst, recomendador.grafo, filas, recomendador)
+        tempo_salvar = time.perf_counter() - inicio
+        tamanho = os.path.getsize(caminho)
+        del livros, bst, filas, emprestimos
+        recomendador2 = Recomendador(Grafo(), janela=10)
+        inicio = time.perf_counter()
+        carregar(caminho, [], {}, BST(), recomendador2.grafo, {}, recomendador2)
+        tempo_carregar = time.perf_counter() - inicio
+        del recomendador2
+        # Inicialização real do serviço: a carga mais os índices derivados dos
+        # livros (índice textual e árvore radix), reconstruídos em lote
+        inicio = time.perf_counter()
+        Biblioteca(caminho)
+        tempo_inicializar = time.perf_counter() - inicio
+    print(f"   Salvar            : {tempo_salvar:.2f} s ({tamanho / 1e6:.1f} MB)")
+    print(f"   Carregar (estado completo): {tempo_carregar:.2f} s")
+    print(f"   Biblioteca(snapshot) (carga + índices): {tempo_inicializar:.2f} s")
+    return {"reinsercao": tempo_reinsercao, "salvar": tempo_salvar, "carregar": tempo_carregar,
+            "inicializar": tempo_inicializar}
+
+
+def benchmark_wal(n=200000):
+    print(f"=== LOG DE ESCRITA ANTECIPADA ({n} operações) ===")
+    random.seed(42)
+    registros = [random.choice([
+        ["livro", f"Título {i}", f"Autor {i % 1000}", f"L{i}"],
+        ["usuario", f"Usuário {i}", f"U{i}", False],
+        ["emprestimo", f"U{i % 5000}", f"L{i % 20000}"],
+        ["devolucao", f"L{i % 20000}"],
+    ]) for i in range(n)]
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        # Referência: um fsync por operação (amostra menor, é ordens de grandeza mais lento)
+        amostra = registros[:max(1, n // 100)]
+        log = LogEscrita(os.path.join(pasta, "individual.wal"))
+        inicio = time.perf_counter()
+        for registro in amostra:
+            log.confirmar(log.registrar(registro))
+        resultados["fsync por operação"] = len(amostra) / (time.perf_counter() - inicio)
+        log.fechar()
+
+        caminho = os.path.join(pasta, "grupo.wal")
+        log = LogEscrita(caminho)
+        inicio = time.perf_counter()
+        for registro in registros:
+            log.registrar(registro)
+        log.confirmar()
+        resultados["commit em grupo"] = n / (time.perf_counter() - inicio)
+        fsyncs = log.fsyncs
+        log.fechar()
+
+        inicio = time.perf_counter()
+        lidos = sum(1 for _ in ler(caminho))
+        resultados["recuperação (leitura)"] = lidos / (time.perf_counter() - inicio)
+    for nome, taxa in resultados.items():
+        print(f"   {nome.ljust(22)}: {taxa:12,.0f} ops/s")
+    print(f"   {n} operações em {fsyncs} fsyncs")
+    return resultados
+
+
+def _memoria_privada_kb():
+    # Memória anônima (não compartilhada) do processo, em kB; só em Linux
+    try:
+        with open("/proc/self/status") as status:
+            for linha in status:
+                if linha.startswith("RssAnon:"):
+                    return int(linha.split()[1])
+    except OSError:
+        pass
+    return float("nan")
+
+
+def _trabalhador_catalogo(caminho, modo, codigos):
+    # Executado em um processo separado: abre o catálogo e faz consultas por código
+    antes = _memoria_privada_kb()
+    inicio = time.perf_counter()
+    catalogo = CatalogoMapeado(caminho)
+    if modo == "cópia por processo":
+        # Cada processo materializa o catálogo inteiro em objetos próprios
+        livros = {l.codigo: Livro(l.titulo, l.autor, l.codigo) for l in catalogo}
+        consultar = livros.get
+    else:
+        consultar = catalogo.por_codigo
+    tempo_abertura = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    for codigo in codigos:
+        consultar(codigo).titulo
+    tempo_consultas = time.perf_counter() - inicio
+    return tempo_abertura, tempo_consultas / len(codigos), _memoria_privada_kb() - antes
+
+
+def benchmark_catalogo_mmap(n=1000000, processos=4):
+    print(f"=== CATÁLOGO MAPEADO EM MEMÓRIA ({n} livros, {processos} processos) ===")
+    random.seed(42)
+    codigos = [f"L{random.randrange(n):07d}" for _ in range(10000)]
+    resultados = {}
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, "catalogo.cat")
+        inicio = time.perf_counter()
+        gravar_catalogo(caminho, (Livro(f"Título {i}", f"Autor {i % 5000}", f"L{i:07d}") for i in range(n)))
+        print(f"   Geração do arquivo: {time.perf_counter() - inicio:.2f} s "
+              f"({os.path.getsize(caminho) / 1e6:.1f} MB)")
+        with ProcessPoolExecutor(processos, mp_context=get_context("spawn")) as executor:
+            for modo in ("cópia por processo", "mmap compartilhado"):
+                medidas = list(executor.map(_trabalhador_catalogo, [caminho] * processos,
+                                            [modo] * processos, [codigos] * processos))
+                abertura = max(m[0] for m in medidas)
+                consulta = sum(m[1] for m in medidas) / processos
+                memoria = sum(m[2] for m in medidas) / processos
+                resultados[modo] = (abertura, consulta, memoria)
+                print(f"   {modo.ljust(20)}: abertura {1000 * abertura:9.1f} ms, "
+                      f"consulta {1e6 * consulta:5.1f} µs, memória privada {memoria / 1024:7.1f} MB/processo")
+    return resultados
+
+
+def _vazao(operacao, argumentos):
+    inicio = time.perf_counter()
+    for args in argumentos:
+        operacao(*args)
+    return len(argumentos) / (time.perf_counter() - inicio)
+
+
+def benchmark_servico(n=100000):
+    print(f"=== VAZÃO DA CAMADA DE SERVIÇO ({n} livros) ===")
+    random.seed(42)
+    silabas = ["ba", "ca", "da", "fe", "go", "lu", "ma", "ni", "po", "ra", "sa", "te", "vi"]
+    titulos = [" ".join("".join(random.choices(silabas, k=random.randint(2, 4)))
+                        for _ in range(random.randint(1, 4))) for _ in range(n)]
+    usuarios = max(1, n // 10)
+
+    def medir(biblioteca):
+        resultados = {}
+        resultados["cadastrar_livro"] = _vazao(biblioteca.cadastrar_livro,
+                                               [(t, f"Autor {i % 1000}", f"L{i}") for i, t in enumerate(titulos)])
+        resultados["cadastrar_usuario"] = _vazao(biblioteca.cadastrar_usuario,
+                                                 [(f"Usuário {i}", f"U{i}", i % 10 == 0) for i in range(usuarios)])
+        emprestimos = {(f"U{random.randrange(usuarios)}", f"L{int(n * random.random() ** 2)}")
+                       for _ in range(n // 2)}
+        resultados["emprestar"] = _vazao(biblioteca.emprestar, list(emprestimos))
+        resultados["devolver"] = _vazao(biblioteca.devolver, [(f"L{random.randrange(n)}",) for _ in range(n // 4)])
+        amostra = [(random.choice(titulos),) for _ in range(10000)]
+        resultados["buscar (exato)"] = _vazao(biblioteca.buscar, amostra)
+        resultados["buscar (prefixo)"] = _vazao(biblioteca.buscar, [(t[:4],) for (t,) in amostra])
+        resultados["buscar (com erro)"] = _vazao(biblioteca.buscar, [("x" + t,) for (t,) in amostra[:2000]])
+        resultados["livro (código)"] = _vazao(biblioteca.livro, [(f"L{random.randrange(n)}",) for _ in range(n)])
+        resultados["recomendar"] = _vazao(biblioteca.recomendar, [(f"L{random.randrange(n // 10)}",)
+                                                                  for _ in range(2000)])
+        # Uma chamada por ação no histórico: além dele, desfazer só retornaria "Nada para desfazer"
+        resultados["desfazer"] = _vazao(biblioteca.desfazer, [()] * len(biblioteca.historico))
+        return resultados
+
+    medidas = {"memória": medir(Biblioteca())}
+    with tempfile.TemporaryDirectory() as pasta:
+        # Com log de escrita antecipada e commit em grupo (sem fsync por operação)
+        biblioteca = Biblioteca(os.path.join(pasta, "biblioteca.snap"), os.path.join(pasta, "biblioteca.wal"),
+                                checkpoint_a_cada=10 ** 9, confirmar_cada_operacao=False)
+        random.seed(42)
+        medidas["com log"] = medir(biblioteca)
+        biblioteca.wal.fechar()
+    print(f"   {'operação'.ljust(20)} {'memória':>12} {'com log':>12}  (ops/s)")
+    for operacao in medidas["memória"]:
+        print(f"   {operacao.ljust(20)} {medidas['memória'][operacao]:12,.0f} {medidas['com log'][operacao]:12,.0f}")
+    return medidas
+
+
+def benchmark_servidor(n=100000):
+    print(f"=== SERVIDOR HTTP: GERADOR DE CARGA LOCAL ({n} livros) ===")
+    random.seed(42)
+    biblioteca = Biblioteca()
+    titulos = [f"Livro {i}" for i in range(n)]
+    for i, titulo in enumerate(titulos):
+        biblioteca.cadastrar_livro(titulo, f"Autor {i % 1000}", f"L{i}")
+    usuarios = max(1, n // 10)
+    for i in range(usuarios):
+        biblioteca.cadastrar_usuario(f"Usuário {i}", f"U{i}")
+    for _ in range(n // 2):
+        biblioteca.emprestar(f"U{random.randrange(usuarios)}", f"L{int(n * random.random() ** 2)}")
+
+    # Chaves concentradas em poucos livros populares (como em um catálogo real)
+    populares = [int(n * random.random() ** 3) for _ in range(1000)]
+    caminhos = ([f"/livros/L{i}" for i in populares] + [f"/usuarios/U{i % usuarios}" for i in populares]
+                + [f"/buscar?titulo=Livro%20{i}" for i in populares[:500]]
+                + [f"/recomendar/L{i}" for i in populares[:100]])
+
+    async def medir(conexoes, total):
+        servidor = await ServidorBiblioteca(biblioteca, porta=0).iniciar()
+        try:
+            carga = await gerar_carga(servidor.host, servidor.porta, caminhos, conexoes, total)
+        finally:
+            await servidor.parar()
+        return carga, servidor.metricas()
+
+    resultados = {}
+    print(f"   {'conexões':>8} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'consultas/lote':>15} {'coalescidas':>12}")
+    for conexoes in (1, 10, 100):
+        carga, metricas = asyncio.run(medir(conexoes, 20000))
+        por_lote = metricas["consultas_em_lote"] / max(1, metricas["lotes"])
+        print(f"   {conexoes:8d} {carga['req_s']:10,.0f} {carga['p50']:8.2f} {carga['p99']:8.2f} "
+              f"{por_lote:15.1f} {metricas['coalescidas']:12d}")
+        resultados[conexoes] = (carga, metricas)
+    return resultados
+
+
+BENCHMARKS = {
+    "memoria": benchmark_memoria,
+    "recomendacao": benchmark_recomendacao,
+    "grafo_lote": benchmark_grafo_lote,
+    "busca_textual": benchmark_busca_textual,
+    "snapshot": benchmark_snapshot,
+    "wal": benchmark_wal,
+    "catalogo_mmap": benchmark_catalogo_mmap,
+    "servico": benchmark_servico,
+    "servidor": benchmark_servidor,
+}
+
+if __name__ == "__main__":
+    nomes = [sys.argv[1]] if len(sys.argv) > 1 else list(BENCHMARKS)
+    argumentos = [int(sys.argv[2])] if len(sys.argv) > 2 else []
+    for nome in nomes:
+        BENCHMARKS[nome](*argumentos)
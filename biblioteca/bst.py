@@ -1,4 +1,6 @@
 class NodoBST:
+    __slots__ = ("livro", "esq", "dir")
+
     def __init__(self, livro):
         self.livro = livro
         self.esq = None
@@ -9,35 +11,60 @@ class BST:
         self.raiz = None
 
     def inserir(self, livro):
-        def _inserir(raiz, livro):
-            if not raiz:
-                return NodoBST(livro)
-            if livro.titulo < raiz.livro.titulo:
-                raiz.esq = _inserir(raiz.esq, livro)
+        # Iterativo: uma árvore degenerada (títulos cadastrados em ordem) não
+        # estoura o limite de recursão
+        novo = NodoBST(livro)
+        if not self.raiz:
+            self.raiz = novo
+            return
+        nodo = self.raiz
+        while True:
+            if livro.titulo < nodo.livro.titulo:
+                if not nodo.esq:
+                    nodo.esq = novo
+                    return
+                nodo = nodo.esq
             else:
-                raiz.dir = _inserir(raiz.dir, livro)
-            return raiz
-        self.raiz = _inserir(self.raiz, livro)
+                if not nodo.dir:
+                    nodo.dir = novo
+                    return
+                nodo = nodo.dir
+
+    def construir_balanceada(self, livros_ordenados):
+        # Substitui o conteúdo por uma árvore balanceada montada direto de livros já
+        # ordenados por título (ex.: carregados de um snapshot): O(n), sem comparações,
+        # e altura ~log2(n), ao contrário de inserir um a um em ordem
+        nodos = list(map(NodoBST, livros_ordenados))
+
+        def _ligar(inicio, fim):
+            meio = (inicio + fim) // 2
+            nodo = nodos[meio]
+            if inicio < meio:
+                nodo.esq = _ligar(inicio, meio)
+            if meio + 1 < fim:
+                nodo.dir = _ligar(meio + 1, fim)
+            return nodo
+        self.raiz = _ligar(0, len(nodos)) if nodos else None
 
     def buscar(self, titulo):
-        def _buscar(raiz, titulo):
-            if not raiz:
-                return None
-            if raiz.livro.titulo == titulo:
-                return raiz.livro
-            if titulo < raiz.livro.titulo:
-                return _buscar(raiz.esq, titulo)
-            else:
-                return _buscar(raiz.dir, titulo)
-        return _buscar(self.raiz, titulo)
+        nodo = self.raiz
+        while nodo:
+            if nodo.livro.titulo == titulo:
+                return nodo.livro
+            nodo = nodo.esq if titulo < nodo.livro.titulo else nodo.dir
+        return None
 
-    def em_ordem(self, raiz=None, lista=None):
-        if lista is None:
-            lista = []
-        if raiz is None:
-            raiz = self.raiz
-        if raiz is not None:
-            self.em_ordem(raiz.esq, lista)
-            lista.append(raiz.livro)
-            self.em_ordem(raiz.dir, lista)
+    def em_ordem(self):
+        # Percurso iterativo com pilha explícita: não estoura o limite de recursão
+        # em árvores degeneradas (ex.: livros cadastrados em ordem alfabética)
+        lista = []
+        pilha = []
+        nodo = self.raiz
+        while pilha or nodo:
+            while nodo:
+                pilha.append(nodo)
+                nodo = nodo.esq
+            nodo = pilha.pop()
+            lista.append(nodo.livro)
+            nodo = nodo.dir
         return lista
\ No newline at end of file
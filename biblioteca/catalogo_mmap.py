@@ -0,0 +1,173 @@
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+
+from acervo import ColunaOrdenada, LivroVisao
+from search.search_algorithms import busca_binaria  # acervo já põe a raiz no sys.path
+
+# Catálogo somente leitura aberto com mmap. Vários processos que abrem o mesmo
+# arquivo compartilham as páginas pelo cache do sistema operacional: abrir custa
+# O(1) (só o cabeçalho é lido) e cada string só é decodificada quando acessada.
+#
+# Layout (little-endian, seções alinhadas em 8 bytes):
+#   cabeçalho   MAGICO, n, capacidade da tabela hash e o início de cada seção
+#   registros   n x (início e tamanho de título, autor e código nos dados)
+#   ordem       n x uint32: registros em ordem de título
+#   hash        capacidade x uint32: registro + 1 (0 = vazio), sondagem linear
+#               sobre crc32 do código, estável entre processos (ao contrário de hash())
+#   dados       strings UTF-8 concatenadas
+MAGICO = b"BIBCAT01"
+_CABECALHO = struct.Struct("<8sQQQQQQ")
+_REGISTRO = struct.Struct("<QQQIII")
+
+
+def gravar_catalogo(caminho, livros):
+    # Gera o arquivo a partir de livros (ou visões) com titulo, autor e codigo
+    dados = bytearray()
+    registros = bytearray()
+    titulos, codigos = [], []
+    for livro in livros:
+        campos = []
+        for texto in (livro.titulo, livro.autor, livro.codigo):
+            codificado = texto.encode("utf-8")
+            campos.append((len(dados), len(codificado)))
+            dados += codificado
+        (t, nt), (a, na), (c, nc) = campos
+        registros += _REGISTRO.pack(t, a, c, nt, na, nc)
+        titulos.append(livro.titulo)
+        codigos.append(livro.codigo)
+
+    n = len(titulos)
+    ordem = array("I", sorted(range(n), key=titulos.__getitem__))
+    capacidade = 8
+    while capacidade < 2 * n:
+        capacidade *= 2
+    tabela = array("I", bytes(4 * capacidade))
+    for i, codigo in enumerate(codigos):
+        slot = zlib.crc32(codigo.encode("utf-8")) & (capacidade - 1)
+        while tabela[slot]:
+            slot = (slot + 1) & (capacidade - 1)
+        tabela[slot] = i + 1
+    if sys.byteorder != "little":
+        ordem.byteswap()
+        tabela.byteswap()
+
+    secoes = [bytes(registros), ordem.tobytes(), tabela.tobytes(), bytes(dados)]
+    inicios = []
+    posicao = _CABECALHO.size
+    for secao in secoes:
+        posicao += -posicao % 8
+        inicios.append(posicao)
+        posicao += len(secao)
+    with open(caminho, "wb") as arquivo:
+        arquivo.write(_CABECALHO.pack(MAGICO, n, capacidade, *inicios))
+        for inicio, secao in zip(inicios, secoes):
+            arquivo.write(bytes(inicio - arquivo.tell()))
+            arquivo.write(secao)
+
+
+class CatalogoMapeado:
+    # Mesma interface de leitura do Acervo (titulo/autor/codigo(i), LivroVisao),
+    # mas sobre o arquivo mapeado em memória
+    def __init__(self, caminho):
+        self.arquivo = open(caminho, "rb")
+        self.mapa = mmap.mmap(self.arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mapa) < _CABECALHO.size:
+            self.fechar()
+            raise ValueError(f"{caminho} não é um catálogo mapeável")
+        magico, self.n, self.capacidade, inicio_registros, inicio_ordem, inicio_hash, inicio_dados = \
+            _CABECALHO.unpack_from(self.mapa, 0)
+        if magico != MAGICO:
+            self.fechar()
+            raise ValueError(f"{caminho} não é um catálogo mapeável")
+        self.registros = inicio_registros
+        self.dados = inicio_dados
+        # Os índices são lidos direto das páginas mapeadas, sem cópia
+        visao = memoryview(self.mapa)
+        self.ordem = visao[inicio_ordem:inicio_ordem + 4 * self.n].cast("I")
+        self.hash = visao[inicio_hash:inicio_hash + 4 * self.capacidade].cast("I")
+        visao.release()
+        if sys.byteorder != "little":
+            # Em máquinas big-endian os índices são copiados e convertidos (O(n))
+            ordem, tabela = array("I", self.ordem), array("I", self.hash)
+            ordem.byteswap()
+            tabela.byteswap()
+            self.ordem.release()
+            self.hash.release()
+            self.ordem, self.hash = ordem, tabela
+        self.titulos = ColunaOrdenada(self.titulo, self.ordem)
+
+    def _campo(self, i, campo):
+        registro = _REGISTRO.unpack_from(self.mapa, self.registros + i * _REGISTRO.size)
+        inicio = self.dados + registro[campo]
+        return self.mapa[inicio:inicio + registro[campo + 3]].decode("utf-8")
+
+    def titulo(self, i):
+        return self._campo(i, 0)
+
+    def autor(self, i):
+        return self._campo(i, 1)
+
+    def codigo(self, i):
+        return self._campo(i, 2)
+
+    def buscar(self, titulo):
+        # Busca binária sobre o índice de títulos: O(log n) títulos decodificados
+        posicao = busca_binaria(self.titulos, titulo)
+        return self[self.ordem[posicao]] if posicao != -1 else None
+
+    def com_prefixo(self, prefixo, k=10):
+        # Os k primeiros livros, em ordem de título, cujo título começa com prefixo
+        posicao = bisect_left(self.titulos, prefixo)
+        resultado = []
+        while posicao < self.n and len(resultado) < k:
+            i = self.ordem[posicao]
+            if not self.titulo(i).startswith(prefixo):
+                break
+            resultado.append(self[i])
+            posicao += 1
+        return resultado
+
+    def por_codigo(self, codigo):
+        # Índice hash código -> registro: O(1) esperado
+        mascara = self.capacidade - 1
+        slot = zlib.crc32(codigo.encode("utf-8")) & mascara
+        while True:
+            i = self.hash[slot] - 1
+            if i < 0:
+                return None
+            if self.codigo(i) == codigo:
+                return self[i]
+            slot = (slot + 1) & mascara
+
+    def em_ordem(self):
+        for i in self.ordem:
+            yield self[i]
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.n:
+            raise IndexError(i)
+        return LivroVisao(self, i)
+
+    def __len__(self):
+        return self.n
+
+    def fechar(self):
+        # As memoryviews precisam ser liberadas antes de fechar o mapa
+        for atributo in ("ordem", "hash"):
+            visao = getattr(self, atributo, None)
+            if isinstance(visao, memoryview):
+                visao.release()
+        self.titulos = None
+        self.mapa.close()
+        self.arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
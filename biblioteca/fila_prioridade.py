@@ -0,0 +1,126 @@
+class FilaPrioridade:
+    # Heap binário mínimo: menor prioridade sai primeiro e, em caso de empate,
+    # sai quem entrou antes (a ordem de chegada desempata de forma estável).
+    # O dicionário de posições permite alterar prioridade e cancelar em O(log n).
+    __slots__ = ("heap", "posicoes", "contador")
+
+    def __init__(self):
+        self.heap = []      # entradas [prioridade, ordem, item]
+        self.posicoes = {}  # item: índice da entrada no heap
+        self.contador = 0   # ordem de chegada
+
+    def enfileirar(self, item, prioridade=0):
+        if item in self.posicoes:
+            raise ValueError("Item já está na fila")
+        self._inserir([prioridade, self.contador, item])
+        self.contador += 1
+
+    def reinserir(self, item, prioridade, ordem):
+        # Devolve à fila uma entrada retirada por extrair(), na mesma posição relativa
+        if item in self.posicoes:
+            raise ValueError("Item já está na fila")
+        self._inserir([prioridade, ordem, item])
+
+    def extrair(self):
+        # Remove o primeiro da fila e retorna (item, prioridade, ordem)
+        if not self.heap:
+            return None
+        entrada = self._remover_posicao(0)
+        return entrada[2], entrada[0], entrada[1]
+
+    def desenfileirar(self):
+        entrada = self.extrair()
+        return entrada[0] if entrada else None
+
+    def primeiro(self):
+        return self.heap[0][2] if self.heap else None
+
+    def alterar_prioridade(self, item, prioridade):
+        i = self.posicoes.get(item)
+        if i is None:
+            return False
+        antiga = self.heap[i][0]
+        self.heap[i][0] = prioridade
+        if prioridade < antiga:
+            self._subir(i)
+        else:
+            self._descer(i)
+        return True
+
+    def cancelar(self, item):
+        i = self.posicoes.get(item)
+        if i is None:
+            return False
+        self._remover_posicao(i)
+        return True
+
+    def vazio(self):
+        return len(self.heap) == 0
+
+    @property
+    def itens(self):
+        # Itens na ordem em que serão atendidos (O(n log n), usado para exibição)
+        return [entrada[2] for entrada in sorted(self.heap, key=lambda e: (e[0], e[1]))]
+
+    def __contains__(self, item):
+        return item in self.posicoes
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _inserir(self, entrada):
+        self.heap.append(entrada)
+        self.posicoes[entrada[2]] = len(self.heap) - 1
+        self._subir(len(self.heap) - 1)
+
+    def _remover_posicao(self, i):
+        ultimo = len(self.heap) - 1
+        if i != ultimo:
+            self._trocar(i, ultimo)
+        entrada = self.heap.pop()
+        del self.posicoes[entrada[2]]
+        if i < len(self.heap):
+            self._subir(i)
+            self._descer(i)
+        return entrada
+
+    def _menor(self, i, j):
+        a, b = self.heap[i], self.heap[j]
+        return (a[0], a[1]) < (b[0], b[1])
+
+    def _trocar(self, i, j):
+        self.heap[i], self.heap[j] = self.heap[j], self.heap[i]
+        self.posicoes[self.heap[i][2]] = i
+        self.posicoes[self.heap[j][2]] = j
+
+    def _subir(self, i):
+        while i > 0:
+            pai = (i - 1) // 2
+            if not self._menor(i, pai):
+                break
+            self._trocar(i, pai)
+            i = pai
+
+    def _descer(self, i):
+        n = len(self.heap)
+        while True:
+            menor = i
+            esq = 2 * i + 1
+            dir = esq + 1
+            if esq < n and self._menor(esq, menor):
+                menor = esq
+            if dir < n and self._menor(dir, menor):
+                menor = dir
+            if menor == i:
+                break
+            self._trocar(i, menor)
+            i = menor
+
+
+def prioridade_emprestimo(usuario):
+    # Política da biblioteca: docentes primeiro; dentro de cada grupo,
+    # usuários sem atraso vêm antes dos que têm devoluções atrasadas
+    prioridade = 0 if usuario.docente else 2
+    if usuario.em_atraso:
+        prioridade += 1
+    return prioridade
@@ -1,18 +1,232 @@
+import heapq
+import math
+from array import array
+from collections import Counter
+from itertools import combinations
+
+
 class Grafo:
     # Cada livro é um nó; uma aresta existe se dois livros foram emprestados juntos
-    def __init__(self):
-        self.livros = {}  # codigo_livro: set(codigos relacionados)
+    # e o seu peso conta quantas vezes isso aconteceu
+    def __init__(self, cache_k=None):
+        self.livros = {}  # codigo_livro: {codigo relacionado: peso}
+        # Com cache_k, o top-cache_k de cada livro consultado fica guardado
+        # até que uma nova relação envolvendo o livro seja adicionada
+        self.cache_k = cache_k
+        self._cache = {}
+        self.snapshot = None  # GrafoCSR gerado por congelar()
 
     def adicionar_livro(self, codigo):
         if codigo not in self.livros:
-            self.livros[codigo] = set()
+            self.livros[codigo] = {}
 
-    def adicionar_relacao(self, codigo1, codigo2):
+    def adicionar_relacao(self, codigo1, codigo2, peso=1):
         self.adicionar_livro(codigo1)
         self.adicionar_livro(codigo2)
-        self.livros[codigo1].add(codigo2)
-        self.livros[codigo2].add(codigo1)
+        if codigo1 == codigo2:
+            return
+        vizinhos1, vizinhos2 = self.livros[codigo1], self.livros[codigo2]
+        vizinhos1[codigo2] = vizinhos1.get(codigo2, 0) + peso
+        vizinhos2[codigo1] = vizinhos2.get(codigo1, 0) + peso
+        self._cache.pop(codigo1, None)
+        self._cache.pop(codigo2, None)
+        self.snapshot = None
+
+    def remover_relacao(self, codigo1, codigo2, peso=1):
+        # Desfaz adicionar_relacao: subtrai o peso e apaga a aresta que chega a zero
+        vizinhos1, vizinhos2 = self.livros.get(codigo1), self.livros.get(codigo2)
+        if codigo1 == codigo2 or vizinhos1 is None or codigo2 not in vizinhos1:
+            return
+        restante = vizinhos1[codigo2] - peso
+        if restante > 0:
+            vizinhos1[codigo2] = vizinhos2[codigo1] = restante
+        else:
+            del vizinhos1[codigo2]
+            del vizinhos2[codigo1]
+        self._cache.pop(codigo1, None)
+        self._cache.pop(codigo2, None)
+        self.snapshot = None
+
+    def adicionar_relacoes(self, relacoes):
+        # Versão em lote de adicionar_relacao para tuplas (codigo1, codigo2) ou
+        # (codigo1, codigo2, peso). O Counter agrega as tuplas repetidas sem uma
+        # chamada Python por tupla; a adjacência é atualizada uma vez por par distinto.
+        contagem = Counter(relacoes)
+        if any(len(relacao) > 2 for relacao in contagem):
+            ponderada = Counter()
+            for relacao, vezes in contagem.items():
+                peso = relacao[2] if len(relacao) > 2 else 1
+                ponderada[relacao[0], relacao[1]] += peso * vezes
+            contagem = ponderada
+        self._aplicar_contagem(contagem)
+
+    def adicionar_cestas(self, cestas):
+        # Cada cesta é o conjunto de livros de um empréstimo (ou de um usuário);
+        # todos os pares dentro da mesma cesta ganham +1
+        contagem = Counter()
+        for cesta in cestas:
+            codigos = sorted(set(cesta))
+            if len(codigos) == 1:
+                self.adicionar_livro(codigos[0])
+            contagem.update(combinations(codigos, 2))
+        self._aplicar_contagem(contagem)
+
+    def _aplicar_contagem(self, contagem):
+        # contagem: {(codigo1, codigo2): peso a somar na aresta}
+        livros = self.livros
+        alterou = False
+        for (codigo1, codigo2), peso in contagem.items():
+            vizinhos1 = livros.get(codigo1)
+            if vizinhos1 is None:
+                vizinhos1 = livros[codigo1] = {}
+            if codigo1 == codigo2:
+                continue
+            vizinhos2 = livros.get(codigo2)
+            if vizinhos2 is None:
+                vizinhos2 = livros[codigo2] = {}
+            vizinhos1[codigo2] = vizinhos1.get(codigo2, 0) + peso
+            vizinhos2[codigo1] = vizinhos2.get(codigo1, 0) + peso
+            alterou = True
+        if alterou:
+            self._cache.clear()
+            self.snapshot = None
+
+    def peso(self, codigo1, codigo2):
+        return self.livros.get(codigo1, {}).get(codigo2, 0)
+
+    def recomendar(self, codigo, k=None):
+        # Retorna códigos dos livros relacionados ao fornecido, do maior para o
+        # menor peso (empates pelo código); com k, apenas os k primeiros
+        if self.snapshot is not None:
+            return self.snapshot.recomendar(codigo, k)
+        vizinhos = self.livros.get(codigo)
+        if not vizinhos:
+            return []
+        if k is None:
+            k = len(vizinhos)
+        if self.cache_k is not None and k <= self.cache_k:
+            topo = self._cache.get(codigo)
+            if topo is None:
+                topo = self._cache[codigo] = top_k(vizinhos.items(), self.cache_k)
+            return topo[:k]
+        return top_k(vizinhos.items(), k)
+
+    def precomputar_top_k(self):
+        # Preenche o cache para todos os livros (requer cache_k)
+        if self.cache_k is None:
+            raise ValueError("precomputar_top_k requer um Grafo criado com cache_k")
+        for codigo, vizinhos in self.livros.items():
+            self._cache[codigo] = top_k(vizinhos.items(), self.cache_k)
+
+    def congelar(self):
+        # Gera o snapshot CSR; enquanto nenhuma relação mudar, recomendar() lê dele
+        self.snapshot = GrafoCSR.de_grafo(self)
+        return self.snapshot
+
+
+def top_k(pares, k):
+    # Códigos dos k pares (codigo, peso) de maior peso, empates pelo código.
+    # heapify custa O(grau). Depois, em vez de extrair k vezes do heap grande,
+    # percorre-o com um heap auxiliar de fronteira (raiz, depois filhos de cada
+    # nó extraído), que nunca passa de k + 1 entradas: O(grau + k log k)
+    heap = [(-peso, cod) for cod, peso in pares]
+    heapq.heapify(heap)
+    resultado = []
+    fronteira = [(heap[0], 0)] if heap else []
+    while fronteira and len(resultado) < k:
+        entrada, i = heapq.heappop(fronteira)
+        resultado.append(entrada[1])
+        for filho in (2 * i + 1, 2 * i + 2):
+            if filho < len(heap):
+                heapq.heappush(fronteira, (heap[filho], filho))
+    return resultado
+
+
+class GrafoCSR:
+    # Snapshot imutável do Grafo no formato CSR (compressed sparse row):
+    # os vizinhos do livro de número i ocupam indices[indptr[i]:indptr[i + 1]],
+    # em ordem crescente, com os pesos correspondentes na mesma faixa de pesos.
+    # Cada código de livro é mapeado para um inteiro (codigos / posicao).
+    def __init__(self, codigos, indptr, indices, pesos):
+        self.codigos = codigos
+        self.posicao = {codigo: i for i, codigo in enumerate(codigos)}
+        self.indptr = indptr
+        self.indices = indices
+        self.pesos = pesos
+        self.normas = array("d", (
+            math.sqrt(sum(p * p for p in pesos[indptr[i]:indptr[i + 1]])) for i in range(len(codigos))
+        ))
+
+    @classmethod
+    def de_grafo(cls, grafo):
+        codigos = list(grafo.livros)
+        posicao = {codigo: i for i, codigo in enumerate(codigos)}
+        indptr = array("q", [0])
+        indices = array("q")
+        pesos = array("d")
+        for codigo in codigos:
+            vizinhos = grafo.livros[codigo]
+            linha = sorted((posicao[v], p) for v, p in vizinhos.items())
+            indices.extend(j for j, _ in linha)
+            pesos.extend(p for _, p in linha)
+            indptr.append(len(indices))
+        return cls(codigos, indptr, indices, pesos)
+
+    def vizinhos(self, codigo):
+        # Fatias (memoryview) de indices e pesos do livro, sem copiar os arrays
+        i = self.posicao.get(codigo)
+        if i is None:
+            return memoryview(self.indices)[0:0], memoryview(self.pesos)[0:0]
+        inicio, fim = self.indptr[i], self.indptr[i + 1]
+        return memoryview(self.indices)[inicio:fim], memoryview(self.pesos)[inicio:fim]
+
+    def recomendar(self, codigo, k=None):
+        indices, pesos = self.vizinhos(codigo)
+        if k is None:
+            k = len(indices)
+        codigos = self.codigos
+        return top_k(((codigos[j], p) for j, p in zip(indices, pesos)), k)
+
+    def _produtos(self, i, binario):
+        # Linha i de A·Aᵀ: produto escalar da linha i com todas as outras de uma vez,
+        # somando, para cada vizinho j de i, a linha j ponderada por A[i][j]
+        indptr = self.indptr
+        indices, pesos = memoryview(self.indices), memoryview(self.pesos)
+        acumulado = {}
+        for j, w in zip(indices[indptr[i]:indptr[i + 1]], pesos[indptr[i]:indptr[i + 1]]):
+            inicio, fim = indptr[j], indptr[j + 1]
+            if binario:
+                for l in indices[inicio:fim]:
+                    acumulado[l] = acumulado.get(l, 0.0) + 1.0
+            else:
+                for l, x in zip(indices[inicio:fim], pesos[inicio:fim]):
+                    acumulado[l] = acumulado.get(l, 0.0) + w * x
+        acumulado.pop(i, None)
+        return acumulado
+
+    def similaridades(self, codigo, medida="cosseno"):
+        # {outro codigo: similaridade} para todos os livros com vizinhos em comum
+        i = self.posicao.get(codigo)
+        if i is None:
+            return {}
+        if medida == "cosseno":
+            produtos = self._produtos(i, binario=False)
+            normas = self.normas
+            return {self.codigos[l]: dot / (normas[i] * normas[l]) for l, dot in produtos.items()}
+        if medida == "jaccard":
+            intersecoes = self._produtos(i, binario=True)
+            indptr = self.indptr
+            grau_i = indptr[i + 1] - indptr[i]
+            return {
+                self.codigos[l]: inter / (grau_i + indptr[l + 1] - indptr[l] - inter)
+                for l, inter in intersecoes.items()
+            }
+        raise ValueError(f"Medida inválida: {medida}")
+
+    def similares(self, codigo, k=10, medida="cosseno"):
+        return top_k(self.similaridades(codigo, medida).items(), k)
 
-    def recomendar(self, codigo):
-        # Retorna códigos dos livros relacionados ao fornecido
-        return list(self.livros.get(codigo, []))
\ No newline at end of file
+    def similares_em_lote(self, k=10, medida="cosseno"):
+        # Para a rotina noturna: gera (codigo, top-k similares) para todos os livros
+        for codigo in self.codigos:
+            yield codigo, self.similares(codigo, k, medida)
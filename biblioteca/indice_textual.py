@@ -0,0 +1,255 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+
+_PALAVRA = re.compile(r"\w+")
+
+
+def normalizar(texto):
+    # Minúsculas e sem acentos: "O Cortiço" -> "o cortico"
+    if texto.isascii():
+        return texto.casefold()  # nada a decompor
+    decomposto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def tokenizar(texto):
+    return _PALAVRA.findall(normalizar(texto))
+
+
+class NodoTrie:
+    __slots__ = ("filhos", "palavra")
+
+    def __init__(self):
+        self.filhos = {}
+        self.palavra = None  # token completo, se algum termina neste nó
+
+
+def _delecoes(token):
+    # O próprio token e todas as variantes com um caractere a menos
+    return {token} | {token[:i] + token[i + 1:] for i in range(len(token))}
+
+
+def _distancia_ate_um(a, b):
+    # True se a distância de edição entre a e b for no máximo 1
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1:
+        return False
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    if len(a) == len(b):
+        return a[i + 1:] == b[i + 1:]
+    return a[i:] == b[i + 1:]
+
+
+def _tokens(textos):
+    # Textos None (ex.: livro sem autor) não contribuem com tokens
+    return frozenset(t for texto in textos if texto is not None for t in tokenizar(texto))
+
+
+def _como_conjunto(tokens):
+    return (tokens,) if type(tokens) is str else tokens
+
+
+class IndiceTextual:
+    # Índice invertido de títulos e autores: token -> lista de códigos de livros.
+    #
+    # O vocabulário é mantido ordenado: os tokens com um prefixo formam uma faixa
+    # contígua, achada com duas buscas binárias. Para erros de digitação há um
+    # índice de deleções (cada token é registrado sob ele mesmo e sob suas variantes
+    # sem um caractere): dois tokens a distância 1 sempre compartilham uma dessas
+    # chaves, então a busca custa O(|termo|) consultas. Distância 2 usa Levenshtein
+    # sobre uma trie dos tokens, com poda, só como último recurso; a trie só é
+    # montada na primeira busca que precisa dela.
+    #
+    # Cada termo da consulta é resolvido para um conjunto de tokens; os candidatos
+    # saem das postings do termo mais seletivo e os demais termos são verificados
+    # apenas neles, parando ao atingir o limite de resultados.
+    def __init__(self):
+        self.postings = {}  # token: [códigos]
+        self.tokens = {}    # código: frozenset(tokens do livro)
+        self.delecoes = {}  # token ou token com uma deleção: token, ou {tokens} se mais de um
+        self.vocabulario = []  # tokens em ordem alfabética
+        self.raiz = None       # trie dos tokens, criada sob demanda
+
+    @classmethod
+    def construir(cls, itens):
+        # Construção em lote a partir de (código, *textos) com códigos distintos,
+        # como na carga de um snapshot: o vocabulário é ordenado uma única vez no
+        # final, em vez de um insort por token novo
+        indice = cls()
+        postings = indice.postings
+        for codigo, *textos in itens:
+            tokens = _tokens(textos)
+            indice.tokens[codigo] = tokens
+            for token in tokens:
+                lista = postings.get(token)
+                if lista is None:
+                    postings[token] = [codigo]
+                else:
+                    lista.append(codigo)
+        indice.vocabulario = sorted(postings)
+        for token in indice.vocabulario:
+            indice._registrar_delecoes(token)
+        return indice
+
+    def adicionar(self, codigo, *textos):
+        tokens = _tokens(textos)
+        self.remover(codigo)
+        self.tokens[codigo] = tokens
+        for token in tokens:
+            lista = self.postings.get(token)
+            if lista is None:
+                lista = self.postings[token] = []
+                insort(self.vocabulario, token)
+                self._inserir_trie(token)
+                self._registrar_delecoes(token)
+            lista.append(codigo)
+
+    def remover(self, codigo):
+        for token in self.tokens.pop(codigo, ()):
+            lista = self.postings[token]
+            lista.remove(codigo)
+            if not lista:
+                del self.postings[token]
+                del self.vocabulario[bisect_left(self.vocabulario, token)]
+                self._remover_trie(token)
+                for chave in _delecoes(token):
+                    tokens = self.delecoes[chave]
+                    if type(tokens) is str:
+                        del self.delecoes[chave]
+                        continue
+                    tokens.discard(token)
+                    if len(tokens) == 1:
+                        self.delecoes[chave] = tokens.pop()
+
+    def buscar(self, consulta, limite=10, max_erros=2):
+        # O último termo é tratado como prefixo (o usuário ainda está digitando);
+        # termos sem correspondência exata/prefixo caem na busca aproximada
+        termos = tokenizar(consulta)
+        if not termos:
+            return []
+        expansoes = []
+        for i, termo in enumerate(termos):
+            if i == len(termos) - 1:
+                candidatos = self._com_prefixo(termo)
+            else:
+                candidatos = [termo] if termo in self.postings else []
+            if not candidatos:
+                candidatos = self._aproximados(termo, min(max_erros, self._erros_permitidos(termo)))
+            if not candidatos:
+                return []
+            expansoes.append(candidatos)
+
+        # Os candidatos vêm do termo de menor volume de postings, começando pelo
+        # token igual ao termo digitado; os outros termos funcionam como filtro
+        primeiro = 0
+        if len(expansoes) > 1:
+            custo = [sum(len(self.postings[t]) for t in exp) for exp in expansoes]
+            primeiro = min(range(len(expansoes)), key=custo.__getitem__)
+        filtros = [set(exp) for i, exp in enumerate(expansoes) if i != primeiro]
+        termo = termos[primeiro]
+        tokens_candidatos = sorted(expansoes[primeiro], key=lambda t: t != termo)
+        vistos = set()
+        resultado = []
+        for token in tokens_candidatos:
+            for codigo in self.postings[token]:
+                if codigo in vistos:
+                    continue
+                vistos.add(codigo)
+                tokens = self.tokens[codigo]
+                if all(not tokens.isdisjoint(exp) for exp in filtros):
+                    resultado.append(codigo)
+                    if len(resultado) == limite:
+                        return resultado
+        return resultado
+
+    def completar(self, prefixo, limite=10):
+        # Tokens do vocabulário que começam com o prefixo, em ordem alfabética
+        return self._com_prefixo(normalizar(prefixo))[:limite]
+
+    @staticmethod
+    def _erros_permitidos(termo):
+        if len(termo) < 4:
+            return 0
+        return 1 if len(termo) < 8 else 2
+
+    def _registrar_delecoes(self, token):
+        # A maioria das chaves leva a um único token: ele é guardado direto, e
+        # só as chaves compartilhadas ganham um conjunto (milhões a menos na carga)
+        delecoes = self.delecoes
+        for chave in _delecoes(token):
+            tokens = delecoes.get(chave)
+            if tokens is None:
+                delecoes[chave] = token
+            elif type(tokens) is str:
+                delecoes[chave] = {tokens, token}
+            else:
+                tokens.add(token)
+
+    def _inserir_trie(self, token):
+        if self.raiz is None:
+            return  # a trie inteira é montada quando for usada
+        nodo = self.raiz
+        for c in token:
+            filho = nodo.filhos.get(c)
+            if filho is None:
+                filho = nodo.filhos[c] = NodoTrie()
+            nodo = filho
+        nodo.palavra = token
+
+    def _remover_trie(self, token):
+        if self.raiz is None:
+            return
+        caminho = [self.raiz]
+        for c in token:
+            caminho.append(caminho[-1].filhos[c])
+        caminho[-1].palavra = None
+        # Apaga os nós que ficaram sem filhos e sem palavra
+        for i in range(len(token), 0, -1):
+            nodo = caminho[i]
+            if nodo.filhos or nodo.palavra is not None:
+                break
+            del caminho[i - 1].filhos[token[i - 1]]
+
+    def _com_prefixo(self, prefixo):
+        inicio = bisect_left(self.vocabulario, prefixo)
+        fim = bisect_left(self.vocabulario, prefixo + "\U0010ffff", inicio)
+        return self.vocabulario[inicio:fim]
+
+    def _aproximados(self, termo, max_erros):
+        if max_erros == 0:
+            return []
+        encontrados = {
+            token
+            for chave in _delecoes(termo)
+            for token in _como_conjunto(self.delecoes.get(chave, ()))
+            if _distancia_ate_um(termo, token)
+        }
+        if encontrados or max_erros == 1:
+            return sorted(encontrados)
+        return sorted(self._aproximados_trie(termo, max_erros))
+
+    def _aproximados_trie(self, termo, max_erros):
+        # Levenshtein sobre a trie: cada nó herda a linha da DP do pai, e ramos
+        # cuja linha inteira já passa de max_erros são descartados
+        if self.raiz is None:
+            self.raiz = NodoTrie()
+            for token in self.vocabulario:
+                self._inserir_trie(token)
+        encontrados = set()
+        primeira = list(range(len(termo) + 1))
+        pilha = [(filho, c, primeira) for c, filho in self.raiz.filhos.items()]
+        while pilha:
+            nodo, c, anterior = pilha.pop()
+            linha = [anterior[0] + 1]
+            for j in range(1, len(termo) + 1):
+                custo = 0 if termo[j - 1] == c else 1
+                linha.append(min(linha[j - 1] + 1, anterior[j] + 1, anterior[j - 1] + custo))
+            if nodo.palavra is not None and linha[-1] <= max_erros:
+                encontrados.add(nodo.palavra)
+            if min(linha) <= max_erros:
+                pilha.extend((filho, c2, linha) for c2, filho in nodo.filhos.items())
+        return encontrados
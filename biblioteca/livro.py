@@ -1,9 +1,24 @@
+import sys
+
+
 class Livro:
+    # __slots__ elimina o __dict__ de cada instância. A fila de espera só é criada
+    # no primeiro acesso e o autor (quando é str) é internado, de modo que todos os
+    # livros de um mesmo autor compartilham uma única string; outros valores, como
+    # None, são guardados como vieram.
+    __slots__ = ("titulo", "autor", "codigo", "_fila_espera")
+
     def __init__(self, titulo, autor, codigo):
         self.titulo = titulo
-        self.autor = autor
+        self.autor = sys.intern(autor) if isinstance(autor, str) else autor
         self.codigo = codigo
-        self.fila_espera = []
+        self._fila_espera = None
+
+    @property
+    def fila_espera(self):
+        if self._fila_espera is None:
+            self._fila_espera = []
+        return self._fila_espera
 
     def __str__(self):
-        return f"{self.titulo} ({self.autor}) [Código: {self.codigo}]"
\ No newline at end of file
+        return f"{self.titulo} ({self.autor}) [Código: {self.codigo}]"
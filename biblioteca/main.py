@@ -1,9 +1,4 @@
-from livro import Livro
-from usuario import Usuario
-from fila import Fila
-from pilha import Pilha
-from bst import BST
-from grafo import Grafo
+from servico import Biblioteca
 
 def menu():
     print("\n========= Biblioteca Digital =========")
@@ -18,15 +13,28 @@ def menu():
     print("9. Sair")
     return input("Escolha uma opção: ")
 
-# Estruturas globais
-livros_lista = []
-usuarios_hash = {}
-historico_pilha = Pilha()
-livros_bst = BST()
-grafo_recomendacoes = Grafo()
-filas_emprestimo = {}
+# Histórico de desfazer: guarda registros compactos (só códigos/IDs), mantém no
+# máximo LIMITE_HISTORICO em memória e grava os mais antigos em ARQUIVO_HISTORICO
+LIMITE_HISTORICO = 1000
+ARQUIVO_HISTORICO = "historico.log"
+
+# Estado completo da biblioteca: snapshot + log de escrita antecipada (WAL).
+# Cada operação vai para o log antes de ser confirmada ao usuário; a cada
+# CHECKPOINT_A_CADA operações (e ao sair) o estado é gravado no snapshot e o log
+# é esvaziado. Ao iniciar, o log é repetido sobre o snapshot.
+ARQUIVO_SNAPSHOT = "biblioteca.snap"
+ARQUIVO_WAL = "biblioteca.wal"
+CHECKPOINT_A_CADA = 10000
+
+# Quantidade de livros exibidos na recomendação (mais próximos no grafo primeiro)
+MAX_RECOMENDACOES = 5
 
 def main():
+    biblioteca = Biblioteca(ARQUIVO_SNAPSHOT, ARQUIVO_WAL, ARQUIVO_HISTORICO,
+                            LIMITE_HISTORICO, CHECKPOINT_A_CADA)
+    if biblioteca.livros or biblioteca.usuarios:
+        print(f"{len(biblioteca.livros)} livros e {len(biblioteca.usuarios)} usuários carregados "
+              f"({biblioteca.recuperados} operações recuperadas do log).")
     while True:
         op = menu()
         
@@ -34,96 +42,57 @@ def main():
             titulo = input("Título: ")
             autor = input("Autor: ")
             codigo = input("Código: ")
-            livro = Livro(titulo, autor, codigo)
-            livros_lista.append(livro)
-            livros_bst.inserir(livro)
-            filas_emprestimo[codigo] = Fila()
-            grafo_recomendacoes.adicionar_livro(codigo)
-            historico_pilha.empilhar(("livro", livro))
-            print("Livro cadastrado com sucesso!")
+            print(biblioteca.cadastrar_livro(titulo, autor, codigo).mensagem)
 
         elif op == "2":
             nome = input("Nome do usuário: ")
             id = input("ID do usuário: ")
-            usuario = Usuario(nome, id)
-            usuarios_hash[id] = usuario
-            historico_pilha.empilhar(("usuario", usuario))
-            print("Usuário cadastrado!")
+            docente = input("Docente? (s/n): ").strip().lower() == "s"
+            print(biblioteca.cadastrar_usuario(nome, id, docente).mensagem)
 
         elif op == "3":
             titulo = input("Título do livro: ")
-            livro = livros_bst.buscar(titulo)
-            if livro:
-                print(f"Encontrado: {livro}")
+            resultado = biblioteca.buscar(titulo)
+            if resultado.exato:
+                for livro in resultado.livros:
+                    print(f"Encontrado: {livro}")
+            elif resultado.livros:
+                print("Livros encontrados:")
+                for livro in resultado.livros:
+                    print(f"- {livro}")
             else:
                 print("Livro não encontrado.")
 
         elif op == "4":
             id = input("ID do usuário: ")
             codigo = input("Código do livro: ")
-            usuario = usuarios_hash.get(id)
-            fila = filas_emprestimo.get(codigo)
-            if usuario and fila:
-                fila.enfileirar(usuario)
-                historico_pilha.empilhar(("emprestimo", usuario, codigo))
-                print("Usuário entrou na fila de empréstimo.")
-            else:
-                print("Usuário ou livro não encontrado.")
+            print(biblioteca.emprestar(id, codigo).mensagem)
 
         elif op == "5":
             codigo = input("Código do livro: ")
-            fila = filas_emprestimo.get(codigo)
-            if fila and not fila.vazio():
-                usuario = fila.desenfileirar()
-                print(f"{usuario.nome} devolveu o livro.")
-                historico_pilha.empilhar(("devolucao", usuario, codigo))
-            else:
-                print("Nenhum usuário na fila deste livro.")
+            print(biblioteca.devolver(codigo).mensagem)
 
         elif op == "6":
-            if historico_pilha.vazio():
-                print("Nada para desfazer.")
-            else:
-                acao = historico_pilha.desempilhar()
-                if acao[0] == "livro":
-                    livro = acao[1]
-                    livros_lista.remove(livro)
-                    print("Desfeito cadastro de livro.")
-                elif acao[0] == "usuario":
-                    usuario = acao[1]
-                    usuarios_hash.pop(usuario.id, None)
-                    print("Desfeito cadastro de usuário.")
-                elif acao[0] == "emprestimo":
-                    usuario, codigo = acao[1], acao[2]
-                    if codigo in filas_emprestimo:
-                        fila = filas_emprestimo[codigo]
-                        fila.itens = [u for u in fila.itens if u.id != usuario.id]
-                        print("Desfeito empréstimo.")
-                elif acao[0] == "devolucao":
-                    usuario, codigo = acao[1], acao[2]
-                    if codigo in filas_emprestimo:
-                        filas_emprestimo[codigo].itens.insert(0, usuario)
-                        print("Desfeita devolução.")
+            print(biblioteca.desfazer().mensagem)
 
         elif op == "7":
             codigo = input("Código do livro: ")
-            recomendados = grafo_recomendacoes.recomendar(codigo)
+            recomendados = biblioteca.recomendar(codigo, MAX_RECOMENDACOES)
             if recomendados:
                 print("Usuários que pegaram este livro também pegaram:")
-                for cod in recomendados:
-                    livro = next((l for l in livros_lista if l.codigo == cod), None)
-                    if livro:
-                        print(f"- {livro}")
+                for livro in recomendados:
+                    print(f"- {livro}")
             else:
                 print("Nenhuma recomendação disponível.")
 
         elif op == "8":
             print("\n--- Livros cadastrados ---")
-            for livro in livros_bst.em_ordem():
+            for livro in biblioteca.listar_livros():
                 print(livro)
                 
         elif op == "9":
             print("Saindo...")
+            biblioteca.fechar()
             break
             
         else:
@@ -0,0 +1,179 @@
+import gc
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+
+from fila_prioridade import FilaPrioridade
+from grafo import GrafoCSR
+from livro import Livro
+from usuario import Usuario
+
+# Snapshot binário do estado da biblioteca. O arquivo é uma sequência de blocos,
+# cada um com cabeçalho (tipo, quantidade de itens, tamanho em bytes):
+#   - tipo "s": strings UTF-8 separadas por "\0", decodificadas com um único split
+#   - demais tipos: um array.array com esse typecode, lido com frombytes
+# Nada é lido registro a registro: a carga é dominada pela criação dos objetos.
+MAGICO = b"BIBSNAP1"
+_CABECALHO = struct.Struct("<cQQ")
+_SEPARADOR = "\0"
+
+
+def salvar(caminho, livros, usuarios, bst, grafo, filas, recomendador, lsn=0):
+    # Grava o estado em caminho + ".tmp" e só então substitui o arquivo anterior,
+    # para que uma falha no meio da gravação não corrompa o último snapshot.
+    # lsn é o último registro do log de escrita (wal.py) já incluído no estado.
+    blocos = [array("Q", [lsn])]
+
+    # Livros na ordem da lista, mais a permutação que dá a ordem por título (BST).
+    # Autor None é gravado como "" e as posições desses livros vão num bloco à parte
+    posicao = {id(livro): i for i, livro in enumerate(livros)}
+    ordem = array("I", (posicao[id(l)] for l in bst.em_ordem() if id(l) in posicao))
+    blocos.append(_strings(c for l in livros
+                           for c in (l.titulo, "" if l.autor is None else l.autor, l.codigo)))
+    blocos.append(ordem)
+    blocos.append(array("I", (i for i, l in enumerate(livros) if l.autor is None)))
+
+    # Usuários cadastrados e, em seguida, os que só aparecem em alguma fila
+    tabela = list(usuarios.values())
+    indice_usuario = {id(u): i for i, u in enumerate(tabela)}
+    for fila in filas.values():
+        for _, _, usuario in fila.heap:
+            if id(usuario) not in indice_usuario:
+                indice_usuario[id(usuario)] = len(tabela)
+                tabela.append(usuario)
+    blocos.append(_strings(c for u in tabela for c in (u.nome, u.id)))
+    blocos.append(array("B", (u.docente | u.em_atraso << 1 for u in tabela)))
+    blocos.append(array("Q", [len(usuarios)]))
+
+    # Grafo no formato CSR (as duas direções de cada aresta)
+    csr = grafo.snapshot or GrafoCSR.de_grafo(grafo)
+    pesos = csr.pesos
+    if all(p.is_integer() for p in pesos):
+        pesos = array("q", map(int, pesos))
+    blocos += [_strings(csr.codigos), csr.indptr, csr.indices, pesos]
+
+    # Filas de empréstimo: o heap é gravado na ordem interna, já válida
+    blocos.append(_strings(filas))
+    blocos.append(array("Q", (len(f.heap) for f in filas.values())))
+    blocos.append(array("Q", (f.contador for f in filas.values())))
+    blocos.append(array("q", (e[0] for f in filas.values() for e in f.heap)))
+    blocos.append(array("q", (e[1] for f in filas.values() for e in f.heap)))
+    blocos.append(array("I", (indice_usuario[id(e[2])] for f in filas.values() for e in f.heap)))
+
+    # Históricos do recomendador (do mais antigo para o mais recente)
+    historicos = recomendador.historicos
+    blocos.append(_strings(historicos))
+    blocos.append(array("Q", map(len, historicos.values())))
+    blocos.append(_strings(c for h in historicos.values() for c in h))
+
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as arquivo:
+        arquivo.write(MAGICO)
+        arquivo.write(b"L" if sys.byteorder == "little" else b"B")
+        for bloco in blocos:
+            _escrever_bloco(arquivo, bloco)
+    os.replace(temporario, caminho)
+
+
+def carregar(caminho, livros, usuarios, bst, grafo, filas, recomendador):
+    # Preenche as estruturas recebidas (substituindo o conteúdo) a partir do
+    # snapshot e retorna o lsn gravado com ele. Custo linear: a BST é montada balanceada a partir da ordem gravada
+    # e os dicionários são criados de uma vez com dict(zip(...)). O coletor de lixo
+    # fica desligado durante a carga: os milhões de objetos novos não têm ciclos a
+    # coletar e as varreduras repetidas dominariam o tempo.
+    gc.disable()
+    try:
+        return _carregar(caminho, livros, usuarios, bst, grafo, filas, recomendador)
+    finally:
+        gc.enable()
+
+
+def _carregar(caminho, livros, usuarios, bst, grafo, filas, recomendador):
+    with open(caminho, "rb") as arquivo:
+        if arquivo.read(len(MAGICO)) != MAGICO:
+            raise ValueError(f"{caminho} não é um snapshot da biblioteca")
+        trocar_bytes = arquivo.read(1) != (b"L" if sys.byteorder == "little" else b"B")
+        ler = lambda: _ler_bloco(arquivo, trocar_bytes)
+        lsn = ler()[0]
+
+        campos = ler()
+        lista = list(map(Livro, campos[0::3], campos[1::3], campos[2::3]))
+        ordem = ler()
+        for i in ler():
+            lista[i].autor = None
+        livros[:] = lista
+        bst.construir_balanceada(map(lista.__getitem__, ordem))
+
+        campos = ler()
+        flags = ler()
+        cadastrados = ler()[0]
+        tabela = list(map(Usuario, campos[0::2], campos[1::2],
+                          [f & 1 == 1 for f in flags], [f & 2 == 2 for f in flags]))
+        usuarios.clear()
+        usuarios.update(zip(campos[1:2 * cadastrados:2], tabela[:cadastrados]))
+
+        codigos = ler()
+        indptr, indices, pesos = ler().tolist(), ler(), ler().tolist()
+        vizinhos = list(map(codigos.__getitem__, indices))
+        grafo.livros = {
+            codigo: dict(zip(vizinhos[indptr[i]:indptr[i + 1]], pesos[indptr[i]:indptr[i + 1]]))
+            for i, codigo in enumerate(codigos)
+        }
+        grafo._cache.clear()
+        grafo.snapshot = None
+
+        codigos, tamanhos, contadores = ler(), ler(), ler()
+        prioridades, ordens = ler(), ler()
+        membros = list(map(tabela.__getitem__, ler()))
+        entradas = list(map(list, zip(prioridades, ordens, membros)))
+        filas.clear()
+        inicio = 0
+        for codigo, tamanho, contador in zip(codigos, tamanhos, contadores):
+            fila = filas[codigo] = FilaPrioridade()
+            if tamanho:
+                fila.heap = entradas[inicio:inicio + tamanho]
+                fila.posicoes = {e[2]: i for i, e in enumerate(fila.heap)}
+                inicio += tamanho
+            fila.contador = contador
+
+        ids, tamanhos, codigos = ler(), ler(), ler()
+        recomendador.historicos.clear()
+        inicio = 0
+        for id_usuario, tamanho in zip(ids, tamanhos):
+            recomendador.historicos[id_usuario] = deque(codigos[inicio:inicio + tamanho],
+                                                        maxlen=recomendador.janela)
+            inicio += tamanho
+    return lsn
+
+
+def _strings(textos):
+    textos = list(textos)
+    if any(_SEPARADOR in t for t in textos):
+        raise ValueError("Textos com o caractere nulo não podem ser gravados")
+    return textos
+
+
+def _escrever_bloco(arquivo, bloco):
+    if isinstance(bloco, list):
+        dados = _SEPARADOR.join(bloco).encode("utf-8")
+        arquivo.write(_CABECALHO.pack(b"s", len(bloco), len(dados)))
+    else:
+        dados = bloco.tobytes()
+        arquivo.write(_CABECALHO.pack(bloco.typecode.encode(), len(bloco), len(dados)))
+    arquivo.write(dados)
+
+
+def _ler_bloco(arquivo, trocar_bytes):
+    tipo, quantidade, tamanho = _CABECALHO.unpack(arquivo.read(_CABECALHO.size))
+    dados = arquivo.read(tamanho)
+    if len(dados) != tamanho:
+        raise ValueError("Snapshot truncado")
+    if tipo == b"s":
+        return dados.decode("utf-8").split(_SEPARADOR) if quantidade else []
+    bloco = array(tipo.decode())
+    bloco.frombytes(dados)
+    if trocar_bytes:
+        bloco.byteswap()
+    return bloco
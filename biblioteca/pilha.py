@@ -1,18 +1,76 @@
+import json
+import os
+from collections import deque
+
+
 class Pilha:
-    def __init__(self):
-        self.itens = []
-        
+    # Com max_itens a pilha vira um buffer circular: ao encher, o item mais antigo
+    # sai da memória. Se houver arquivo_log, esse item é gravado em disco (uma linha
+    # JSON por registro) e volta a ser lido quando a parte em memória se esgota.
+    # Os itens gravados em disco devem ser registros simples (tuplas de str/int/None).
+    def __init__(self, max_itens=None, arquivo_log=None):
+        self.itens = deque(maxlen=max_itens)
+        self.arquivo_log = arquivo_log
+        self.qtd_log = 0
+        self._log = None
+
     def empilhar(self, item):
+        if self.itens.maxlen is not None and len(self.itens) == self.itens.maxlen:
+            if self.arquivo_log:
+                self._gravar_log(self.itens[0])
         self.itens.append(item)
-        
+
     def desempilhar(self):
-        return self.itens.pop() if self.itens else None
-        
+        if self.itens:
+            return self.itens.pop()
+        if self.qtd_log:
+            return self._ler_log(remover=True)
+        return None
+
     def vazio(self):
-        return len(self.itens) == 0
-        
+        return len(self) == 0
+
     def topo(self):
-        return self.itens[-1] if self.itens else None
-        
+        if self.itens:
+            return self.itens[-1]
+        if self.qtd_log:
+            return self._ler_log(remover=False)
+        return None
+
+    def fechar(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+            os.remove(self.arquivo_log)
+        self.qtd_log = 0
+
     def __len__(self):
-        return len(self.itens)
\ No newline at end of file
+        return len(self.itens) + self.qtd_log
+
+    def _gravar_log(self, item):
+        # O log pertence à sessão: é recriado na primeira gravação
+        if self._log is None:
+            self._log = open(self.arquivo_log, "w+b")
+        self._log.seek(0, os.SEEK_END)
+        self._log.write(json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n")
+        self.qtd_log += 1
+
+    def _ler_log(self, remover):
+        fim = self._log.seek(0, os.SEEK_END)
+        # Procura, de trás para frente, o "\n" que antecede o último registro
+        inicio = 0
+        pos = fim - 1
+        while pos > 0:
+            leitura = max(0, pos - 4096)
+            self._log.seek(leitura)
+            k = self._log.read(pos - leitura).rfind(b"\n")
+            if k != -1:
+                inicio = leitura + k + 1
+                break
+            pos = leitura
+        self._log.seek(inicio)
+        registro = tuple(json.loads(self._log.read(fim - inicio)))
+        if remover:
+            self._log.truncate(inicio)
+            self.qtd_log -= 1
+        return registro
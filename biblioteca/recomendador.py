@@ -0,0 +1,136 @@
+import heapq
+from collections import deque
+
+
+class Recomendador:
+    # Motor de recomendações sobre o Grafo de empréstimos conjuntos.
+    #
+    # As arestas vêm do histórico real de cada usuário: ao emprestar um livro,
+    # ele é ligado aos últimos `janela` livros que o mesmo usuário emprestou.
+    #
+    # O ranking usa PageRank personalizado (passeio aleatório com reinício) calculado
+    # pelo método de "push" local: só os nós próximos da origem com resíduo relevante
+    # são visitados, então o custo não depende do tamanho total do grafo. Isso
+    # pontua vizinhos a dois ou mais saltos, e não só os vizinhos diretos.
+    def __init__(self, grafo, janela=50, alfa=0.15, epsilon=1e-4, max_empurroes=20000):
+        self.grafo = grafo
+        self.janela = janela
+        self.alfa = alfa                    # probabilidade de reinício
+        self.epsilon = epsilon              # precisão: resíduo mínimo por unidade de grau
+        self.max_empurroes = max_empurroes  # truncamento para limitar o tempo da consulta
+        self.historicos = {}                # id_usuario: últimos livros emprestados
+
+    def registrar_emprestimo(self, id_usuario, codigo):
+        # Retorna (posicao, removido), o que desfazer_emprestimo precisa para
+        # reverter a alteração do histórico: a posição anterior de codigo, se ele
+        # já estava no histórico, ou o livro mais antigo que saiu da janela cheia
+        historico = self.historicos.get(id_usuario)
+        if historico is None:
+            historico = self.historicos[id_usuario] = deque(maxlen=self.janela)
+        self.grafo.adicionar_livro(codigo)
+        for anterior in historico:
+            if anterior != codigo:
+                self.grafo.adicionar_relacao(codigo, anterior)
+        posicao = removido = None
+        if codigo in historico:
+            posicao = historico.index(codigo)
+            del historico[posicao]
+        elif historico and len(historico) == historico.maxlen:
+            removido = historico[0]
+        historico.append(codigo)
+        return posicao, removido
+
+    def desfazer_emprestimo(self, id_usuario, codigo, posicao, removido):
+        # Reverte o último registrar_emprestimo(id_usuario, codigo) a partir do
+        # retorno dele: as arestas criadas ligam codigo ao resto do histórico
+        # atual mais o livro que saiu da janela
+        historico = self.historicos.get(id_usuario)
+        if not historico or historico[-1] != codigo:
+            return
+        historico.pop()
+        for anterior in historico:
+            self.grafo.remover_relacao(codigo, anterior)
+        if removido is not None:
+            self.grafo.remover_relacao(codigo, removido)
+            historico.appendleft(removido)
+        elif posicao is not None:
+            historico.insert(posicao, codigo)
+        if not historico:
+            del self.historicos[id_usuario]
+
+    def registrar_emprestimos(self, emprestimos):
+        # Versão em lote de registrar_emprestimo para repetir um log de
+        # (id_usuario, codigo): as arestas são acumuladas e aplicadas de uma vez
+        relacoes = []
+        for id_usuario, codigo in emprestimos:
+            historico = self.historicos.get(id_usuario)
+            if historico is None:
+                historico = self.historicos[id_usuario] = deque(maxlen=self.janela)
+            relacoes.append((codigo, codigo))  # garante o nó mesmo sem arestas
+            relacoes.extend((codigo, anterior) for anterior in historico if anterior != codigo)
+            if codigo in historico:
+                historico.remove(codigo)
+            historico.append(codigo)
+        self.grafo.adicionar_relacoes(relacoes)
+
+    def pontuar(self, origens):
+        # Aproximação do PageRank personalizado a partir de {codigo: massa inicial}
+        livros = self.grafo.livros
+        alfa, epsilon = self.alfa, self.epsilon
+        graus = {}
+
+        def grau(codigo):
+            g = graus.get(codigo)
+            if g is None:
+                g = graus[codigo] = sum(livros.get(codigo, {}).values())
+            return g
+
+        pontos = {}
+        residuos = dict(origens)
+        fila = deque(residuos)
+        na_fila = set(residuos)
+        empurroes = 0
+        while fila and empurroes < self.max_empurroes:
+            u = fila.popleft()
+            na_fila.discard(u)
+            ru = residuos[u]
+            grau_u = grau(u)
+            if grau_u == 0:
+                # Livro sem relações: toda a massa fica nele
+                pontos[u] = pontos.get(u, 0.0) + ru
+                residuos[u] = 0.0
+                continue
+            if ru < epsilon * grau_u:
+                continue
+            empurroes += 1
+            pontos[u] = pontos.get(u, 0.0) + alfa * ru
+            residuos[u] = 0.0
+            fator = (1 - alfa) * ru / grau_u
+            for v, peso in livros[u].items():
+                rv = residuos.get(v, 0.0) + fator * peso
+                residuos[v] = rv
+                if v not in na_fila and rv >= epsilon * grau(v):
+                    fila.append(v)
+                    na_fila.add(v)
+        return pontos
+
+    def recomendar(self, codigo, k=10):
+        # Livros mais próximos de `codigo` no grafo (diretos ou indiretos)
+        if codigo not in self.grafo.livros:
+            return []
+        return self._melhores(self.pontuar({codigo: 1.0}), {codigo}, k)
+
+    def recomendar_para_usuario(self, id_usuario, k=10):
+        # Filtragem colaborativa: reinicia o passeio em qualquer livro do histórico
+        # do usuário e não recomenda o que ele já emprestou
+        historico = self.historicos.get(id_usuario)
+        if not historico:
+            return []
+        massa = 1.0 / len(historico)
+        origens = {codigo: massa for codigo in historico}
+        return self._melhores(self.pontuar(origens), set(historico), k)
+
+    @staticmethod
+    def _melhores(pontos, excluidos, k):
+        candidatos = ((c, p) for c, p in pontos.items() if c not in excluidos and p > 0)
+        return [c for c, _ in heapq.nsmallest(k, candidatos, key=lambda cp: (-cp[1], cp[0]))]
@@ -0,0 +1,285 @@
+import gc
+import os
+from dataclasses import dataclass, field
+
+from livro import Livro
+from usuario import Usuario
+from fila_prioridade import FilaPrioridade, prioridade_emprestimo
+from pilha import Pilha
+from bst import BST
+from grafo import Grafo
+from recomendador import Recomendador
+from indice_textual import IndiceTextual
+from arvore_radix import ArvoreRadix
+from persistencia import salvar, carregar
+from wal import LogEscrita, ler
+
+
+@dataclass(frozen=True)
+class Resultado:
+    ok: bool
+    mensagem: str  # texto pronto para exibir ao usuário
+
+
+@dataclass(frozen=True)
+class ResultadoDevolucao(Resultado):
+    usuario: Usuario = None  # quem saiu da fila
+
+
+@dataclass(frozen=True)
+class ResultadoDesfazer(Resultado):
+    acao: str = None  # tipo da operação desfeita ("livro", "usuario", ...)
+
+
+@dataclass(frozen=True)
+class ResultadoBusca:
+    livros: list = field(default_factory=list)
+    exato: bool = False  # True se algum título é igual ao procurado
+
+    @property
+    def ok(self):
+        return bool(self.livros)
+
+
+MENSAGENS_DESFAZER = {
+    "livro": "Desfeito cadastro de livro.",
+    "usuario": "Desfeito cadastro de usuário.",
+    "emprestimo": "Desfeito empréstimo.",
+    "devolucao": "Desfeita devolução.",
+}
+
+
+class Biblioteca:
+    # Fachada com as operações do sistema, sem nenhuma entrada/saída: o menu
+    # (main.py), a demonstração (exemplo.py), os benchmarks e o servidor chamam
+    # os mesmos métodos.
+    #
+    # Toda alteração é um registro ("livro", ...), ("usuario", ...), ("emprestimo",
+    # ...), ("devolucao", ...) ou ("desfazer", ...): é validado aqui, gravado no log
+    # de escrita antecipada (se houver) e aplicado por _aplicar(), o mesmo código
+    # usado para repetir o log na inicialização.
+    #
+    # Consultas usam a estrutura mais rápida para cada caso: dicionários para
+    # código e ID, a árvore radix para título exato e prefixo, o índice invertido
+    # para palavras e erros de digitação. A BST mantém a listagem em ordem.
+    def __init__(self, arquivo_snapshot=None, arquivo_wal=None, arquivo_historico=None,
+                 limite_historico=1000, checkpoint_a_cada=10000, confirmar_cada_operacao=True):
+        self.livros = []
+        self.livros_por_codigo = {}
+        self.usuarios = {}
+        self.historico = Pilha(limite_historico, arquivo_historico)
+        self.bst = BST()
+        self.grafo = Grafo()
+        self.recomendador = Recomendador(self.grafo)
+        self.indice_textual = IndiceTextual()
+        self.titulos = ArvoreRadix()
+        self.filas = {}
+        self.arquivo_snapshot = arquivo_snapshot
+        self.checkpoint_a_cada = checkpoint_a_cada
+        # Com False, não há um fsync por operação: a operação retorna antes de
+        # estar em disco e a thread de fundo do log a grava em até max_atraso
+        # segundos; uma queda nesse intervalo perde as operações do grupo
+        self.confirmar_cada_operacao = confirmar_cada_operacao
+        self.wal = None
+        self.lsn_snapshot = 0
+        self.recuperados = self._abrir(arquivo_wal)
+
+    def cadastrar_livro(self, titulo, autor, codigo):
+        if codigo in self.livros_por_codigo:
+            return Resultado(False, "Já existe um livro com esse código.")
+        self._executar(("livro", titulo, autor, codigo))
+        return Resultado(True, "Livro cadastrado com sucesso!")
+
+    def cadastrar_usuario(self, nome, id, docente=False):
+        if id in self.usuarios:
+            return Resultado(False, "Já existe um usuário com esse ID.")
+        self._executar(("usuario", nome, id, docente))
+        return Resultado(True, "Usuário cadastrado!")
+
+    def livro(self, codigo):
+        return self.livros_por_codigo.get(codigo)
+
+    def usuario(self, id):
+        return self.usuarios.get(id)
+
+    def buscar(self, titulo, limite=10):
+        # Título exato; senão, títulos que começam com o texto; senão, busca por
+        # palavras com tolerância a erros de digitação
+        codigos = self.titulos.buscar(titulo)
+        exato = bool(codigos)
+        if not codigos:
+            codigos = [codigo for _, codigo in self.titulos.completar(titulo, limite)]
+        if not codigos:
+            codigos = self.indice_textual.buscar(titulo, limite)
+        livros = [self.livros_por_codigo[c] for c in codigos[:limite] if c in self.livros_por_codigo]
+        return ResultadoBusca(livros, exato)
+
+    def recomendar(self, codigo, k=5):
+        return [self.livros_por_codigo[c] for c in self.recomendador.recomendar(codigo, k)
+                if c in self.livros_por_codigo]
+
+    def fila(self, codigo):
+        # Usuários na fila do livro, na ordem em que serão atendidos
+        fila = self.filas.get(codigo)
+        return fila.itens if fila is not None else []
+
+    def listar_livros(self):
+        # A BST não tem remoção: livros desfeitos são filtrados na listagem
+        por_codigo = self.livros_por_codigo
+        return [livro for livro in self.bst.em_ordem() if por_codigo.get(livro.codigo) is livro]
+
+    def emprestar(self, id_usuario, codigo):
+        usuario = self.usuarios.get(id_usuario)
+        fila = self.filas.get(codigo)
+        if not usuario or fila is None:
+            return Resultado(False, "Usuário ou livro não encontrado.")
+        if usuario in fila:
+            return Resultado(False, "Usuário já está na fila deste livro.")
+        self._executar(("emprestimo", id_usuario, codigo))
+        return Resultado(True, "Usuário entrou na fila de empréstimo.")
+
+    def devolver(self, codigo):
+        fila = self.filas.get(codigo)
+        if not fila:
+            return ResultadoDevolucao(False, "Nenhum usuário na fila deste livro.")
+        usuario = self._executar(("devolucao", codigo))
+        return ResultadoDevolucao(True, f"{usuario.nome} devolveu o livro.", usuario)
+
+    def desfazer(self):
+        if self.historico.vazio():
+            return ResultadoDesfazer(False, "Nada para desfazer.")
+        acao = tuple(self.historico.topo())
+        if not self._executar(("desfazer",) + acao):
+            return ResultadoDesfazer(False, "Não foi possível desfazer a última ação.", acao[0])
+        return ResultadoDesfazer(True, MENSAGENS_DESFAZER[acao[0]], acao[0])
+
+    def checkpoint(self):
+        # Grava o estado no snapshot e esvazia o log
+        if self.arquivo_snapshot is None:
+            return
+        lsn = 0
+        if self.wal is not None:
+            self.wal.confirmar()
+            lsn = self.wal.ultimo_lsn
+        salvar(self.arquivo_snapshot, self.livros, self.usuarios, self.bst,
+               self.grafo, self.filas, self.recomendador, lsn)
+        self.lsn_snapshot = lsn
+        if self.wal is not None:
+            self.wal.reiniciar()
+
+    def fechar(self):
+        self.checkpoint()
+        if self.wal is not None:
+            self.wal.fechar()
+        self.historico.fechar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def _abrir(self, arquivo_wal):
+        if self.arquivo_snapshot and os.path.exists(self.arquivo_snapshot):
+            self.lsn_snapshot = carregar(self.arquivo_snapshot, self.livros, self.usuarios, self.bst,
+                                         self.grafo, self.filas, self.recomendador)
+            # Índices derivados dos livros são reconstruídos em lote na carga, com
+            # o coletor de lixo desligado pelo mesmo motivo que em carregar()
+            gc.disable()
+            try:
+                self.livros_por_codigo = {livro.codigo: livro for livro in self.livros}
+                self.indice_textual = IndiceTextual.construir(
+                    (livro.codigo, livro.titulo, livro.autor) for livro in self.livros)
+                self.titulos = ArvoreRadix.construir(self.bst.em_ordem())
+            finally:
+                gc.enable()
+        recuperados = 0
+        if arquivo_wal:
+            # Abrir o log descarta um eventual registro incompleto deixado por uma queda
+            self.wal = LogEscrita(arquivo_wal, lsn_inicial=self.lsn_snapshot)
+            for _, registro in ler(arquivo_wal, apos_lsn=self.lsn_snapshot):
+                self._aplicar(registro)
+                recuperados += 1
+        return recuperados
+
+    def _executar(self, registro):
+        # Grava a operação no log e a aplica
+        if self.wal is not None:
+            lsn = self.wal.registrar(registro)
+            if self.confirmar_cada_operacao:
+                self.wal.confirmar(lsn)
+        resultado = self._aplicar(registro)
+        if self.wal is not None and self.wal.ultimo_lsn - self.lsn_snapshot >= self.checkpoint_a_cada:
+            self.checkpoint()
+        return resultado
+
+    def _aplicar(self, registro):
+        # Executa uma operação já validada. Repetir os registros na mesma ordem
+        # reproduz o mesmo estado.
+        tipo = registro[0]
+        if tipo == "livro":
+            _, titulo, autor, codigo = registro
+            livro = Livro(titulo, autor, codigo)
+            self.livros.append(livro)
+            self.livros_por_codigo[codigo] = livro
+            self.bst.inserir(livro)
+            self.filas[codigo] = FilaPrioridade()
+            self.grafo.adicionar_livro(codigo)
+            self.indice_textual.adicionar(codigo, titulo, autor)
+            self.titulos.inserir(titulo, codigo)
+            self.historico.empilhar(("livro", codigo))
+        elif tipo == "usuario":
+            _, nome, id, docente = registro
+            self.usuarios[id] = Usuario(nome, id, docente)
+            self.historico.empilhar(("usuario", id))
+        elif tipo == "emprestimo":
+            _, id, codigo = registro
+            usuario = self.usuarios[id]
+            self.filas[codigo].enfileirar(usuario, prioridade_emprestimo(usuario))
+            # A ação guarda a alteração do histórico de recomendações, para que
+            # desfazer também remova as arestas criadas por este empréstimo
+            posicao, removido = self.recomendador.registrar_emprestimo(id, codigo)
+            self.historico.empilhar(("emprestimo", id, codigo, posicao, removido))
+        elif tipo == "devolucao":
+            codigo = registro[1]
+            usuario, prioridade, ordem = self.filas[codigo].extrair()
+            self.historico.empilhar(("devolucao", usuario.id, codigo, prioridade, ordem))
+            return usuario
+        elif tipo == "desfazer":
+            # O registro leva a ação desfeita inteira: ao repetir o log, ela é
+            # revertida mesmo que tenha sido empilhada antes do último snapshot
+            acao = tuple(registro[1:])
+            if not self.historico.vazio() and tuple(self.historico.topo()) == acao:
+                self.historico.desempilhar()
+            return self._reverter(acao)
+        return True
+
+    def _reverter(self, acao):
+        if acao[0] == "livro":
+            livro = self.livros_por_codigo.pop(acao[1], None)
+            if livro:
+                # O livro desfeito costuma ser o último cadastrado
+                if self.livros and self.livros[-1] is livro:
+                    self.livros.pop()
+                else:
+                    self.livros.remove(livro)
+                self.titulos.remover(livro.titulo, livro.codigo)
+            self.indice_textual.remover(acao[1])
+            self.filas.pop(acao[1], None)
+            return True
+        if acao[0] == "usuario":
+            self.usuarios.pop(acao[1], None)
+            return True
+        if acao[0] == "emprestimo":
+            usuario, codigo = self.usuarios.get(acao[1]), acao[2]
+            if usuario and codigo in self.filas and self.filas[codigo].cancelar(usuario):
+                self.recomendador.desfazer_emprestimo(acao[1], codigo, acao[3], acao[4])
+                return True
+        elif acao[0] == "devolucao":
+            usuario, codigo = self.usuarios.get(acao[1]), acao[2]
+            fila = self.filas.get(codigo)
+            if usuario and fila is not None and usuario not in fila:
+                prioridade, ordem = acao[3], acao[4]
+                fila.reinserir(usuario, prioridade, ordem)
+                return True
+        return False
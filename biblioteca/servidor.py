@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP/JSON da Biblioteca Digital (asyncio, só biblioteca padrão)
+Uso: python servidor.py [porta]
+
+Rotas:
+    GET  /livros/<codigo>          GET  /usuarios/<id>
+    GET  /buscar?titulo=...&limite=10
+    GET  /recomendar/<codigo>?k=5  GET  /metricas
+    POST /emprestimos {"usuario": ..., "livro": ...}
+    POST /devolucoes {"livro": ...}
+    POST /desfazer
+"""
+
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import deque
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from servico import Biblioteca
+
+MOTIVOS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+# Maior corpo de requisição aceito, em bytes (as rotas só recebem objetos pequenos)
+MAX_CORPO = 64 * 1024
+
+
+def percentis(amostras, pontos=(50, 90, 99)):
+    ordenadas = sorted(amostras)
+    if not ordenadas:
+        return {}
+    return {f"p{p}": ordenadas[min(len(ordenadas) - 1, len(ordenadas) * p // 100)] for p in pontos}
+
+
+def livro_json(livro):
+    return {"titulo": livro.titulo, "autor": livro.autor, "codigo": livro.codigo}
+
+
+def usuario_json(usuario):
+    return {"nome": usuario.nome, "id": usuario.id, "docente": usuario.docente, "em_atraso": usuario.em_atraso}
+
+
+class ServidorBiblioteca:
+    # Um único processo e uma única thread atendem todas as conexões (asyncio).
+    #
+    # As consultas não são executadas na hora: cada uma entra no lote do ciclo atual
+    # do event loop, processado de uma vez por um único callback agendado com
+    # call_soon, depois que todas as conexões prontas neste ciclo foram lidas.
+    # Consultas idênticas no mesmo lote (mesma rota e parâmetros) são coalescidas:
+    # executam uma vez e todas as requisições recebem o mesmo resultado.
+    # As alterações (empréstimo, devolução, desfazer) são aplicadas na memória
+    # diretamente, na ordem de chegada, mas só são respondidas depois de gravadas
+    # no log: as de um mesmo ciclo esperam um único confirmar(), executado em uma
+    # thread (run_in_executor) para que o fsync não pare o event loop. Pelo mesmo
+    # motivo, o checkpoint automático (snapshot completo) roda em uma thread: as
+    # alterações ficam suspensas até ele terminar, e as consultas continuam.
+    def __init__(self, biblioteca, host="127.0.0.1", porta=8080, janela_latencias=10000):
+        self.biblioteca = biblioteca
+        if biblioteca.wal is not None:
+            # O commit em grupo passa a ser do servidor, um por ciclo: nem fsync por
+            # operação nem o grupo disparado pelo próprio log dentro de registrar()
+            biblioteca.confirmar_cada_operacao = False
+            biblioteca.wal.max_grupo = biblioteca.wal.max_atraso = float("inf")
+        # O checkpoint a cada checkpoint_a_cada operações passa a ser disparado
+        # pelo servidor, fora do event loop; parar() devolve o limite à biblioteca
+        self.checkpoint_a_cada = biblioteca.checkpoint_a_cada
+        biblioteca.checkpoint_a_cada = float("inf")
+        self.host = host
+        self.porta = porta
+        self.servidor = None
+        self.conexoes = {}  # writer: tarefa que atende a conexão
+        self.lote = {}  # chave da consulta: (future, função que a resolve)
+        self.lote_agendado = False
+        self.gravacao = None  # future do confirmar() do ciclo atual
+        self.checkpoint = None  # future do checkpoint em andamento
+        self.janela_latencias = janela_latencias
+        self.latencias = {}  # rota: últimas latências (s)
+        self.estatisticas = {"requisicoes": 0, "coalescidas": 0, "lotes": 0, "consultas_em_lote": 0,
+                             "gravacoes": 0, "checkpoints": 0}
+
+    async def iniciar(self):
+        self.servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        self.porta = self.servidor.sockets[0].getsockname()[1]  # porta real, se 0
+        return self
+
+    async def parar(self):
+        # Fecha as conexões abertas e espera cada uma terminar a resposta em curso
+        self.servidor.close()
+        tarefas = list(self.conexoes.values())
+        for writer in list(self.conexoes):
+            writer.close()
+        await asyncio.gather(*tarefas, return_exceptions=True)
+        await self.servidor.wait_closed()
+        if self.checkpoint is not None:
+            await asyncio.gather(self.checkpoint, return_exceptions=True)
+        self.biblioteca.checkpoint_a_cada = self.checkpoint_a_cada
+
+    def metricas(self):
+        latencias = {}
+        for rota, amostras in self.latencias.items():
+            latencias[rota] = {"n": len(amostras)}
+            latencias[rota].update({p: round(1000 * v, 3) for p, v in percentis(amostras).items()})
+        return dict(self.estatisticas, latencias_ms=latencias)
+
+    def consultar(self, chave, funcao):
+        # Agenda funcao() no lote do ciclo atual; retorna o future com o resultado
+        pendente = self.lote.get(chave)
+        if pendente is not None:
+            self.estatisticas["coalescidas"] += 1
+            return pendente[0]
+        futuro = asyncio.get_running_loop().create_future()
+        self.lote[chave] = (futuro, funcao)
+        if not self.lote_agendado:
+            self.lote_agendado = True
+            asyncio.get_running_loop().call_soon(self._processar_lote)
+        return futuro
+
+    async def alterar(self, operacao):
+        # Executa operacao() (uma alteração da biblioteca) fora de um checkpoint e
+        # retorna o resultado depois que ela estiver gravada no log
+        while self.checkpoint is not None:
+            await asyncio.shield(self.checkpoint)
+        resultado = operacao()
+        self._agendar_checkpoint()
+        await asyncio.shield(self.aguardar_gravacao())
+        return resultado
+
+    def aguardar_gravacao(self):
+        # Future que termina quando as alterações feitas até o fim deste ciclo
+        # estão em disco; todas as alterações do ciclo compartilham o mesmo
+        loop = asyncio.get_running_loop()
+        if self.biblioteca.wal is None:
+            futuro = loop.create_future()
+            futuro.set_result(None)
+            return futuro
+        if self.gravacao is None:
+            self.gravacao = loop.create_future()
+            loop.call_soon(self._gravar_lote)
+        return self.gravacao
+
+    def _gravar_lote(self):
+        futuro, self.gravacao = self.gravacao, None
+        wal = self.biblioteca.wal
+        self.estatisticas["gravacoes"] += 1
+        tarefa = asyncio.get_running_loop().run_in_executor(None, wal.confirmar, wal.ultimo_lsn)
+
+        def concluir(tarefa):
+            if tarefa.cancelled():
+                futuro.cancel()
+            elif tarefa.exception() is not None:
+                futuro.set_exception(tarefa.exception())
+            else:
+                futuro.set_result(None)
+
+        tarefa.add_done_callback(concluir)
+
+    def _agendar_checkpoint(self):
+        biblioteca = self.biblioteca
+        if (self.checkpoint is None and biblioteca.wal is not None
+                and biblioteca.wal.ultimo_lsn - biblioteca.lsn_snapshot >= self.checkpoint_a_cada):
+            self.estatisticas["checkpoints"] += 1
+            self.checkpoint = asyncio.get_running_loop().run_in_executor(None, biblioteca.checkpoint)
+            self.checkpoint.add_done_callback(self._fim_checkpoint)
+
+    def _fim_checkpoint(self, tarefa):
+        # Uma falha chega às alterações que estavam esperando (resposta 500)
+        self.checkpoint = None
+
+    def _processar_lote(self):
+        lote, self.lote = self.lote, {}
+        self.lote_agendado = False
+        self.estatisticas["lotes"] += 1
+        self.estatisticas["consultas_em_lote"] += len(lote)
+        for futuro, funcao in lote.values():
+            if futuro.done():
+                continue
+            try:
+                futuro.set_result(funcao())
+            except Exception as erro:
+                futuro.set_exception(erro)
+
+    async def _atender(self, reader, writer):
+        self.conexoes[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    requisicao = await _ler_requisicao(reader)
+                except OverflowError:
+                    # O corpo não é lido: a conexão não pode continuar
+                    writer.write(_resposta(413, {"erro": f"Corpo maior que {MAX_CORPO} bytes"}, fechar=True))
+                    break
+                except (ValueError, asyncio.IncompleteReadError):
+                    writer.write(_resposta(400, {"erro": "Requisição inválida"}, fechar=True))
+                    break
+                if requisicao is None:
+                    break
+                metodo, alvo, cabecalhos, corpo = requisicao
+                inicio = time.perf_counter()
+                try:
+                    rota, status, dados = await self._rotear(metodo, alvo, corpo)
+                except Exception as erro:
+                    rota, status, dados = "erro", 500, {"erro": str(erro)}
+                fechar = cabecalhos.get("connection", "").lower() == "close"
+                writer.write(_resposta(status, dados, fechar))
+                await writer.drain()
+                self.estatisticas["requisicoes"] += 1
+                amostras = self.latencias.get(rota)
+                if amostras is None:
+                    amostras = self.latencias[rota] = deque(maxlen=self.janela_latencias)
+                amostras.append(time.perf_counter() - inicio)
+                if fechar:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.conexoes.pop(writer, None)
+            writer.close()
+
+    async def _rotear(self, metodo, alvo, corpo):
+        # Retorna (rota para as métricas, status HTTP, objeto JSON)
+        url = urlsplit(alvo)
+        partes = [unquote(p) for p in url.path.strip("/").split("/")]
+        parametros = {k: v[0] for k, v in parse_qs(url.query).items()}
+        biblioteca = self.biblioteca
+
+        if metodo == "GET":
+            if len(partes) == 2 and partes[0] == "livros":
+                livro = await asyncio.shield(self.consultar(("livro", partes[1]), lambda: biblioteca.livro(partes[1])))
+                if livro is None:
+                    return "GET /livros", 404, {"erro": "Livro não encontrado"}
+                return "GET /livros", 200, livro_json(livro)
+            if len(partes) == 2 and partes[0] == "usuarios":
+                usuario = await asyncio.shield(self.consultar(("usuario", partes[1]),
+                                                              lambda: biblioteca.usuario(partes[1])))
+                if usuario is None:
+                    return "GET /usuarios", 404, {"erro": "Usuário não encontrado"}
+                return "GET /usuarios", 200, usuario_json(usuario)
+            if partes == ["buscar"]:
+                titulo = parametros.get("titulo", "")
+                limite = _inteiro(parametros.get("limite"), 10)
+                resultado = await asyncio.shield(self.consultar(("buscar", titulo, limite),
+                                                                lambda: biblioteca.buscar(titulo, limite)))
+                return "GET /buscar", 200, {"exato": resultado.exato,
+                                            "livros": [livro_json(l) for l in resultado.livros]}
+            if len(partes) == 2 and partes[0] == "recomendar":
+                k = _inteiro(parametros.get("k"), 5)
+                livros = await asyncio.shield(self.consultar(("recomendar", partes[1], k),
+                                                             lambda: biblioteca.recomendar(partes[1], k)))
+                return "GET /recomendar", 200, {"livros": [livro_json(l) for l in livros]}
+            if partes == ["metricas"]:
+                return "GET /metricas", 200, self.metricas()
+            return "GET", 404, {"erro": "Rota não encontrada"}
+
+        if metodo == "POST":
+            try:
+                dados = json.loads(corpo) if corpo else {}
+            except ValueError:
+                return "POST", 400, {"erro": "JSON inválido"}
+            if not isinstance(dados, dict):
+                return "POST", 400, {"erro": "O corpo deve ser um objeto JSON"}
+            if partes == ["emprestimos"]:
+                resultado = await self.alterar(lambda: biblioteca.emprestar(dados.get("usuario"),
+                                                                            dados.get("livro")))
+                return "POST /emprestimos", 201 if resultado.ok else 409, {"ok": resultado.ok,
+                                                                           "mensagem": resultado.mensagem}
+            if partes == ["devolucoes"]:
+                resultado = await self.alterar(lambda: biblioteca.devolver(dados.get("livro")))
+                resposta = {"ok": resultado.ok, "mensagem": resultado.mensagem}
+                if resultado.usuario is not None:
+                    resposta["usuario"] = usuario_json(resultado.usuario)
+                return "POST /devolucoes", 200 if resultado.ok else 409, resposta
+            if partes == ["desfazer"]:
+                resultado = await self.alterar(biblioteca.desfazer)
+                return "POST /desfazer", 200 if resultado.ok else 409, {"ok": resultado.ok,
+                                                                        "mensagem": resultado.mensagem}
+            return "POST", 404, {"erro": "Rota não encontrada"}
+
+        return metodo, 405, {"erro": "Método não permitido"}
+
+
+def _inteiro(texto, padrao):
+    try:
+        return max(1, int(texto))
+    except (TypeError, ValueError):
+        return padrao
+
+
+async def _ler_requisicao(reader):
+    # Lê uma requisição HTTP/1.1; None se a conexão foi fechada antes dela
+    linha = await reader.readline()
+    if not linha:
+        return None
+    partes = linha.decode("latin-1").split()
+    if len(partes) != 3:
+        raise ValueError("Linha de requisição inválida")
+    metodo, alvo, _ = partes
+    cabecalhos = await _ler_cabecalhos(reader)
+    tamanho = int(cabecalhos.get("content-length", 0))
+    if tamanho < 0:
+        raise ValueError("Content-Length inválido")
+    if tamanho > MAX_CORPO:
+        raise OverflowError("Corpo grande demais")
+    corpo = await reader.readexactly(tamanho)
+    return metodo, alvo, cabecalhos, corpo
+
+
+async def _ler_cabecalhos(reader):
+    cabecalhos = {}
+    while True:
+        linha = await reader.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            return cabecalhos
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        cabecalhos[nome.strip().lower()] = valor.strip()
+
+
+def _resposta(status, dados, fechar=False):
+    corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+    cabecalho = (f"HTTP/1.1 {status} {MOTIVOS[status]}\r\n"
+                 "Content-Type: application/json; charset=utf-8\r\n"
+                 f"Content-Length: {len(corpo)}\r\n"
+                 f"Connection: {'close' if fechar else 'keep-alive'}\r\n\r\n")
+    return cabecalho.encode("latin-1") + corpo
+
+
+async def _ler_resposta(reader):
+    linha = await reader.readline()
+    if not linha:
+        raise ConnectionError("Conexão fechada pelo servidor")
+    status = int(linha.split()[1])
+    cabecalhos = await _ler_cabecalhos(reader)
+    corpo = await reader.readexactly(int(cabecalhos.get("content-length", 0)))
+    return status, json.loads(corpo) if corpo else None
+
+
+def _montar_requisicao(host, metodo, caminho, dados=None):
+    corpo = json.dumps(dados).encode("utf-8") if dados is not None else b""
+    return (f"{metodo} {caminho} HTTP/1.1\r\nHost: {host}\r\n"
+            f"Content-Length: {len(corpo)}\r\n\r\n").encode("latin-1") + corpo
+
+
+async def requisitar(host, porta, metodo, caminho, dados=None):
+    # Cliente mínimo: uma requisição por conexão; retorna (status, JSON)
+    reader, writer = await asyncio.open_connection(host, porta)
+    try:
+        writer.write(_montar_requisicao(host, metodo, caminho, dados))
+        return await _ler_resposta(reader)
+    finally:
+        writer.close()
+
+
+async def gerar_carga(host, porta, caminhos, conexoes=50, total=10000):
+    # Gerador de carga local: `conexoes` clientes com keep-alive enviam, ao todo,
+    # `total` requisições GET sorteadas de `caminhos`, cada um esperando a
+    # resposta antes de enviar a próxima. Mede vazão e latência vista pelo cliente.
+    restantes = [total]
+    latencias = []
+    erros = [0]
+
+    async def cliente():
+        reader, writer = await asyncio.open_connection(host, porta)
+        try:
+            while restantes[0] > 0:
+                restantes[0] -= 1
+                inicio = time.perf_counter()
+                writer.write(_montar_requisicao(host, "GET", random.choice(caminhos)))
+                status, _ = await _ler_resposta(reader)
+                latencias.append(time.perf_counter() - inicio)
+                if status >= 500:
+                    erros[0] += 1
+        finally:
+            writer.close()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(conexoes)))
+    duracao = time.perf_counter() - inicio
+    resultado = {"requisicoes": len(latencias), "erros": erros[0], "segundos": duracao,
+                 "req_s": len(latencias) / duracao}
+    resultado.update({p: 1000 * v for p, v in percentis(latencias).items()})
+    return resultado
+
+
+async def _servir(porta):
+    biblioteca = Biblioteca("biblioteca.snap", "biblioteca.wal", confirmar_cada_operacao=False)
+    servidor = await ServidorBiblioteca(biblioteca, porta=porta).iniciar()
+    print(f"Servindo {len(biblioteca.livros)} livros em http://{servidor.host}:{servidor.porta}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servidor.parar()
+        biblioteca.fechar()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_servir(int(sys.argv[1]) if len(sys.argv) > 1 else 8080))
+    except KeyboardInterrupt:
+        pass
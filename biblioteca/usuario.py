@@ -1,7 +1,11 @@
 class Usuario:
-    def __init__(self, nome, id):
+    __slots__ = ("nome", "id", "docente", "em_atraso")
+
+    def __init__(self, nome, id, docente=False, em_atraso=False):
         self.nome = nome
         self.id = id
+        self.docente = docente
+        self.em_atraso = em_atraso
 
     def __str__(self):
-        return f"{self.nome} (ID: {self.id})"
\ No newline at end of file
+        return f"{self.nome} (ID: {self.id})"
@@ -0,0 +1,149 @@
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+
+# Cada registro do log é gravado como cabeçalho (lsn, tamanho, crc32) seguido do
+# JSON da operação. O crc identifica um registro cortado por uma queda no meio da
+# gravação: a leitura para no primeiro registro inválido.
+_CABECALHO = struct.Struct("<QII")
+
+
+class LogEscrita:
+    # Log de escrita antecipada (WAL): toda operação é anexada ao arquivo antes de
+    # ser considerada concluída, e na inicialização o log é repetido sobre o último
+    # snapshot. Cada registro recebe um número sequencial (lsn) crescente.
+    #
+    # Commit em grupo: registrar() só coloca o registro no buffer. Ele é gravado,
+    # junto com todos os pendentes, com um único write + fsync quando o grupo chega
+    # a max_grupo registros, quando o mais antigo espera há max_atraso segundos, ou
+    # quando alguém chama confirmar(). Com várias threads, quem chega a confirmar()
+    # enquanto outra grava só espera, e o próximo fsync leva todos de uma vez.
+    # Uma thread de fundo confirma o grupo que passou de max_atraso mesmo sem novos
+    # registros, então nada fica no buffer por mais que isso com o serviço ocioso.
+    def __init__(self, caminho, lsn_inicial=0, max_grupo=1000, max_atraso=0.005):
+        self.caminho = caminho
+        self.max_grupo = max_grupo
+        self.max_atraso = max_atraso
+        ultimo, fim = _varrer(caminho)
+        if os.path.exists(caminho) and os.path.getsize(caminho) > fim:
+            os.truncate(caminho, fim)  # descarta o registro incompleto do final
+        self.arquivo = open(caminho, "ab")
+        self.ultimo_lsn = max(ultimo, lsn_inicial)  # último lsn atribuído
+        self.confirmado = self.ultimo_lsn           # último lsn já gravado com fsync
+        self.pendentes = []
+        self.inicio_grupo = 0.0
+        self.condicao = threading.Condition()
+        self.gravando = False
+        self.fsyncs = 0
+        self.fechado = False
+        self.descarregador = threading.Thread(target=self._descarregar, daemon=True)
+        self.descarregador.start()
+
+    def registrar(self, registro):
+        # Anexa o registro ao grupo atual e retorna o seu lsn (ainda não durável)
+        dados = json.dumps(registro, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        with self.condicao:
+            self.ultimo_lsn += 1
+            lsn = self.ultimo_lsn
+            self.pendentes.append(_CABECALHO.pack(lsn, len(dados), zlib.crc32(dados)) + dados)
+            agora = time.monotonic()
+            if len(self.pendentes) == 1:
+                self.inicio_grupo = agora
+                self.condicao.notify_all()  # começa a contar o atraso do grupo
+            cheio = len(self.pendentes) >= self.max_grupo or agora - self.inicio_grupo >= self.max_atraso
+        if cheio:
+            self.confirmar(lsn)
+        return lsn
+
+    def confirmar(self, lsn=None):
+        # Bloqueia até que o registro lsn (por padrão, o último) esteja em disco
+        with self.condicao:
+            self._confirmar(self.ultimo_lsn if lsn is None else lsn)
+
+    def _confirmar(self, lsn):
+        # Corpo de confirmar(); chamado com a trava adquirida
+        while self.confirmado < lsn:
+            if self.gravando:
+                self.condicao.wait()
+                continue
+            grupo, self.pendentes = self.pendentes, []
+            ultimo = self.ultimo_lsn
+            self.gravando = True
+            # A gravação acontece fora da trava: novos registros continuam
+            # entrando no próximo grupo enquanto este vai para o disco
+            self.condicao.release()
+            try:
+                self.arquivo.write(b"".join(grupo))
+                self.arquivo.flush()
+                os.fsync(self.arquivo.fileno())
+            finally:
+                self.condicao.acquire()
+                self.gravando = False
+                self.condicao.notify_all()
+            self.confirmado = ultimo
+            self.fsyncs += 1
+
+    def _descarregar(self):
+        # Thread de fundo: grava o grupo cujo registro mais antigo já esperou
+        # max_atraso segundos. Com max_atraso infinito só quem chama confirmar() grava.
+        with self.condicao:
+            while not self.fechado:
+                if not self.pendentes or self.gravando:
+                    self.condicao.wait()
+                    continue
+                restante = self.inicio_grupo + self.max_atraso - time.monotonic()
+                if restante > 0:
+                    self.condicao.wait(min(restante, threading.TIMEOUT_MAX))
+                    continue
+                self._confirmar(self.ultimo_lsn)
+
+    def reiniciar(self):
+        # Após um checkpoint (snapshot gravado com lsn = ultimo_lsn) o log pode ser
+        # esvaziado. Deve ser chamado sem escritas concorrentes.
+        self.confirmar()
+        self.arquivo.truncate(0)
+        self.arquivo.flush()
+        os.fsync(self.arquivo.fileno())
+
+    def fechar(self):
+        with self.condicao:
+            self.fechado = True
+            self.condicao.notify_all()
+        self.descarregador.join()
+        self.confirmar()
+        self.arquivo.close()
+
+
+def ler(caminho, apos_lsn=0):
+    # Gera (lsn, registro) dos registros válidos com lsn > apos_lsn, em ordem
+    if not os.path.exists(caminho):
+        return
+    with open(caminho, "rb") as arquivo:
+        for lsn, dados in _registros(arquivo):
+            if lsn > apos_lsn:
+                yield lsn, json.loads(dados)
+
+
+def _varrer(caminho):
+    # Retorna (último lsn válido, posição do fim do último registro válido)
+    ultimo, fim = 0, 0
+    if os.path.exists(caminho):
+        with open(caminho, "rb") as arquivo:
+            for ultimo, _ in _registros(arquivo):
+                fim = arquivo.tell()
+    return ultimo, fim
+
+
+def _registros(arquivo):
+    while True:
+        cabecalho = arquivo.read(_CABECALHO.size)
+        if len(cabecalho) < _CABECALHO.size:
+            return
+        lsn, tamanho, crc = _CABECALHO.unpack(cabecalho)
+        dados = arquivo.read(tamanho)
+        if len(dados) < tamanho or zlib.crc32(dados) != crc:
+            return
+        yield lsn, dados
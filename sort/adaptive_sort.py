@@ -0,0 +1,304 @@
+"""
+Módulo de ordenação adaptativa.
+
+Este módulo contém a função ordenar, que examina a entrada antes de ordenar e
+encaminha para o algoritmo do pacote que melhor aproveita suas características:
+1. Tamanho: listas pequenas vão para o Insertion Sort
+2. Pré-ordenação: listas ordenadas ou inversas são copiadas; listas quase
+   ordenadas vão para o Insertion Sort (poucas inversões) ou têm os elementos
+   fora de ordem separados, ordenados e mesclados de volta; listas formadas
+   por poucas sequências crescentes ou decrescentes ("corridas") são mescladas
+   corrida a corrida com a função mesclar do Merge Sort
+3. Repetições: com poucas chaves distintas, os elementos são agrupados por
+   chave e só as chaves distintas são ordenadas
+4. Tipo da chave: tipos primitivos (números, strings) dispensam estabilidade no
+   caso geral; para os demais, a posição original desempata elementos iguais
+5. Caso geral: Quick Sort com mediana de três e limite de profundidade, que
+   passa para o Merge Sort se as partições degeneram (híbrido do Introsort)
+
+As características são estimadas em tempo linear e, para as inversões e as
+repetições, por amostragem. Cada decisão é registrada na instrumentação
+(ver sort.instrumentation.registrar_decisao), junto com as características
+que a justificaram.
+"""
+
+import random
+from itertools import islice
+from math import log2
+from operator import gt, ne
+
+from sort.divide_and_conquer_sorts import _quick_sort_mediana_de_tres, mesclar
+from sort.insertion_sorts import insertion_sort
+from sort.instrumentation import registrar_decisao
+
+# Até este tamanho, o Insertion Sort vence os algoritmos O(n log n)
+LIMITE_PEQUENA = 32
+
+# Insertion Sort se as inversões estimadas forem até este múltiplo de n
+FATOR_INSERCAO = 2
+
+# Com até n / DIVISOR_DESCIDAS descidas, a lista é considerada quase ordenada
+DIVISOR_DESCIDAS = 16
+
+# Separação dos elementos fora de ordem se até esta fração dos pares está invertida
+FRACAO_INVERSOES = 0.1
+
+# Agrupamento por chave se a fração de chaves distintas na amostra for até esta
+FRACAO_DISTINTAS = 0.5
+
+AMOSTRA_DISTINTAS = 1024
+AMOSTRA_INVERSOES_MIN = 64
+
+TIPOS_PRIMITIVOS = (int, float, str, bytes)
+
+
+def caracterizar(chaves, semente=0):
+    """
+    Estima as características de uma lista de chaves usadas na escolha do
+    algoritmo.
+
+    Args:
+        chaves: Lista de chaves (os próprios elementos, se não houver key)
+        semente: Semente da amostragem de inversões (as estimativas são reprodutíveis)
+
+    Returns:
+        Dicionário com:
+        - n: tamanho
+        - descidas: posições i com chaves[i] > chaves[i + 1]
+        - corridas: estimativa do número de sequências monótonas
+        - inversoes: estimativa do número de pares fora de ordem (None se a
+          lista está longe de ordenada e a estimativa não foi feita)
+        - distintas: fração de chaves distintas em uma amostra (None se as
+          chaves não são hasheáveis). Como amostras repetem menos que a lista
+          inteira, a fração real é no máximo esta.
+        - tipo: nome do tipo das chaves (None se há tipos misturados na amostra)
+        - primitivo: se o tipo é número, string ou bytes
+
+    Complexidade:
+    - Tempo: O(n), com as comparações entre vizinhos feitas em C por map();
+      a amostra de inversões, de n/4 pares, só é sorteada se a lista tem
+      poucas descidas
+    - Espaço: O(n) para o vetor de descidas
+    """
+    n = len(chaves)
+    descendo = list(map(gt, chaves, islice(chaves, 1, None)))
+    descidas = sum(descendo)
+    # Cada corrida de descidas (ou de não descidas) é uma sequência monótona
+    corridas = 1 + (sum(map(ne, descendo, islice(descendo, 1, None))) + 1) // 2 if n > 1 else n
+
+    amostra = chaves[::max(1, n // AMOSTRA_DISTINTAS)]
+    tipos = set(map(type, amostra))
+    tipo = tipos.pop() if len(tipos) == 1 else None
+    try:
+        distintas = len(set(amostra)) / len(amostra) if amostra else 1.0
+    except TypeError:
+        distintas = None
+
+    # Ordenada: sem inversões. Quase ordenada: a amostra de pares precisa
+    # crescer com n para distinguir O(n) de O(n²) inversões
+    inversoes = None
+    if descidas == 0:
+        inversoes = 0
+    elif descidas <= n // DIVISOR_DESCIDAS:
+        rng = random.Random(semente)
+        pares = min(n * (n - 1) // 2, max(AMOSTRA_INVERSOES_MIN, n // 4))
+        invertidos = 0
+        for _ in range(pares):
+            i, j = rng.randrange(n), rng.randrange(n)
+            invertidos += chaves[i] > chaves[j] if i < j else chaves[j] > chaves[i]
+        inversoes = round(invertidos / pares * n * (n - 1) / 2)
+
+    return {"n": n, "descidas": descidas, "corridas": corridas, "inversoes": inversoes,
+            "distintas": distintas, "tipo": tipo.__name__ if tipo else None,
+            "primitivo": tipo in TIPOS_PRIMITIVOS}
+
+
+def escolher(caracteristicas):
+    """
+    Escolhe o método de ordenação a partir das características da entrada.
+
+    Os limites vêm de medições com python -m benchmarks: a mescla de corridas
+    faz uma passada em Python por nível, e só vence o Quick Sort com poucos
+    níveis (até n^(1/3) corridas); o agrupamento vence enquanto até metade das
+    chaves são distintas; a separação, enquanto os elementos fora do lugar são
+    uma fração pequena da lista (até 10% dos pares invertidos corresponde a
+    cerca de 7% dos elementos trocados de lugar).
+
+    Args:
+        caracteristicas: Dicionário retornado por caracterizar()
+
+    Returns:
+        Nome do método: "copia", "inversao", "agrupamento" ou uma das chaves
+        de METODOS
+    """
+    c = caracteristicas
+    n = c["n"]
+    if c["descidas"] == 0:
+        return "copia"
+    if c["descidas"] == n - 1:
+        # Estritamente decrescente: inverter não troca a ordem de elementos iguais
+        return "inversao"
+    if n <= LIMITE_PEQUENA:
+        return "insercao"
+    if c["inversoes"] is not None and c["inversoes"] <= FATOR_INSERCAO * n:
+        return "insercao"
+    if c["corridas"] ** 3 <= n:
+        return "corridas"
+    if c["distintas"] is not None and c["distintas"] <= FRACAO_DISTINTAS:
+        return "agrupamento"
+    if c["inversoes"] is not None and c["inversoes"] <= FRACAO_INVERSOES * n * (n - 1) / 2:
+        return "separacao"
+    return "introsort"
+
+
+def ordenar(lista, key=None):
+    """
+    Ordena a lista escolhendo o algoritmo pelas características da entrada.
+
+    A ordenação é estável: elementos com chaves iguais mantêm a ordem da entrada.
+
+    Complexidade:
+    - Tempo: O(n log n) no pior caso (o Introsort não degenera); O(n) em listas
+      ordenadas ou inversas, O(n + inversões) ou O(n + k log k) em listas com
+      k elementos fora do lugar, O(n log r) em listas com r corridas e
+      O(n + d log d) com d chaves distintas
+    - Espaço: O(n)
+
+    Args:
+        lista: Lista (ou sequência indexável) de elementos a ser ordenada
+        key: Função opcional que extrai a chave de comparação de cada elemento,
+             como em sorted(). A chave é calculada uma única vez por elemento.
+
+    Returns:
+        Nova lista ordenada (a lista original não é modificada)
+
+    Exemplos:
+        >>> ordenar([5, 3, 1, 4, 2])
+        [1, 2, 3, 4, 5]
+        >>> ordenar(["b", "A", "c"], key=str.lower)
+        ['A', 'b', 'c']
+    """
+    itens = list(lista)
+    chaves = itens if key is None else [key(x) for x in itens]
+    caracteristicas = caracterizar(chaves)
+    metodo = escolher(caracteristicas)
+    registrar_decisao(metodo, **caracteristicas)
+
+    if metodo == "copia":
+        return itens
+    if metodo == "inversao":
+        itens.reverse()
+        return itens
+    if metodo == "agrupamento":
+        return _agrupar(itens, chaves)
+
+    # Sem key e com tipo primitivo, elementos iguais são indistinguíveis; nos
+    # demais casos, pares (chave, posição) garantem a estabilidade também no
+    # Introsort e evitam comparar os elementos em si
+    if key is None and caracteristicas["primitivo"]:
+        return METODOS[metodo](itens)
+    decorados = METODOS[metodo](list(zip(chaves, range(len(itens)))))
+    return [itens[i] for _, i in decorados]
+
+
+def _agrupar(itens, chaves):
+    # Uma lista de elementos por chave distinta, na ordem de entrada; só as
+    # chaves distintas são ordenadas
+    grupos = {}
+    for item, chave in zip(itens, chaves):
+        grupo = grupos.get(chave)
+        if grupo is None:
+            grupos[chave] = [item]
+        else:
+            grupo.append(item)
+    resultado = []
+    for chave in _introsort(list(grupos)):
+        resultado.extend(grupos[chave])
+    return resultado
+
+
+def _mesclar_corridas(lista):
+    """
+    Merge Sort natural: separa a lista em corridas (sequências não decrescentes,
+    ou estritamente decrescentes, que são invertidas) e as mescla duas a duas.
+
+    Mesclar sempre corridas vizinhas, com mesclar() dando preferência à da
+    esquerda, mantém a ordenação estável.
+
+    Args:
+        lista: Lista a ser ordenada
+
+    Returns:
+        Nova lista ordenada
+    """
+    corridas = []
+    n = len(lista)
+    inicio = 0
+    while inicio < n:
+        fim = inicio + 1
+        if fim < n and lista[fim] < lista[inicio]:
+            while fim < n and lista[fim] < lista[fim - 1]:
+                fim += 1
+            corrida = lista[inicio:fim]
+            corrida.reverse()
+        else:
+            while fim < n and not lista[fim] < lista[fim - 1]:
+                fim += 1
+            corrida = lista[inicio:fim]
+        corridas.append(corrida)
+        inicio = fim
+
+    while len(corridas) > 1:
+        corridas = [mesclar(corridas[i], corridas[i + 1]) if i + 1 < len(corridas) else corridas[i]
+                    for i in range(0, len(corridas), 2)]
+    return corridas[0] if corridas else []
+
+
+def _separar(lista):
+    """
+    Ordena uma lista quase ordenada separando os elementos fora de ordem.
+
+    Percorre a lista mantendo uma sequência crescente; cada elemento menor que
+    o último da sequência sai junto com ele para uma lista à parte. Cada
+    elemento fora do lugar tira no máximo dois da sequência, então a lista à
+    parte é pequena: ela é ordenada pelo Introsort e mesclada com a sequência.
+    Se passar de n/4 elementos, a lista não estava quase ordenada e é
+    ordenada inteira pelo Introsort.
+
+    Args:
+        lista: Lista a ser ordenada (com elementos distintos, ou sem exigência
+               de estabilidade: um elemento separado pode passar à frente de um
+               igual a ele)
+
+    Returns:
+        Nova lista ordenada
+    """
+    limite = len(lista) // 4
+    sequencia = []
+    separados = []
+    for x in lista:
+        if sequencia and x < sequencia[-1]:
+            separados.append(sequencia.pop())
+            separados.append(x)
+            if len(separados) > limite:
+                return _introsort(lista)
+        else:
+            sequencia.append(x)
+    return mesclar(sequencia, _introsort(separados))
+
+
+def _introsort(lista):
+    # Quick Sort com mediana de três, limitado a 2 log n partições em sequência
+    lista = list(lista)
+    if len(lista) > 1:
+        _quick_sort_mediana_de_tres(lista, 0, len(lista) - 1, 2 * int(log2(len(lista))))
+    return lista
+
+
+# Métodos que ordenam uma lista de chaves (ou de pares chave, posição)
+METODOS = {
+    "insercao": insertion_sort,
+    "corridas": _mesclar_corridas,
+    "separacao": _separar,
+    "introsort": _introsort,
+}
@@ -2,7 +2,7 @@
 Módulo de implementação de algoritmos de ordenação por divisão e conquista.
 
 Este módulo contém implementações dos seguintes algoritmos de ordenação:
-1. Merge Sort
+1. Merge Sort (com cópia, in-place com buffer e in-place sem buffer de O(n))
 2. Quick Sort
 
 Cada algoritmo é implementado com documentação detalhada, incluindo:
@@ -12,7 +12,11 @@ Cada algoritmo é implementado com documentação detalhada, incluindo:
 - Exemplos de uso
 """
 
-def merge_sort(lista):
+from bisect import bisect_left, bisect_right
+from math import isqrt
+
+
+def merge_sort(lista, key=None):
     """
     Implementação do algoritmo de ordenação por mesclagem (Merge Sort).
     
@@ -28,7 +32,9 @@ def merge_sort(lista):
     - Espaço: O(n), requer espaço adicional
     
     Args:
-        lista: Lista de elementos a ser ordenada
+        lista: Lista (ou sequência indexável) de elementos a ser ordenada
+        key: Função opcional que extrai a chave de comparação de cada elemento,
+             como em sorted(). A chave é calculada uma única vez por elemento.
         
     Returns:
         Nova lista ordenada (a lista original não é modificada)
@@ -39,7 +45,15 @@ def merge_sort(lista):
         [1, 2, 3, 4, 5]
         >>> l  # A lista original não é modificada
         [5, 3, 1, 4, 2]
+        >>> merge_sort(["b", "A", "c"], key=str.lower)
+        ['A', 'b', 'c']
     """
+    # Com key, ordena pares (chave, posição): a posição desempata chaves iguais,
+    # o que mantém a estabilidade e evita comparar os elementos em si
+    if key is not None:
+        decorados = merge_sort([(key(x), i) for i, x in enumerate(lista)])
+        return [lista[i] for _, i in decorados]
+    
     # Caso base: lista com 0 ou 1 elemento já está ordenada
     if len(lista) <= 1:
         return lista[:]
@@ -87,18 +101,33 @@ def mesclar(esquerda, direita):
     return resultado
 
 
-def merge_sort_in_place(lista, inicio=0, fim=None):
+def merge_sort_in_place(lista, inicio=0, fim=None, sem_buffer=False):
     """
     Implementação alternativa do Merge Sort que tenta minimizar a criação
     de novas listas, embora ainda use espaço adicional durante a mesclagem.
     
+    Com sem_buffer=True, a mescla não copia as metades (ver mesclar_in_place):
+    o espaço adicional cai de O(n) para O(√n), ao custo de mais movimentos.
+    
+    Complexidade:
+    - Tempo: O(n log n) comparações; sem buffer, O(n log² n) movimentos no
+      pior caso (feitos em fatias, a velocidade de C)
+    - Espaço: O(n) para as cópias da mescla; sem buffer, O(√n) mais a pilha
+      de recursão, O(log n)
+    
     Args:
         lista: Lista a ser ordenada
         inicio: Índice inicial da sublista a ser ordenada (padrão = 0)
         fim: Índice final da sublista a ser ordenada (padrão = len(lista) - 1)
+        sem_buffer: Se True, mescla sem o buffer de O(n)
         
     Returns:
         Lista ordenada (a ordenação também modifica a lista original)
+    
+    Exemplos:
+        >>> l = [5, 3, 1, 4, 2, 3]
+        >>> merge_sort_in_place(l, sem_buffer=True)
+        [1, 2, 3, 3, 4, 5]
     """
     # Inicializa o fim na primeira chamada
     if fim is None:
@@ -112,25 +141,36 @@ def merge_sort_in_place(lista, inicio=0, fim=None):
     meio = (inicio + fim) // 2
     
     # Recursivamente ordena as duas metades
-    merge_sort_in_place(lista, inicio, meio)
-    merge_sort_in_place(lista, meio + 1, fim)
+    merge_sort_in_place(lista, inicio, meio, sem_buffer)
+    merge_sort_in_place(lista, meio + 1, fim, sem_buffer)
     
     # Mescla as duas metades ordenadas
-    mesclar_in_place(lista, inicio, meio, fim)
+    mesclar_in_place(lista, inicio, meio, fim, sem_buffer)
     
     return lista
 
 
-def mesclar_in_place(lista, inicio, meio, fim):
+def mesclar_in_place(lista, inicio, meio, fim, sem_buffer=False):
     """
     Função auxiliar para mesclar duas sublistas ordenadas in-place.
     
+    Por padrão, copia as duas sublistas para listas temporárias (O(n) de
+    espaço). Com sem_buffer=True, usa a mescla por rotações
+    (_mesclar_sem_buffer), com um buffer de no máximo √n elementos, onde n é
+    o tamanho da lista inteira: mesclas em que um dos lados cabe nele (todas
+    as dos níveis baixos do Merge Sort) copiam só esse lado.
+    
     Args:
         lista: Lista contendo as sublistas a serem mescladas
         inicio: Índice inicial da primeira sublista
         meio: Índice final da primeira sublista
         fim: Índice final da segunda sublista
+        sem_buffer: Se True, mescla sem copiar as sublistas
     """
+    if sem_buffer:
+        _mesclar_sem_buffer(lista, inicio, meio + 1, fim + 1, max(isqrt(len(lista)), 1))
+        return
+    
     # Cria listas temporárias
     esquerda = lista[inicio:meio + 1]
     direita = lista[meio + 1:fim + 1]
@@ -161,6 +201,143 @@ def mesclar_in_place(lista, inicio, meio, fim):
         k += 1
 
 
+def _mesclar_sem_buffer(lista, inicio, meio, fim, bloco):
+    """
+    Mescla estável de lista[inicio:meio] e lista[meio:fim] (intervalos
+    semiabertos) com no máximo bloco elementos de espaço adicional.
+    
+    Primeiro, descarta as pontas que já estão no lugar: os elementos da
+    esquerda <= ao primeiro da direita e os da direita >= ao último da
+    esquerda (por busca binária). Se um dos lados restantes cabe no bloco, ele
+    é copiado e mesclado diretamente. Senão, o meio do lado maior é o pivô: uma
+    busca binária acha a posição correspondente no outro lado, e uma rotação
+    junta as duas partes menores que o pivô antes das duas maiores, o que
+    deixa duas mesclas independentes e menores.
+    
+    Estabilidade: com o pivô na esquerda, vão para antes dele os elementos da
+    direita estritamente menores (bisect_left); com o pivô na direita, ficam
+    antes dele os elementos da esquerda menores ou iguais (bisect_right). Assim,
+    um elemento da esquerda nunca passa para depois de um igual da direita.
+    
+    A menor das duas mesclas é feita por recursão e a maior no próprio laço,
+    então a pilha de recursão tem profundidade O(log n).
+    
+    Args:
+        lista: Lista contendo as sublistas a serem mescladas
+        inicio: Índice inicial da primeira sublista
+        meio: Índice inicial da segunda sublista (fim da primeira, exclusivo)
+        fim: Índice final da segunda sublista (exclusivo)
+        bloco: Máximo de elementos copiados de uma vez
+    """
+    while inicio < meio < fim:
+        # Pontas que já estão no lugar
+        inicio = bisect_right(lista, lista[meio], inicio, meio)
+        fim = bisect_left(lista, lista[meio - 1], meio, fim)
+        if inicio == meio or meio == fim:
+            return
+        
+        if meio - inicio <= bloco:
+            _mesclar_buffer_esquerda(lista, inicio, meio, fim)
+            return
+        if fim - meio <= bloco:
+            _mesclar_buffer_direita(lista, inicio, meio, fim)
+            return
+        
+        if meio - inicio >= fim - meio:
+            corte_esquerda = (inicio + meio) // 2
+            corte_direita = bisect_left(lista, lista[corte_esquerda], meio, fim)
+        else:
+            corte_direita = (meio + fim) // 2
+            corte_esquerda = bisect_right(lista, lista[corte_direita], inicio, meio)
+        
+        # [inicio, corte_esquerda) [corte_esquerda, meio) [meio, corte_direita) [corte_direita, fim)
+        # vira [inicio, corte_esquerda) [meio, corte_direita) [corte_esquerda, meio) [corte_direita, fim)
+        _rotacionar(lista, corte_esquerda, meio, corte_direita, bloco)
+        novo_meio = corte_esquerda + (corte_direita - meio)
+        
+        if novo_meio - inicio <= fim - novo_meio:
+            _mesclar_sem_buffer(lista, inicio, corte_esquerda, novo_meio, bloco)
+            inicio, meio = novo_meio, corte_direita
+        else:
+            _mesclar_sem_buffer(lista, novo_meio, corte_direita, fim, bloco)
+            meio, fim = corte_esquerda, novo_meio
+
+
+def _mesclar_buffer_esquerda(lista, inicio, meio, fim):
+    # Copia a esquerda (a menor) e mescla da frente para trás: a posição
+    # escrita nunca passa da próxima a ser lida na direita
+    buffer = lista[inicio:meio]
+    i, j, k = 0, meio, inicio
+    while i < len(buffer) and j < fim:
+        if buffer[i] <= lista[j]:
+            lista[k] = buffer[i]
+            i += 1
+        else:
+            lista[k] = lista[j]
+            j += 1
+        k += 1
+    # O que sobrou da direita já está no lugar
+    lista[k:k + len(buffer) - i] = buffer[i:]
+
+
+def _mesclar_buffer_direita(lista, inicio, meio, fim):
+    # Copia a direita (a menor) e mescla de trás para a frente; em empates, o
+    # da direita vai primeiro para o fim, mantendo a estabilidade
+    buffer = lista[meio:fim]
+    i, j, k = meio - 1, len(buffer) - 1, fim - 1
+    while i >= inicio and j >= 0:
+        if buffer[j] < lista[i]:
+            lista[k] = lista[i]
+            i -= 1
+        else:
+            lista[k] = buffer[j]
+            j -= 1
+        k -= 1
+    # O que sobrou da esquerda já está no lugar
+    lista[inicio:inicio + j + 1] = buffer[:j + 1]
+
+
+def _rotacionar(lista, inicio, meio, fim, bloco):
+    """
+    Troca de lugar os blocos lista[inicio:meio] e lista[meio:fim], copiando no
+    máximo bloco elementos de cada vez.
+    
+    Se um dos blocos cabe no buffer, ele é guardado, o outro é deslocado em
+    fatias de até bloco elementos e o guardado volta na outra ponta. Senão,
+    o bloco menor é trocado com a ponta oposta do maior (Gries-Mills), o que
+    coloca o menor no lugar definitivo e deixa uma rotação menor com o resto.
+    """
+    while inicio < meio < fim:
+        esquerda, direita = meio - inicio, fim - meio
+        if esquerda <= bloco:
+            buffer = lista[inicio:meio]
+            for i in range(meio, fim, bloco):
+                j = min(i + bloco, fim)
+                lista[i - esquerda:j - esquerda] = lista[i:j]
+            lista[fim - esquerda:fim] = buffer
+            return
+        if direita <= bloco:
+            buffer = lista[meio:fim]
+            for j in range(meio, inicio, -bloco):
+                i = max(j - bloco, inicio)
+                lista[i + direita:j + direita] = lista[i:j]
+            lista[inicio:inicio + direita] = buffer
+            return
+        if esquerda <= direita:
+            _trocar_blocos(lista, inicio, fim - esquerda, esquerda, bloco)
+            fim -= esquerda
+        else:
+            _trocar_blocos(lista, inicio, meio, direita, bloco)
+            inicio += direita
+
+
+def _trocar_blocos(lista, a, b, tamanho, bloco):
+    # Troca lista[a:a + tamanho] com lista[b:b + tamanho] (sem sobreposição), em fatias
+    for i in range(0, tamanho, bloco):
+        j = min(i + bloco, tamanho)
+        lista[a + i:a + j], lista[b + i:b + j] = lista[b + i:b + j], lista[a + i:a + j]
+
+
 def quick_sort(lista):
     """
     Implementação do algoritmo de ordenação rápida (Quick Sort).
@@ -175,8 +352,10 @@ def quick_sort(lista):
       ao pivô, e todos os elementos à direita são maiores.
     
     Complexidade:
-    - Tempo: O(n log n) no caso médio e melhor, O(n²) no pior caso
-    - Espaço: O(log n) para a pilha de chamadas recursivas
+    - Tempo: O(n log n) no caso médio e melhor, O(n²) no pior caso (lista
+      ordenada, inversa ou com muitos elementos iguais, já que o pivô é o
+      último elemento)
+    - Espaço: O(log n) para a pilha de chamadas, também no pior caso
     
     Args:
         lista: Lista de elementos a ser ordenada
@@ -202,23 +381,30 @@ def quick_sort(lista):
 
 def _quick_sort(lista, inicio, fim):
     """
-    Função auxiliar para implementar o Quick Sort recursivamente.
+    Função auxiliar para implementar o Quick Sort.
+    
+    Só a sublista menor é ordenada por recursão; a maior é tratada na próxima
+    volta do laço. Como a sublista menor tem no máximo metade dos elementos, a
+    pilha de chamadas fica em O(log n) mesmo no pior caso (ex.: lista já
+    ordenada), que antes chegava a n chamadas e estourava o limite de recursão.
     
     Args:
         lista: Lista a ser ordenada
         inicio: Índice inicial da sublista
         fim: Índice final da sublista
     """
-    # Caso base: sublista com 0 ou 1 elemento já está ordenada
-    if inicio >= fim:
-        return
-    
-    # Particiona a lista e retorna a posição do pivô
-    pos_pivo = particionar(lista, inicio, fim)
-    
-    # Recursivamente ordena as sublistas à esquerda e à direita do pivô
-    _quick_sort(lista, inicio, pos_pivo - 1)
-    _quick_sort(lista, pos_pivo + 1, fim)
+    # Sublistas com 0 ou 1 elemento já estão ordenadas
+    while inicio < fim:
+        # Particiona a lista e retorna a posição do pivô
+        pos_pivo = particionar(lista, inicio, fim)
+        
+        # Ordena a sublista menor por recursão e continua com a maior
+        if pos_pivo - inicio < fim - pos_pivo:
+            _quick_sort(lista, inicio, pos_pivo - 1)
+            inicio = pos_pivo + 1
+        else:
+            _quick_sort(lista, pos_pivo + 1, fim)
+            fim = pos_pivo - 1
 
 
 def particionar(lista, inicio, fim):
@@ -268,8 +454,10 @@ def quick_sort_mediana_de_tres(lista):
     de encontrar o pior caso em listas parcialmente ordenadas.
     
     Complexidade:
-    - Tempo: O(n log n) no caso médio e melhor, O(n²) no pior caso
-    - Espaço: O(log n) para a pilha de chamadas recursivas
+    - Tempo: O(n log n) no caso médio e melhor, O(n²) no pior caso, que ainda
+      existe: há entradas construídas para sempre levar a mediana de três a um
+      pivô ruim (ver benchmarks.geradores.matador_mediana_de_tres)
+    - Espaço: O(log n) para a pilha de chamadas, também no pior caso
     
     Args:
         lista: Lista de elementos a ser ordenada
@@ -286,55 +474,76 @@ def quick_sort_mediana_de_tres(lista):
     return lista_copia
 
 
-def _quick_sort_mediana_de_tres(lista, inicio, fim):
+def _quick_sort_mediana_de_tres(lista, inicio, fim, limite=None):
     """
     Função auxiliar para implementar o Quick Sort com mediana de três.
     
+    Como em _quick_sort, só a sublista menor é ordenada por recursão.
+    
+    Com limite, é um híbrido no estilo do Introsort: cada partição gasta uma
+    unidade do limite e, quando ele se esgota, a sublista restante é ordenada
+    pelo Merge Sort. Com limite proporcional a log n, entradas que levam a
+    mediana de três ao pior caso ficam em O(n log n).
+    
     Args:
         lista: Lista a ser ordenada
         inicio: Índice inicial da sublista
         fim: Índice final da sublista
+        limite: Número máximo de partições em sequência (padrão = sem limite)
     """
-    # Caso base: sublista com 0 ou 1 elemento já está ordenada
-    if inicio >= fim:
-        return
-    
-    # Seleciona o pivô usando a mediana de três
-    meio = (inicio + fim) // 2
-    
-    # Ordena inicio, meio, fim
-    if lista[meio] < lista[inicio]:
-        lista[inicio], lista[meio] = lista[meio], lista[inicio]
-    if lista[fim] < lista[inicio]:
-        lista[inicio], lista[fim] = lista[fim], lista[inicio]
-    if lista[fim] < lista[meio]:
-        lista[meio], lista[fim] = lista[fim], lista[meio]
-    
-    # Coloca o pivô (mediana) na penúltima posição
-    lista[meio], lista[fim - 1] = lista[fim - 1], lista[meio]
-    pivo = lista[fim - 1]
-    
-    # Particiona usando a mediana como pivô
-    i = inicio
-    j = fim - 1
-    
-    while True:
-        i += 1
-        while lista[i] < pivo:
-            i += 1
+    while fim - inicio > 0:
+        if limite is not None:
+            if limite == 0:
+                merge_sort_in_place(lista, inicio, fim)
+                return
+            limite -= 1
+        
+        # Seleciona o pivô usando a mediana de três
+        meio = (inicio + fim) // 2
+        
+        # Ordena inicio, meio, fim
+        if lista[meio] < lista[inicio]:
+            lista[inicio], lista[meio] = lista[meio], lista[inicio]
+        if lista[fim] < lista[inicio]:
+            lista[inicio], lista[fim] = lista[fim], lista[inicio]
+        if lista[fim] < lista[meio]:
+            lista[meio], lista[fim] = lista[fim], lista[meio]
         
-        j -= 1
-        while lista[j] > pivo:
+        # Com 2 ou 3 elementos, ordenar inicio, meio e fim já ordena a sublista.
+        # A partição abaixo precisa de pelo menos 4: lista[inicio] e lista[fim]
+        # servem de sentinelas para os índices j e i.
+        if fim - inicio < 3:
+            return
+        
+        # Coloca o pivô (mediana) na penúltima posição
+        lista[meio], lista[fim - 1] = lista[fim - 1], lista[meio]
+        pivo = lista[fim - 1]
+        
+        # Particiona usando a mediana como pivô
+        i = inicio
+        j = fim - 1
+        
+        while True:
+            i += 1
+            while lista[i] < pivo:
+                i += 1
+            
             j -= 1
+            while lista[j] > pivo:
+                j -= 1
+            
+            if i >= j:
+                break
+            
+            lista[i], lista[j] = lista[j], lista[i]
         
-        if i >= j:
-            break
+        # Coloca o pivô na posição correta
+        lista[i], lista[fim - 1] = lista[fim - 1], lista[i]
         
-        lista[i], lista[j] = lista[j], lista[i]
-    
-    # Coloca o pivô na posição correta
-    lista[i], lista[fim - 1] = lista[fim - 1], lista[i]
-    
-    # Recursivamente ordena as sublistas
-    _quick_sort_mediana_de_tres(lista, inicio, i - 1)
-    _quick_sort_mediana_de_tres(lista, i + 1, fim)
+        # Ordena a sublista menor por recursão e continua com a maior
+        if i - inicio < fim - i:
+            _quick_sort_mediana_de_tres(lista, inicio, i - 1, limite)
+            inicio = i + 1
+        else:
+            _quick_sort_mediana_de_tres(lista, i + 1, fim, limite)
+            fim = i - 1
@@ -0,0 +1,176 @@
+"""
+Módulo de ordenação externa (para dados maiores que a memória).
+
+Todas as outras funções de sort/ recebem uma lista, que precisa caber na
+memória. A ordenação externa processa um fluxo de registros (linhas de texto)
+em duas fases:
+1. Geração de corridas: lê registros até encher o orçamento de memória, ordena
+   esse trecho com sort.adaptive_sort.ordenar e grava o resultado em um arquivo
+   temporário (uma "corrida" ordenada); repete até o fim da entrada
+2. Mescla: lê as corridas ao mesmo tempo, com leitura bufferizada, e as junta
+   com a mescla de k vias de sort.kway_merge, que mantém em um heap só o
+   próximo registro de cada corrida. Com mais corridas que o fan-in, a mescla
+   é feita em passadas: grupos de fan_in corridas viram uma corrida maior
+
+Memória: O(orçamento) na primeira fase e O(fan_in × buffer) na segunda,
+independentemente do tamanho da entrada.
+"""
+
+import os
+import sys
+import tempfile
+from itertools import count
+
+from sort.adaptive_sort import ordenar
+from sort.kway_merge import mesclar_k
+
+MEMORIA_PADRAO = 64 * 1024 * 1024
+FAN_IN_PADRAO = 64
+BUFFER_PADRAO = 64 * 1024
+
+# Bytes por registro além da própria string: o ponteiro na lista e a parte de
+# ordenar() (chave e par chave-posição), estimada para chaves pequenas
+SOBRECARGA_POR_REGISTRO = 120
+
+
+def ordenar_externo(registros, key=None, memoria_max=MEMORIA_PADRAO, fan_in=FAN_IN_PADRAO,
+                    buffer=BUFFER_PADRAO, pasta=None, encoding="utf-8"):
+    """
+    Ordena um fluxo de registros de texto usando arquivos temporários.
+
+    É um gerador: os registros ordenados são produzidos um a um, e os arquivos
+    temporários são apagados quando ele termina ou é fechado. A ordenação é
+    estável. Se a entrada inteira couber no orçamento, nada é gravado em disco.
+
+    Complexidade:
+    - Tempo: O(n log n) comparações; cada registro é gravado e lido
+      1 + ceil(log_fan_in(corridas)) vezes
+    - Espaço: O(memoria_max) em memória, O(n) em disco
+
+    Args:
+        registros: Iterável de strings sem quebra de linha (ex.: as linhas de
+                   um arquivo, sem o "\\n")
+        key: Função opcional que extrai a chave de comparação de cada registro
+        memoria_max: Orçamento aproximado, em bytes, para os registros de uma corrida
+        fan_in: Máximo de corridas mescladas ao mesmo tempo (no mínimo 2)
+        buffer: Tamanho do buffer de leitura e escrita de cada arquivo, em bytes
+        pasta: Pasta dos arquivos temporários (padrão: a do sistema)
+        encoding: Codificação dos arquivos temporários
+
+    Returns:
+        Gerador dos registros em ordem
+
+    Exemplos:
+        >>> list(ordenar_externo(["c", "a", "b"], memoria_max=1))  # uma corrida por registro
+        ['a', 'b', 'c']
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in deve ser pelo menos 2")
+    with tempfile.TemporaryDirectory(prefix="ordenacao_", dir=pasta) as diretorio:
+        nomes = (os.path.join(diretorio, f"corrida_{i}.txt") for i in count())
+        corridas, restante = _gerar_corridas(registros, key, memoria_max, nomes, buffer, encoding)
+        if not corridas:
+            yield from restante
+            return
+
+        # Passadas intermediárias: grupos vizinhos, na ordem, mantêm a estabilidade
+        while len(corridas) > fan_in:
+            mescladas = []
+            for i in range(0, len(corridas), fan_in):
+                grupo = corridas[i:i + fan_in]
+                if len(grupo) == 1:
+                    mescladas.append(grupo[0])
+                    continue
+                caminho = next(nomes)
+                with open(caminho, "w", encoding=encoding, buffering=buffer, newline="\n") as arquivo:
+                    arquivo.writelines(registro + "\n" for registro in _mesclar_arquivos(grupo, key, buffer, encoding))
+                for anterior in grupo:
+                    os.remove(anterior)
+                mescladas.append(caminho)
+            corridas = mescladas
+
+        yield from _mesclar_arquivos(corridas, key, buffer, encoding)
+
+
+def ordenar_arquivo(entrada, saida, key=None, memoria_max=MEMORIA_PADRAO, fan_in=FAN_IN_PADRAO,
+                    buffer=BUFFER_PADRAO, pasta=None, encoding="utf-8"):
+    """
+    Ordena as linhas de um arquivo de texto em outro, sem carregar o arquivo
+    inteiro na memória (ver ordenar_externo).
+
+    Os dois arquivos são abertos com newline="\n": só "\n" separa registros e
+    nenhuma quebra de linha é traduzida, então cada registro sai com os mesmos
+    bytes da entrada (um "\r" dentro dele, ou o de um "\r\n", é mantido).
+
+    Args:
+        entrada: Caminho do arquivo a ordenar (um registro por linha)
+        saida: Caminho do arquivo ordenado (pode ser o mesmo da entrada: ele só
+               é aberto para escrita depois que a entrada foi toda lida)
+        key, memoria_max, fan_in, buffer, pasta, encoding: Como em ordenar_externo
+
+    Returns:
+        Número de registros gravados
+    """
+    with open(entrada, encoding=encoding, buffering=buffer, newline="\n") as arquivo:
+        registros = (linha[:-1] if linha.endswith("\n") else linha for linha in arquivo)
+        ordenados = ordenar_externo(registros, key, memoria_max, fan_in, buffer, pasta, encoding)
+        # A primeira saída do gerador só vem depois de toda a entrada ser lida
+        primeiro = next(ordenados, None)
+    total = 0
+    with open(saida, "w", encoding=encoding, buffering=buffer, newline="\n") as arquivo:
+        if primeiro is not None:
+            arquivo.write(primeiro + "\n")
+            total = 1
+            for registro in ordenados:
+                arquivo.write(registro + "\n")
+                total += 1
+    return total
+
+
+def _gerar_corridas(registros, key, memoria_max, nomes, buffer, encoding):
+    """
+    Grava corridas ordenadas de até memoria_max bytes de registros.
+
+    Returns:
+        Tupla (caminhos das corridas, registros restantes ordenados). Se nada
+        foi gravado, os registros restantes são a entrada inteira ordenada.
+    """
+    corridas = []
+    trecho = []
+    usado = 0
+    for registro in registros:
+        trecho.append(registro)
+        usado += sys.getsizeof(registro) + SOBRECARGA_POR_REGISTRO
+        if usado >= memoria_max:
+            corridas.append(_gravar(ordenar(trecho, key=key), next(nomes), buffer, encoding))
+            trecho = []
+            usado = 0
+    if corridas and trecho:
+        corridas.append(_gravar(ordenar(trecho, key=key), next(nomes), buffer, encoding))
+        trecho = []
+    return corridas, ordenar(trecho, key=key)
+
+
+def _gravar(registros, caminho, buffer, encoding):
+    with open(caminho, "w", encoding=encoding, buffering=buffer, newline="\n") as arquivo:
+        arquivo.writelines(registro + "\n" for registro in registros)
+    return caminho
+
+
+def _ler(caminho, buffer, encoding):
+    # newline="\n" (na leitura e na gravação das corridas): só "\n" separa
+    # registros, e um "\r" dentro de um registro não o divide ao passar pelo disco
+    with open(caminho, encoding=encoding, buffering=buffer, newline="\n") as arquivo:
+        for linha in arquivo:
+            yield linha[:-1]
+
+
+def _mesclar_arquivos(caminhos, key, buffer, encoding):
+    # Mescla de k vias das corridas em disco; fecha os arquivos mesmo se a
+    # mescla for interrompida
+    leitores = [_ler(caminho, buffer, encoding) for caminho in caminhos]
+    try:
+        yield from mesclar_k(*leitores, key=key)
+    finally:
+        for leitor in leitores:
+            leitor.close()
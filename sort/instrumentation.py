@@ -0,0 +1,321 @@
+"""
+Módulo de instrumentação dos algoritmos de sort/ e search/.
+
+Conta as operações do modelo de custo usado nas análises de complexidade, em
+vez de medir tempo de relógio:
+1. Comparações entre elementos (não entre índices)
+2. Movimentos: escritas de elementos em posições de listas (lista[i] = x, e
+   append/insert/extend, contados pelo número de elementos acrescentados)
+3. Listas criadas (literais, compreensões e fatias) e o pico de memória extra
+4. Profundidade máxima de chamadas aninhadas das funções de sort/ e search/
+   (a profundidade da recursão, mais as funções auxiliares)
+
+A instrumentação é opcional e não custa nada quando não está em uso: os
+algoritmos não têm nenhum contador embutido. As comparações são contadas
+embrulhando cada elemento em um objeto cujos operadores (<, <=, ==, ...)
+incrementam o contador, e as demais operações são observadas de fora, com os
+ganchos de rastreamento do interpretador (sys.settrace, no nível de instrução,
+e sys.setprofile, para as chamadas de métodos de lista em C), ativados apenas
+durante medir_operacoes e só para o código destes pacotes.
+
+Exemplos:
+    >>> from sort.simple_sorts import selection_sort
+    >>> resultado, relatorio = medir_operacoes(selection_sort, [3, 1, 2])
+    >>> resultado
+    [1, 2, 3]
+    >>> relatorio.comparacoes  # n(n-1)/2
+    3
+"""
+
+import dis
+import os
+import sys
+import tracemalloc
+from functools import lru_cache
+
+# Código destes diretórios é observado (exceto este próprio módulo)
+_DIRETORIOS = tuple(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), pacote) + os.sep
+                    for pacote in ("sort", "search"))
+_ESTE_ARQUIVO = os.path.abspath(__file__)
+
+_MOVIMENTO = 1
+_ALOCACAO = 2
+_METODOS_QUE_MOVEM = ("append", "insert", "extend")
+
+
+class Relatorio:
+    """
+    Contagens de operações de uma execução instrumentada.
+
+    Atributos:
+        nome: Nome da função medida
+        n: Tamanho da entrada
+        comparacoes: Comparações entre elementos
+        movimentos: Escritas de elementos em listas
+        listas_criadas: Listas novas criadas pelo algoritmo (inclui fatias)
+        profundidade_maxima: Maior aninhamento de chamadas de sort/ e search/
+        memoria_pico: Pico de memória alocada além da entrada, em bytes
+                      (None se a medição de memória foi desligada)
+        decisoes: Decisões registradas pelo algoritmo com registrar_decisao
+    """
+
+    CAMPOS = ("comparacoes", "movimentos", "listas_criadas", "profundidade_maxima", "memoria_pico")
+
+    def __init__(self, nome, n):
+        self.nome = nome
+        self.n = n
+        self.comparacoes = 0
+        self.movimentos = 0
+        self.listas_criadas = 0
+        self.profundidade_maxima = 0
+        self.memoria_pico = None
+        self.decisoes = []
+
+    def como_dict(self):
+        """Retorna as contagens em um dicionário (ex.: para gravar em JSON)."""
+        dados = {"nome": self.nome, "n": self.n}
+        dados.update((campo, getattr(self, campo)) for campo in self.CAMPOS)
+        dados["decisoes"] = list(self.decisoes)
+        return dados
+
+    def __str__(self):
+        memoria = f", {self.memoria_pico} bytes extras" if self.memoria_pico is not None else ""
+        return (f"{self.nome} (n={self.n}): {self.comparacoes} comparações, {self.movimentos} movimentos, "
+                f"{self.listas_criadas} listas criadas, profundidade {self.profundidade_maxima}{memoria}")
+
+
+class _Medido:
+    # Embrulha um elemento; cada comparação com ele incrementa o contador
+    __slots__ = ("valor", "relatorio")
+
+    def __init__(self, valor, relatorio):
+        self.valor = valor
+        self.relatorio = relatorio
+
+    def __lt__(self, outro):
+        self.relatorio.comparacoes += 1
+        return self.valor < _desembrulhar(outro)
+
+    def __le__(self, outro):
+        self.relatorio.comparacoes += 1
+        return self.valor <= _desembrulhar(outro)
+
+    def __gt__(self, outro):
+        self.relatorio.comparacoes += 1
+        return self.valor > _desembrulhar(outro)
+
+    def __ge__(self, outro):
+        self.relatorio.comparacoes += 1
+        return self.valor >= _desembrulhar(outro)
+
+    def __eq__(self, outro):
+        self.relatorio.comparacoes += 1
+        return self.valor == _desembrulhar(outro)
+
+    def __ne__(self, outro):
+        self.relatorio.comparacoes += 1
+        return self.valor != _desembrulhar(outro)
+
+    def __hash__(self):
+        return hash(self.valor)
+
+    def __repr__(self):
+        return f"_Medido({self.valor!r})"
+
+
+def _desembrulhar(x):
+    return x.valor if type(x) is _Medido else x
+
+
+@lru_cache(maxsize=None)
+def _observado(codigo):
+    arquivo = os.path.abspath(codigo.co_filename)
+    return arquivo != _ESTE_ARQUIVO and arquivo.startswith(_DIRETORIOS)
+
+
+@lru_cache(maxsize=None)
+def _classificar_instrucoes(codigo):
+    # Deslocamento da instrução -> _MOVIMENTO ou _ALOCACAO
+    instrucoes = list(dis.get_instructions(codigo))
+    tipos = {}
+    for atual, proxima in zip(instrucoes, instrucoes[1:] + [None]):
+        nome = atual.opname
+        if nome == "STORE_SUBSCR":
+            tipos[atual.offset] = _MOVIMENTO
+        elif nome in ("BUILD_LIST", "BINARY_SLICE"):
+            tipos[atual.offset] = _ALOCACAO
+        elif nome == "BUILD_SLICE" and proxima is not None and proxima.opname == "BINARY_SUBSCR":
+            tipos[atual.offset] = _ALOCACAO
+    return tipos
+
+
+class _Rastreador:
+    # Ganchos de sys.settrace e sys.setprofile ativos durante uma medição
+
+    def __init__(self, relatorio):
+        self.relatorio = relatorio
+        self.profundidade = 0
+        self.chamadas_c = []
+
+    def rastrear(self, quadro, evento, argumento):
+        # Gancho global: só é chamado no evento "call" de cada quadro novo
+        codigo = quadro.f_code
+        if not _observado(codigo):
+            return None
+        quadro.f_trace_lines = False
+        quadro.f_trace_opcodes = True
+        # Compreensões e expressões geradoras são quadros à parte, mas não chamadas
+        if not codigo.co_name.startswith("<"):
+            self.profundidade += 1
+            if self.profundidade > self.relatorio.profundidade_maxima:
+                self.relatorio.profundidade_maxima = self.profundidade
+        return self.rastrear_quadro
+
+    def rastrear_quadro(self, quadro, evento, argumento):
+        if evento == "opcode":
+            tipo = _classificar_instrucoes(quadro.f_code).get(quadro.f_lasti)
+            if tipo == _MOVIMENTO:
+                self.relatorio.movimentos += 1
+            elif tipo == _ALOCACAO:
+                self.relatorio.listas_criadas += 1
+        elif evento == "return" and not quadro.f_code.co_name.startswith("<"):
+            self.profundidade -= 1
+        return self.rastrear_quadro
+
+    def perfilar(self, quadro, evento, argumento):
+        # append/insert/extend rodam em C, sem eventos de instrução: o número de
+        # elementos movidos é o quanto a lista cresceu durante a chamada
+        if evento == "c_call":
+            lista = getattr(argumento, "__self__", None)
+            if (type(lista) is list and argumento.__name__ in _METODOS_QUE_MOVEM
+                    and _observado(quadro.f_code)):
+                self.chamadas_c.append((lista, len(lista)))
+            else:
+                self.chamadas_c.append(None)
+        elif evento in ("c_return", "c_exception") and self.chamadas_c:
+            chamada = self.chamadas_c.pop()
+            if chamada is not None:
+                self.relatorio.movimentos += len(chamada[0]) - chamada[1]
+
+
+def _embrulhar_argumentos(relatorio, lista, kwargs):
+    embrulhada = [_Medido(x, relatorio) for x in lista]
+    chave = kwargs.get("key")
+    if chave is not None:
+        # A chave é calculada sobre o valor original e embrulhada: são as
+        # comparações entre chaves que o algoritmo faz
+        kwargs = dict(kwargs, key=lambda x: _Medido(chave(_desembrulhar(x)), relatorio))
+    return embrulhada, kwargs
+
+
+def _desembrulhar_resultado(resultado):
+    if isinstance(resultado, list):
+        return [_desembrulhar(x) for x in resultado]
+    return _desembrulhar(resultado)
+
+
+def medir_operacoes(funcao, lista, *args, memoria=True, comparacoes=True, **kwargs):
+    """
+    Executa funcao(lista, *args, **kwargs) contando as operações realizadas.
+
+    A função recebe uma cópia da lista (a lista original nunca é modificada),
+    com os elementos embrulhados para contar comparações, e o resultado é
+    desembrulhado antes de ser retornado. Argumentos além da lista (ex.: o item
+    procurado em uma busca) são passados como estão: comparar um deles com um
+    elemento da lista também é contado.
+
+    Args:
+        funcao: Algoritmo de sort/ ou search/ (ou qualquer função que os chame)
+        lista: Entrada do algoritmo
+        *args, **kwargs: Demais argumentos da função (key= também é instrumentada)
+        memoria: Se True, executa a função uma segunda vez, sem rastreamento nem
+                 elementos embrulhados, para medir o pico de memória com tracemalloc
+        comparacoes: Se False, os elementos não são embrulhados (para algoritmos
+                     que fazem aritmética com os valores, como o Radix Sort)
+
+    Returns:
+        Tupla (resultado da função, Relatorio)
+
+    Complexidade:
+    - A execução instrumentada é dezenas de vezes mais lenta que a normal; as
+      contagens não dependem disso
+    """
+    relatorio = Relatorio(getattr(funcao, "__name__", str(funcao)), len(lista))
+    if comparacoes:
+        entrada, kwargs_medidos = _embrulhar_argumentos(relatorio, lista, kwargs)
+    else:
+        entrada, kwargs_medidos = list(lista), kwargs
+
+    rastreador = _Rastreador(relatorio)
+    global _relatorio_ativo
+    anterior = _relatorio_ativo
+    rastreio, perfil = sys.gettrace(), sys.getprofile()
+    _relatorio_ativo = relatorio
+    sys.setprofile(rastreador.perfilar)
+    sys.settrace(rastreador.rastrear)
+    try:
+        resultado = funcao(entrada, *args, **kwargs_medidos)
+    finally:
+        sys.settrace(rastreio)
+        sys.setprofile(perfil)
+        _relatorio_ativo = anterior
+    resultado = _desembrulhar_resultado(resultado)
+
+    if memoria:
+        relatorio.memoria_pico = _medir_memoria(funcao, list(lista), args, kwargs)
+    return resultado, relatorio
+
+
+def _medir_memoria(funcao, entrada, args, kwargs):
+    ja_rastreando = tracemalloc.is_tracing()
+    if not ja_rastreando:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        antes = tracemalloc.get_traced_memory()[0]
+        resultado = funcao(entrada, *args, **kwargs)
+        pico = tracemalloc.get_traced_memory()[1] - antes
+        del resultado
+        return pico
+    finally:
+        if not ja_rastreando:
+            tracemalloc.stop()
+
+
+# Relatório da medição em andamento (None fora de medir_operacoes)
+_relatorio_ativo = None
+
+
+def registrar_decisao(descricao, **dados):
+    """
+    Registra uma decisão tomada por um algoritmo (ex.: qual método de ordenação
+    foi escolhido e por quê) no relatório da medição em andamento.
+
+    Fora de medir_operacoes não faz nada além de um teste de None.
+
+    Args:
+        descricao: Texto curto da decisão
+        **dados: Valores que a justificam
+    """
+    if _relatorio_ativo is not None:
+        _relatorio_ativo.decisoes.append(dict(dados, descricao=descricao))
+
+
+def tabela(relatorios):
+    """
+    Formata vários relatórios (ex.: algoritmos diferentes sobre a mesma entrada)
+    como uma tabela de texto, uma linha por relatório.
+
+    Args:
+        relatorios: Lista de Relatorio
+
+    Returns:
+        String com a tabela
+    """
+    colunas = ("algoritmo", "n") + Relatorio.CAMPOS
+    linhas = [[r.nome, r.n] + ["-" if getattr(r, c) is None else getattr(r, c) for c in Relatorio.CAMPOS]
+              for r in relatorios]
+    larguras = [max(len(str(x)) for x in coluna) for coluna in zip(colunas, *linhas)]
+    formatar = lambda valores: "  ".join(
+        str(v).ljust(l) if i == 0 else str(v).rjust(l) for i, (v, l) in enumerate(zip(valores, larguras)))
+    return "\n".join([formatar(colunas)] + [formatar(linha) for linha in linhas])
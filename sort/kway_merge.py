@@ -0,0 +1,76 @@
+"""
+Módulo de mescla de k vias.
+
+A função mesclar do Merge Sort junta duas listas já ordenadas e materializadas.
+A mescla de k vias junta qualquer número de sequências ordenadas (listas,
+arquivos, geradores), sob demanda: mantém em um heap (fila de prioridade) só
+o próximo elemento de cada sequência e, a cada passo, entrega o menor deles e
+o substitui pelo seguinte da mesma sequência.
+
+É a etapa final da ordenação paralela (sort/parallel_sorts.py) e da ordenação
+externa (sort/external_sort.py), e serve também para juntar catálogos já
+ordenados (ex.: um por filial) sem carregá-los inteiros na memória.
+"""
+
+import heapq
+
+
+def mesclar_k(*sequencias, key=None):
+    """
+    Mescla sequências ordenadas em uma única sequência ordenada, sob demanda.
+
+    Cada entrada do heap é [chave, índice da sequência, elemento, iterador]:
+    chaves iguais são desempatadas pelo índice da sequência, então a mescla é
+    estável (entre elementos iguais, vêm primeiro os das sequências anteriores,
+    e dentro de uma sequência a ordem é mantida) e nunca compara os elementos
+    em si quando há key.
+
+    Invariante:
+    - O heap contém exatamente o próximo elemento ainda não entregue de cada
+      sequência não esgotada; o menor deles é o menor de todos os restantes.
+
+    Complexidade:
+    - Tempo: O(n log k) para n elementos em k sequências
+    - Espaço: O(k); cada sequência é lida um elemento por vez, à medida que a
+      saída é consumida
+
+    Args:
+        *sequencias: Iteráveis, cada um já ordenado pela mesma chave
+        key: Função opcional que extrai a chave de comparação de cada elemento,
+             calculada uma única vez por elemento
+
+    Returns:
+        Gerador dos elementos em ordem
+
+    Exemplos:
+        >>> list(mesclar_k([1, 4, 7], [2, 5], [3, 6, 8]))
+        [1, 2, 3, 4, 5, 6, 7, 8]
+        >>> list(mesclar_k(["b", "D"], ["A", "c"], key=str.lower))
+        ['A', 'b', 'c', 'D']
+    """
+    heap = []
+    for indice, sequencia in enumerate(sequencias):
+        iterador = iter(sequencia)
+        for elemento in iterador:
+            heap.append([elemento if key is None else key(elemento), indice, elemento, iterador])
+            break
+    heapq.heapify(heap)
+    substituir = heapq.heapreplace
+
+    while len(heap) > 1:
+        entrada = heap[0]
+        yield entrada[2]
+        for elemento in entrada[3]:
+            # Reaproveita a entrada da mesma sequência, com o elemento seguinte
+            entrada[0] = elemento if key is None else key(elemento)
+            entrada[2] = elemento
+            substituir(heap, entrada)
+            break
+        else:
+            heapq.heappop(heap)
+
+    # Sobrou uma sequência: o resto dela já está em ordem
+    if heap:
+        _, _, elemento, iterador = heap[0]
+        yield elemento
+        yield from iterador
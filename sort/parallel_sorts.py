@@ -0,0 +1,135 @@
+"""
+Módulo de ordenação paralela em vários processos.
+
+O Merge Sort se divide naturalmente em subproblemas independentes: a lista é
+cortada em um trecho por processo, cada processo ordena o seu trecho e os
+trechos ordenados são mesclados de uma vez (mescla de k vias) no processo
+principal. Processos, e não threads, porque o GIL impede que threads de Python
+comparem elementos ao mesmo tempo.
+
+Mandar os trechos para os processos exige serializá-los (pickle), o que custa
+tanto quanto ordená-los. Para listas de inteiros de 64 bits ou de floats, os
+valores são copiados uma única vez para um bloco de memória compartilhada
+(multiprocessing.shared_memory) como um array de C; cada processo lê e
+devolve o seu trecho nesse bloco, e só índices trafegam entre os processos.
+Demais listas (strings, objetos, ou qualquer lista ordenada com key) vão
+serializadas.
+
+Abaixo de LIMITE_SERIAL elementos, criar os processos custa mais que ordenar,
+e a ordenação é feita no próprio processo (ver python -m benchmarks paralelo).
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+from sort.adaptive_sort import ordenar
+from sort.kway_merge import mesclar_k
+
+# Medido com python -m benchmarks paralelo: abaixo disso, iniciar os processos
+# e copiar os dados custa mais que a ordenação serial economizada
+LIMITE_SERIAL = 200000
+
+# Tipo de array de C para cada tipo de elemento que pode ir pela memória compartilhada
+TIPOS_COMPARTILHADOS = {int: "q", float: "d"}
+
+
+def merge_sort_paralelo(lista, key=None, processos=None, limite_serial=LIMITE_SERIAL):
+    """
+    Ordena a lista dividindo o trabalho entre vários processos.
+
+    A lista é cortada em um trecho contíguo por processo; cada trecho é ordenado
+    por sort.adaptive_sort.ordenar em um processo separado e os trechos
+    ordenados são mesclados por sort.kway_merge.mesclar_k. Como os trechos são
+    contíguos e a mescla desempata pelo trecho de origem, a ordenação é estável.
+
+    Complexidade:
+    - Tempo: O((n/p) log(n/p)) em cada um dos p processos, mais O(n log p) na
+      mescla, feita no processo principal
+    - Espaço: O(n) para os trechos e o resultado (inteiros e floats: mais 8
+      bytes por elemento de memória compartilhada)
+
+    Args:
+        lista: Lista (ou sequência) de elementos a ser ordenada
+        key: Função opcional que extrai a chave de comparação de cada elemento,
+             calculada uma única vez por elemento no processo principal
+        processos: Número de processos (padrão = número de núcleos da máquina)
+        limite_serial: Abaixo deste tamanho, ordena no próprio processo
+
+    Returns:
+        Nova lista ordenada (a lista original não é modificada)
+
+    Exemplos:
+        >>> merge_sort_paralelo([5, 3, 1, 4, 2], processos=2, limite_serial=0)
+        [1, 2, 3, 4, 5]
+    """
+    processos = processos or os.cpu_count() or 1
+    n = len(lista)
+    if n < limite_serial or processos == 1 or n < 2 * processos:
+        return ordenar(lista, key=key)
+
+    if key is not None:
+        # Pares (chave, posição): os elementos em si não são enviados aos processos
+        chaves = [key(x) for x in lista]
+        pares = _ordenar_serializado(list(zip(chaves, range(n))), processos)
+        return [lista[i] for _, i in pares]
+
+    tipos = set(map(type, lista))
+    tipo = TIPOS_COMPARTILHADOS.get(tipos.pop()) if len(tipos) == 1 else None
+    if tipo is not None:
+        try:
+            valores = array(tipo, lista)
+        except OverflowError:
+            # Inteiros fora dos 64 bits
+            valores = None
+        if valores is not None:
+            return _ordenar_compartilhado(valores, processos)
+    return _ordenar_serializado(list(lista), processos)
+
+
+def _trechos(n, partes):
+    # Limites (inicio, fim) de partes trechos contíguos de tamanhos quase iguais
+    return [(n * i // partes, n * (i + 1) // partes) for i in range(partes)]
+
+
+def _ordenar_serializado(lista, processos):
+    trechos = [lista[inicio:fim] for inicio, fim in _trechos(len(lista), processos)]
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        ordenados = list(executor.map(ordenar, trechos))
+    return list(mesclar_k(*ordenados))
+
+
+def _ordenar_compartilhado(valores, processos):
+    n = len(valores)
+    memoria = SharedMemory(create=True, size=n * valores.itemsize)
+    try:
+        visao = memoria.buf.cast(valores.typecode)
+        try:
+            visao[:] = valores
+            del valores
+            trechos = _trechos(n, processos)
+            with ProcessPoolExecutor(max_workers=processos) as executor:
+                for futuro in [executor.submit(_ordenar_trecho_compartilhado, memoria.name, visao.format, inicio, fim)
+                               for inicio, fim in trechos]:
+                    futuro.result()
+            ordenados = [visao[inicio:fim].tolist() for inicio, fim in trechos]
+        finally:
+            visao.release()
+        return list(mesclar_k(*ordenados))
+    finally:
+        memoria.close()
+        memoria.unlink()
+
+
+def _ordenar_trecho_compartilhado(nome, tipo, inicio, fim):
+    # Executado em outro processo: ordena visao[inicio:fim] no próprio bloco
+    memoria = SharedMemory(name=nome)
+    try:
+        visao = memoria.buf.cast(tipo)
+        try:
+            visao[inicio:fim] = array(tipo, ordenar(visao[inicio:fim].tolist()))
+        finally:
+            visao.release()
+    finally:
+        memoria.close()
@@ -0,0 +1,250 @@
+"""
+Módulo de seleção e ordenação parcial.
+
+Relatórios como "os 100 livros mais emprestados" só precisam dos k primeiros
+elementos da ordem, e ordenar a lista inteira para depois fatiá-la custa
+O(n log n). Este módulo contém:
+1. k_esimo: o elemento que estaria na posição k da lista ordenada, em O(n)
+2. selecionar_k_menores: os k menores elementos, sem ordem entre eles, em O(n)
+3. sort_parcial: os k menores elementos em ordem, em O(n + k log k)
+
+A seleção é um Introselect: o Quickselect (partição com a função particionar
+do Quick Sort, continuando só do lado que contém a posição k) resolve o caso
+médio em O(n); se o trabalho acumulado passa de um múltiplo de n, sinal de
+pivôs ruins, a seleção passa a usar a mediana das medianas como pivô, que
+garante O(n) no pior caso. Para k pequeno em relação a n, a seleção por heap
+(um heap com os k menores vistos até agora) é mais rápida e aceita qualquer
+iterável, inclusive geradores.
+"""
+
+import heapq
+
+from sort.adaptive_sort import ordenar
+from sort.divide_and_conquer_sorts import particionar
+from sort.insertion_sorts import insertion_sort
+
+# O Quickselect com mediana de três faz cerca de 2,75n comparações no caso médio;
+# acima deste múltiplo de n, os pivôs estão ruins e a seleção passa a ser garantida
+FATOR_TRABALHO = 6
+
+# Seleção por heap quando k * DIVISOR_HEAP <= n (medido com listas aleatórias)
+DIVISOR_HEAP = 16
+
+
+def k_esimo(lista, k, key=None):
+    """
+    Retorna o elemento que estaria na posição k (a partir de 0) da lista ordenada.
+
+    Equivale a sorted(lista, key=key)[k], sem ordenar a lista.
+
+    Complexidade:
+    - Tempo: O(n) no pior caso (Introselect)
+    - Espaço: O(n) para a cópia (a lista original não é modificada)
+
+    Args:
+        lista: Lista (ou sequência) de elementos
+        k: Posição na ordem, de 0 a len(lista) - 1
+        key: Função opcional que extrai a chave de comparação de cada elemento
+
+    Returns:
+        O elemento da posição k. Com chaves iguais, vale a ordem da entrada, como
+        em uma ordenação estável.
+
+    Raises:
+        IndexError: Se k está fora da lista
+
+    Exemplos:
+        >>> k_esimo([5, 3, 1, 4, 2], 0)
+        1
+        >>> k_esimo([5, 3, 1, 4, 2], 3)
+        4
+    """
+    itens = list(lista)
+    if not 0 <= k < len(itens):
+        raise IndexError("k fora da lista")
+    if key is None:
+        _selecionar(itens, k)
+        return itens[k]
+    pares = [(key(x), i) for i, x in enumerate(itens)]
+    _selecionar(pares, k)
+    return itens[pares[k][1]]
+
+
+def selecionar_k_menores(lista, k, key=None):
+    """
+    Retorna os k menores elementos, em ordem arbitrária.
+
+    Com k pequeno em relação a n (ou se lista é um iterável sem tamanho, como um
+    gerador), usa a seleção por heap; caso contrário, o Introselect, que deixa
+    os k menores no início de uma cópia da lista.
+
+    Complexidade:
+    - Tempo: O(n) (Introselect) ou O(n log k) (heap)
+    - Espaço: O(n) (Introselect) ou O(k) (heap)
+
+    Args:
+        lista: Lista, sequência ou iterável de elementos
+        k: Quantos elementos selecionar (com k >= n, todos)
+        key: Função opcional que extrai a chave de comparação de cada elemento
+
+    Returns:
+        Lista com os k menores. Com key, entre chaves iguais na fronteira ficam
+        os que vêm antes na entrada, como em sorted(lista, key=key)[:k].
+
+    Exemplos:
+        >>> sorted(selecionar_k_menores([5, 3, 1, 4, 2], 2))
+        [1, 2]
+    """
+    if k <= 0:
+        return []
+    if not hasattr(lista, "__len__") or k * DIVISOR_HEAP <= len(lista):
+        return heapq.nsmallest(k, lista, key=key)
+    itens = list(lista)
+    if k >= len(itens):
+        return itens
+    if key is None:
+        _selecionar(itens, k - 1)
+        return itens[:k]
+    pares = [(key(x), i) for i, x in enumerate(itens)]
+    _selecionar(pares, k - 1)
+    return [itens[i] for _, i in pares[:k]]
+
+
+def sort_parcial(lista, k, key=None):
+    """
+    Retorna os k menores elementos em ordem: o mesmo que sorted(lista, key=key)[:k],
+    sem ordenar o resto da lista.
+
+    Seleciona os k menores (ver selecionar_k_menores) e ordena só eles com
+    sort.adaptive_sort.ordenar. Com key, a ordenação é estável.
+
+    Complexidade:
+    - Tempo: O(n + k log k)
+    - Espaço: O(n)
+
+    Args:
+        lista: Lista, sequência ou iterável de elementos
+        k: Quantos elementos retornar
+        key: Função opcional que extrai a chave de comparação de cada elemento
+
+    Returns:
+        Lista ordenada com os k menores
+
+    Exemplos:
+        >>> sort_parcial([5, 3, 1, 4, 2], 3)
+        [1, 2, 3]
+        >>> sort_parcial(["b", "A", "c"], 2, key=str.lower)
+        ['A', 'b']
+    """
+    if k <= 0:
+        return []
+    if not hasattr(lista, "__len__") or k * DIVISOR_HEAP <= len(lista):
+        # heapq.nsmallest já devolve em ordem (e é estável)
+        return heapq.nsmallest(k, lista, key=key)
+    itens = list(lista)
+    if key is None:
+        return ordenar(selecionar_k_menores(itens, k))
+    # Pares (chave, posição): a ordem final desempata pela posição na entrada
+    pares = selecionar_k_menores([(key(x), i) for i, x in enumerate(itens)], k)
+    return [itens[i] for _, i in ordenar(pares)]
+
+
+def _selecionar(lista, k):
+    """
+    Introselect: rearranja lista de modo que lista[k] seja o elemento da
+    posição k na ordem, com lista[:k] <= lista[k] <= lista[k + 1:].
+
+    Invariante de laço:
+    - A posição k está em lista[inicio...fim]; tudo antes de inicio é <= a todo
+      elemento do intervalo, e tudo depois de fim é >= a todo elemento dele.
+
+    Args:
+        lista: Lista a ser rearranjada (modificada in-place)
+        k: Posição a selecionar
+    """
+    inicio, fim = 0, len(lista) - 1
+    trabalho = 0
+    limite = FATOR_TRABALHO * len(lista)
+    while inicio < fim:
+        if trabalho > limite:
+            _selecionar_garantido(lista, inicio, fim, k)
+            return
+        trabalho += fim - inicio + 1
+
+        # Mediana de três na última posição, que particionar usa como pivô
+        meio = (inicio + fim) // 2
+        if lista[meio] < lista[inicio]:
+            lista[inicio], lista[meio] = lista[meio], lista[inicio]
+        if lista[fim] < lista[inicio]:
+            lista[inicio], lista[fim] = lista[fim], lista[inicio]
+        if lista[meio] < lista[fim]:
+            lista[meio], lista[fim] = lista[fim], lista[meio]
+
+        pos_pivo = particionar(lista, inicio, fim)
+        if k < pos_pivo:
+            fim = pos_pivo - 1
+        elif k > pos_pivo:
+            inicio = pos_pivo + 1
+        else:
+            return
+
+
+def _selecionar_garantido(lista, inicio, fim, k):
+    """
+    Seleção com a mediana das medianas como pivô, O(n) no pior caso.
+
+    A mediana das medianas de grupos de 5 tem pelo menos 30% dos elementos de
+    cada lado, então cada partição descarta ao menos 30% do intervalo. A
+    partição em três faixas (menores, iguais e maiores que o pivô) garante o
+    mesmo com muitos elementos repetidos, que levariam particionar a separar
+    um elemento por vez.
+
+    Args:
+        lista: Lista a ser rearranjada (modificada in-place)
+        inicio: Índice inicial do intervalo que contém a posição k
+        fim: Índice final do intervalo
+        k: Posição a selecionar
+    """
+    while inicio < fim:
+        pivo = _mediana_das_medianas(lista, inicio, fim)
+        menores, maiores = _particionar_tres(lista, inicio, fim, pivo)
+        if k < menores:
+            fim = menores - 1
+        elif k > maiores:
+            inicio = maiores + 1
+        else:
+            return
+
+
+def _mediana_das_medianas(lista, inicio, fim):
+    # Mediana de cada grupo de 5 (Insertion Sort em 5 elementos) e, por
+    # seleção garantida, a mediana dessas medianas
+    medianas = []
+    for i in range(inicio, fim + 1, 5):
+        grupo = insertion_sort(lista[i:min(i + 5, fim + 1)])
+        medianas.append(grupo[(len(grupo) - 1) // 2])
+    meio = (len(medianas) - 1) // 2
+    _selecionar_garantido(medianas, 0, len(medianas) - 1, meio)
+    return medianas[meio]
+
+
+def _particionar_tres(lista, inicio, fim, pivo):
+    """
+    Partição em três faixas (bandeira holandesa) ao redor do valor pivo.
+
+    Returns:
+        Tupla (menores, maiores): lista[inicio:menores] < pivo,
+        lista[menores:maiores + 1] == pivo e lista[maiores + 1:fim + 1] > pivo
+    """
+    menores, i, maiores = inicio, inicio, fim
+    while i <= maiores:
+        if lista[i] < pivo:
+            lista[i], lista[menores] = lista[menores], lista[i]
+            menores += 1
+            i += 1
+        elif pivo < lista[i]:
+            lista[i], lista[maiores] = lista[maiores], lista[i]
+            maiores -= 1
+        else:
+            i += 1
+    return menores, maiores
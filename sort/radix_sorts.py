@@ -0,0 +1,287 @@
+"""
+Módulo de implementação de algoritmos de ordenação sem comparações.
+
+Os algoritmos dos outros módulos comparam pares de elementos e não podem fazer
+menos que O(n log n) comparações. Quando a chave é um inteiro de amplitude
+limitada (identificadores numéricos) ou uma string (códigos de formato fixo,
+como "L001"), dá para ordenar distribuindo os elementos pelos dígitos da chave,
+em tempo linear no número de elementos:
+1. Counting Sort: conta as ocorrências de cada chave inteira; O(n + k), onde k
+   é a amplitude das chaves
+2. Radix Sort LSD: distribui as chaves inteiras por bytes, do menos para o mais
+   significativo, em baldes estáveis (array.array, 8 bytes por chave)
+3. Radix Sort MSD: distribui as strings pelos primeiros caracteres e repete em
+   cada balde com os caracteres seguintes, com a permutação in-place da American
+   Flag Sort em vez de baldes separados
+
+Todos aceitam key=, são estáveis e retornam uma nova lista.
+"""
+
+from array import array
+from collections import Counter
+from functools import partial
+from operator import index
+from os.path import commonprefix
+
+from sort.insertion_sorts import insertion_sort
+
+# Bits de cada dígito do Radix Sort LSD: um byte, 256 baldes por passada
+BITS_DIGITO = 8
+
+# Caracteres de cada dígito do Radix Sort MSD: com dois, metade dos níveis que
+# com um, e no máximo σ² baldes por trecho (medido com strings de 10^6 chaves)
+CARACTERES_DIGITO = 2
+
+# Trechos do Radix Sort MSD até este tamanho vão para o Insertion Sort
+LIMITE_INSERCAO = 64
+
+
+def counting_sort(lista, key=None):
+    """
+    Implementação do algoritmo de ordenação por contagem (Counting Sort).
+
+    Conta quantas vezes cada chave aparece em um vetor indexado pela chave
+    (menos a menor chave). A soma de prefixos das contagens dá a primeira
+    posição de cada chave na saída, e os elementos são colocados nessas
+    posições na ordem da entrada, o que mantém a estabilidade.
+
+    Invariante de laço (colocação):
+    - contagem[c] é a posição da saída onde vai o próximo elemento de chave
+      minimo + c; as posições anteriores do trecho da chave já estão ocupadas
+      pelos elementos que a têm, na ordem da entrada.
+
+    Complexidade:
+    - Tempo: O(n + k), onde k = maior chave - menor chave + 1
+    - Espaço: O(n + k)
+
+    Args:
+        lista: Lista (ou sequência indexável) de elementos a ser ordenada
+        key: Função opcional que extrai a chave de cada elemento; as chaves
+             (ou os elementos, sem key) devem ser inteiros
+
+    Returns:
+        Nova lista ordenada com os próprios elementos (a lista original não é
+        modificada). Sem key, elementos que não são exatamente int (ex.: bool,
+        IntEnum) são ordenados pelo seu valor inteiro e mantêm o tipo.
+
+    Exemplos:
+        >>> counting_sort([3, -1, 2, 3, 0])
+        [-1, 0, 2, 3, 3]
+        >>> counting_sort(["bb", "a", "cc", "d"], key=len)
+        ['a', 'd', 'bb', 'cc']
+    """
+    if not lista:
+        return []
+    if key is None and _nao_so_int(lista):
+        key = index
+    chaves = lista if key is None else [key(x) for x in lista]
+    minimo = min(chaves)
+    contagem = [0] * (max(chaves) - minimo + 1)
+    for c in chaves:
+        contagem[c - minimo] += 1
+
+    if key is None:
+        # Sem key, os elementos (int) são as próprias chaves: basta repeti-las
+        resultado = []
+        for valor, quantidade in enumerate(contagem, minimo):
+            if quantidade:
+                resultado.extend([valor] * quantidade)
+        return resultado
+
+    # Soma de prefixos: contagem[c] passa a ser a primeira posição da chave
+    total = 0
+    for c, quantidade in enumerate(contagem):
+        contagem[c] = total
+        total += quantidade
+
+    resultado = [None] * len(lista)
+    for x, c in zip(lista, chaves):
+        posicao = contagem[c - minimo]
+        resultado[posicao] = x
+        contagem[c - minimo] = posicao + 1
+    return resultado
+
+
+def radix_sort_lsd(lista, key=None, bits=BITS_DIGITO):
+    """
+    Implementação do Radix Sort LSD (dígito menos significativo primeiro)
+    para chaves inteiras.
+
+    As chaves são deslocadas pela menor delas (para aceitar negativos) e
+    distribuídas em 2^bits baldes pelo dígito menos significativo; os baldes
+    são concatenados em ordem e o processo se repete com o dígito seguinte,
+    até o mais significativo da maior chave. Com key, a posição de cada
+    elemento vai nos bits baixos do próprio valor distribuído (chave << b |
+    posição), então cada balde guarda um único inteiro por elemento. Os baldes
+    são arrays de inteiros sem sinal de 64 bits quando os valores cabem neles
+    (listas, caso contrário), e uma passada em que todos os valores caem no
+    mesmo balde não reordena nada.
+
+    Invariante de laço:
+    - Depois da passada do dígito d, os valores estão ordenados pelos dígitos
+      0...d; a distribuição é estável, então a ordem pelos dígitos anteriores
+      se mantém entre valores com o mesmo dígito d.
+
+    Complexidade:
+    - Tempo: O(n × w / bits), onde w é o número de bits da amplitude das chaves
+    - Espaço: O(n + 2^bits)
+
+    Args:
+        lista: Lista (ou sequência indexável) de elementos a ser ordenada
+        key: Função opcional que extrai a chave de cada elemento; as chaves
+             (ou os elementos, sem key) devem ser inteiros
+        bits: Bits por dígito (padrão: 8, um byte)
+
+    Returns:
+        Nova lista ordenada com os próprios elementos (a lista original não é
+        modificada). Sem key, elementos que não são exatamente int (ex.: bool,
+        IntEnum) são ordenados pelo seu valor inteiro e mantêm o tipo.
+
+    Exemplos:
+        >>> radix_sort_lsd([170, 45, 75, -90, 802, 24, 2, 66])
+        [-90, 2, 24, 45, 66, 75, 170, 802]
+        >>> radix_sort_lsd(["L10", "L2", "L1"], key=lambda codigo: int(codigo[1:]))
+        ['L1', 'L2', 'L10']
+    """
+    n = len(lista)
+    if n <= 1:
+        return list(lista)
+    if key is None and _nao_so_int(lista):
+        key = index
+    chaves = lista if key is None else [key(x) for x in lista]
+    minimo = min(chaves)
+    amplitude = max(chaves) - minimo
+
+    if key is None:
+        inicial = 0
+        valores = [c - minimo for c in chaves] if minimo else chaves
+    else:
+        # Os bits [0, inicial) guardam a posição; as passadas começam acima deles
+        inicial = (n - 1).bit_length()
+        valores = [(c - minimo) << inicial | i for i, c in enumerate(chaves)]
+
+    novo_balde = partial(array, "Q") if amplitude >> (64 - inicial) == 0 else list
+    valores = novo_balde(valores)
+    mascara = (1 << bits) - 1
+    for deslocamento in range(inicial, inicial + amplitude.bit_length(), bits):
+        baldes = [novo_balde() for _ in range(1 << bits)]
+        guardar = [balde.append for balde in baldes]
+        for v in valores:
+            guardar[(v >> deslocamento) & mascara](v)
+        if any(len(balde) == n for balde in baldes):
+            continue
+        valores = novo_balde()
+        for balde in baldes:
+            valores.extend(balde)
+
+    if key is None:
+        return [v + minimo for v in valores] if minimo else list(valores)
+    posicao = (1 << inicial) - 1
+    return [lista[v & posicao] for v in valores]
+
+
+def _nao_so_int(lista):
+    # Sem key, só listas de int exatos podem ser reconstruídas a partir das
+    # chaves; as demais (bool, IntEnum, ...) usam index como key
+    return set(map(type, lista)) != {int}
+
+
+def radix_sort_msd(lista, key=None):
+    """
+    Implementação do Radix Sort MSD (dígito mais significativo primeiro) para
+    chaves string, com a distribuição in-place da American Flag Sort.
+
+    O prefixo comum a todas as chaves (o da menor com a maior) é pulado. Em
+    cada trecho, conta os dígitos na profundidade d (os CARACTERES_DIGITO
+    caracteres a partir de d; uma string que termina antes vem antes de todas
+    que a continuam), calcula onde começa o balde de cada dígito e troca os
+    elementos de lugar até cada um estar no seu balde, sem copiar os elementos
+    para listas de baldes. Cada balde é então tratado no dígito seguinte;
+    trechos pequenos vão para o Insertion Sort. A ordenação é feita sobre as
+    posições dos elementos, e chaves iguais são desempatadas pela posição, o
+    que a torna estável.
+
+    Invariante (distribuição):
+    - proximo[b] é a primeira posição do balde b cujo elemento ainda não foi
+      conferido; todas as posições antes dela, dentro do balde, já têm
+      elementos com o dígito b. Cada troca coloca um elemento no seu balde
+      definitivo, então a distribuição faz no máximo uma troca por elemento.
+
+    Complexidade:
+    - Tempo: O(n × L) no pior caso, onde L é o comprimento do prefixo que
+      distingue as chaves (O(n log_σ n) para chaves aleatórias de um alfabeto
+      de σ caracteres), mais O(n) para pular o prefixo comum
+    - Espaço: O(n) para as posições e os dígitos do trecho em distribuição
+
+    Args:
+        lista: Lista (ou sequência indexável) de elementos a ser ordenada
+        key: Função opcional que extrai a chave de cada elemento; as chaves
+             (ou os elementos, sem key) devem ser strings (ou todas bytes)
+
+    Returns:
+        Nova lista ordenada (a lista original não é modificada)
+
+    Exemplos:
+        >>> radix_sort_msd(["L010", "L002", "A100", "L", "L001"])
+        ['A100', 'L', 'L001', 'L002', 'L010']
+        >>> radix_sort_msd(["b", "A", "a", "B"], key=str.lower)
+        ['A', 'a', 'b', 'B']
+    """
+    chaves = list(lista) if key is None else [key(x) for x in lista]
+    n = len(chaves)
+    if n <= 1:
+        return list(lista)
+    ordem = list(range(n))
+    pilha = [(0, n, len(commonprefix([min(chaves), max(chaves)])))]
+
+    while pilha:
+        inicio, fim, d = pilha.pop()
+        if fim - inicio <= LIMITE_INSERCAO:
+            pares = insertion_sort([(chaves[i], i) for i in ordem[inicio:fim]])
+            ordem[inicio:fim] = [i for _, i in pares]
+            continue
+
+        trecho = ordem[inicio:fim]
+        # O fatiamento devolve um dígito mais curto (ou "") para as chaves que
+        # terminam antes; ele vem antes dos dígitos que o continuam
+        caracteres = [chaves[i][d:d + CARACTERES_DIGITO] for i in trecho]
+        contagem = Counter(caracteres)
+        simbolos = sorted(contagem)
+        balde_de = {c: b for b, c in enumerate(simbolos)}
+        digitos = list(map(balde_de.__getitem__, caracteres))
+
+        # Limites de cada balde no trecho
+        proximo, limite = [], []
+        total = 0
+        for c in simbolos:
+            proximo.append(total)
+            total += contagem[c]
+            limite.append(total)
+
+        # Distribuição in-place (American Flag): troca o elemento conferido com
+        # o próximo lugar livre do seu balde, até que o lugar tenha um do balde b
+        for b in range(len(simbolos)):
+            p = proximo[b]
+            while p < limite[b]:
+                digito = digitos[p]
+                if digito == b:
+                    p += 1
+                    continue
+                q = proximo[digito]
+                proximo[digito] = q + 1
+                trecho[p], trecho[q] = trecho[q], trecho[p]
+                digitos[p], digitos[q] = digitos[q], digitos[p]
+            proximo[b] = p
+        ordem[inicio:fim] = trecho
+
+        for b, c in enumerate(simbolos):
+            a, z = inicio + limite[b] - contagem[c], inicio + limite[b]
+            if len(c) == CARACTERES_DIGITO:
+                if z - a > 1:
+                    pilha.append((a, z, d + CARACTERES_DIGITO))
+            elif key is not None and z - a > 1:
+                # Dígito curto: as chaves do balde terminaram e são todas iguais;
+                # restaura a ordem da entrada
+                ordem[a:z] = radix_sort_lsd(ordem[a:z])
+
+    return [chaves[i] for i in ordem] if key is None else [lista[i] for i in ordem]
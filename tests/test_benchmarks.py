@@ -0,0 +1,284 @@
+"""
+Módulo de testes para a suíte de benchmarks.
+
+Este módulo contém testes para verificar a medição, a execução dos casos e a
+comparação entre resultados implementadas em benchmarks/.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from array import array
+from collections import Counter
+
+from benchmarks.__main__ import main
+from benchmarks.comparacao import ESTAVEL, MELHORA, REGRESSAO, classificar, comparar, comparar_com_melhor
+from benchmarks.geradores import CHAVE_LIVRO, FORMATOS, gerar as gerar_formato, gerar_array, gerar_lista
+from benchmarks.medicao import medir, quartil, resumir
+from benchmarks.paralelo import medir_aceleracao, processos_padrao
+from benchmarks.suite import CASOS, Caso, executar, gerar, selecionar
+
+
+class TestMedicao(unittest.TestCase):
+    """
+    Classe de testes para o protocolo de medição.
+    """
+
+    def test_resumo(self):
+        """
+        Testa mediana, quartis e IQR contra valores calculados à mão.
+        """
+        self.assertEqual(quartil([1, 2, 3, 4], 0.5), 2.5)
+        self.assertEqual(quartil([7], 0.25), 7)
+        resumo = resumir([50, 10, 40, 20, 30])
+        self.assertEqual(resumo["mediana_ns"], 30)
+        self.assertEqual((resumo["q1_ns"], resumo["q3_ns"], resumo["iqr_ns"]), (20, 40, 20))
+        self.assertEqual((resumo["min_ns"], resumo["max_ns"], resumo["repeticoes"]), (10, 50, 5))
+
+    def test_preparacao_fora_do_tempo(self):
+        """
+        Testa que preparar() roda antes de cada execução e que o aquecimento
+        não entra nas repetições.
+        """
+        chamadas = {"preparar": 0, "executar": 0}
+
+        def preparar():
+            chamadas["preparar"] += 1
+            return [3, 1, 2]
+
+        def executar(lista):
+            chamadas["executar"] += 1
+            lista.sort()
+            return lista
+
+        resumo, resultado = medir(executar, preparar, repeticoes=5, aquecimento=2)
+        self.assertEqual(resumo["repeticoes"], 5)
+        self.assertEqual(chamadas, {"preparar": 7, "executar": 7})
+        self.assertEqual(resultado, [1, 2, 3])
+        self.assertGreater(resumo["mediana_ns"], 0)
+
+    def test_orcamento_de_tempo(self):
+        """
+        Testa que um orçamento curto reduz as repetições até o mínimo.
+        """
+        resumo, _ = medir(lambda _: sum(range(100000)), repeticoes=50, tempo_max=1e-9)
+        self.assertEqual(resumo["repeticoes"], 3)
+
+
+class TestSuite(unittest.TestCase):
+    """
+    Classe de testes para os casos de benchmark.
+    """
+
+    def test_todos_os_casos_em_entradas_pequenas(self):
+        """
+        Testa que todo caso registrado roda e produz saída correta em cada entrada.
+        """
+        tipos = ("int", "str")
+        resultados = executar(tamanhos=[50], repeticoes=1, tipos=tipos)["resultados"]
+        # Casos de ordenação com tipos (ex.: radix_sort_lsd, só int) não rodam nos demais
+        esperado = sum(len(c.entradas) * (sum(not c.tipos or t in c.tipos for t in tipos) if c.grupo == "sort" else 1)
+                       for c in CASOS)
+        self.assertEqual(len(resultados), esperado)
+        for resultado in resultados:
+            self.assertNotIn("erro", resultado, resultado)
+            self.assertGreater(resultado["mediana_ns"], 0)
+
+    def test_erros_sao_registrados(self):
+        """
+        Testa que um RecursionError ou uma saída errada vira um resultado com
+        erro, sem interromper a suíte.
+        """
+        def recursivo(lista):
+            return recursivo(lista)
+
+        casos = [Caso("sort", "recursivo", recursivo, ("aleatoria",)),
+                 Caso("sort", "errado", lambda lista: lista, ("aleatoria",), verificar=lambda d, r: r == sorted(d))]
+        resultados = executar(casos, tamanhos=[100], repeticoes=1)["resultados"]
+        self.assertEqual([r["erro"] for r in resultados], ["RecursionError", "resultado incorreto"])
+
+    def test_piores_casos_limitados(self):
+        """
+        Testa que entradas de pior caso quadrático ficam limitadas a 10^4 elementos.
+        """
+        casos = selecionar(["sort"], ["quick_sort"])
+        resultados = executar(casos, tamanhos=[20000], repeticoes=1, entradas=["todos_iguais"])["resultados"]
+        # Só a mediana de três escapa do pior caso com todos os elementos iguais
+        self.assertEqual([r["algoritmo"] for r in resultados], ["quick_sort_mediana_de_tres"])
+
+    def test_limite_de_tamanho(self):
+        """
+        Testa que algoritmos quadráticos não são executados acima do seu max_n.
+        """
+        casos = selecionar(["sort"], ["selection_sort"])
+        resultados = executar(casos, tamanhos=[10, 10 ** 9], entradas=["aleatoria"], repeticoes=1)
+        self.assertEqual([r["n"] for r in resultados["resultados"]], [10])
+
+    def test_entradas_reproduziveis(self):
+        """
+        Testa que a mesma semente gera a mesma entrada.
+        """
+        self.assertEqual(gerar("sort", "aleatoria", 100), gerar("sort", "aleatoria", 100))
+        self.assertNotEqual(gerar("sort", "aleatoria", 100), gerar("sort", "aleatoria", 100, semente=7))
+        lista, consultas = gerar("search", "ausentes", 100)
+        self.assertTrue(all(c % 2 == 1 for c in consultas))
+        self.assertEqual(len(set(gerar("hash", "aleatoria", 1000))), 1000)
+
+    def test_aceleracao_paralela(self):
+        """
+        Testa a medição da ordenação paralela: uma linha serial e uma por número
+        de processos em cada tamanho.
+        """
+        dados = medir_aceleracao(tamanhos=[2000], processos=[1, 2], repeticoes=3)
+        self.assertEqual([(r["n"], r["processos"]) for r in dados["resultados"]], [(2000, 1), (2000, 2)])
+        self.assertEqual(dados["resultados"][0]["aceleracao"], 1.0)
+        self.assertGreater(dados["resultados"][1]["aceleracao"], 0)
+        self.assertIn(dados["limite_sugerido"], (None, 2000))
+        self.assertEqual(processos_padrao()[0], 1)
+        self.assertEqual(processos_padrao()[-1], os.cpu_count())
+
+
+class TestGeradores(unittest.TestCase):
+    """
+    Classe de testes para os geradores de entradas.
+    """
+
+    def test_formatos(self):
+        """
+        Testa o formato de cada gerador em uma entrada pequena.
+        """
+        n = 1000
+        for formato in FORMATOS:
+            self.assertEqual(len(gerar_lista(formato, n)), n, formato)
+        self.assertEqual(gerar_lista("ordenada", n), list(range(n)))
+        self.assertEqual(gerar_lista("inversa", n), list(range(n - 1, -1, -1)))
+        self.assertEqual(set(gerar_lista("todos_iguais", n)), {0})
+        self.assertLessEqual(len(set(gerar_lista("poucos_unicos", n))), 10)
+        self.assertEqual(gerar_lista("tubo_de_orgao", 7), [0, 1, 2, 3, 2, 1, 0])
+        self.assertEqual(gerar_lista("dente_de_serra", 7, periodo=3), [0, 1, 2, 0, 1, 2, 0])
+        self.assertEqual(sorted(gerar_lista("matador_mediana_de_tres", n)), list(range(n)))
+
+        quase = gerar_lista("quase_ordenada", n, k=5)
+        self.assertEqual(sorted(quase), list(range(n)))
+        self.assertLessEqual(sum(x != i for i, x in enumerate(quase)), 10)
+
+        # Zipf: o valor mais frequente aparece muito mais que a média
+        frequencias = Counter(gerar_lista("zipf", 10000))
+        self.assertEqual(frequencias.most_common(1)[0][0], 0)
+        self.assertGreater(frequencias[0], 10 * 10000 / len(frequencias))
+
+    def test_tipos_preservam_a_ordem(self):
+        """
+        Testa que floats, strings e livros seguem a ordem relativa dos inteiros.
+        """
+        inteiros = gerar_lista("aleatoria", 500)
+        ordem = sorted(range(500), key=inteiros.__getitem__)
+        for tipo in ("float", "str"):
+            valores = gerar_lista("aleatoria", 500, tipo)
+            self.assertEqual(sorted(range(500), key=valores.__getitem__), ordem, tipo)
+        livros = gerar_lista("aleatoria", 500, "livro")
+        self.assertEqual(sorted(range(500), key=lambda i: CHAVE_LIVRO(livros[i])), ordem)
+        self.assertEqual(len({livro.codigo for livro in livros}), 500)
+
+    def test_sob_demanda_e_array(self):
+        """
+        Testa que as entradas são geradas sob demanda e que gerar_array usa
+        arrays tipados.
+        """
+        iterador = gerar_formato("aleatoria", 10 ** 12)  # nada é materializado
+        self.assertEqual(len([next(iterador) for _ in range(3)]), 3)
+        inteiros = gerar_array("zipf", 1000)
+        self.assertIsInstance(inteiros, array)
+        self.assertEqual((inteiros.typecode, len(inteiros)), ("q", 1000))
+        self.assertEqual(gerar_array("ordenada", 3, "float").tolist(), [0.5, 1.5, 2.5])
+        with self.assertRaises(ValueError):
+            gerar_array("ordenada", 3, "str")
+        self.assertEqual(gerar_lista("quase_ordenada", 100), gerar_lista("quase_ordenada", 100))
+
+
+class TestComparacao(unittest.TestCase):
+    """
+    Classe de testes para a detecção de regressões.
+    """
+
+    def resultados(self, *medidas):
+        return {"resultados": [dict(grupo="sort", algoritmo=f"a{i}", entrada="aleatoria", n=100, **m)
+                               for i, m in enumerate(medidas)]}
+
+    def test_classificacao(self):
+        """
+        Testa que só diferenças acima do limiar e do ruído (IQR) contam.
+        """
+        base = {"mediana_ns": 100, "q1_ns": 95, "q3_ns": 105}
+        self.assertEqual(classificar(base, {"mediana_ns": 150, "q1_ns": 140, "q3_ns": 160}), REGRESSAO)
+        self.assertEqual(classificar(base, {"mediana_ns": 50, "q1_ns": 45, "q3_ns": 55}), MELHORA)
+        # Acima do limiar, mas dentro da variação entre repetições
+        self.assertEqual(classificar(base, {"mediana_ns": 150, "q1_ns": 90, "q3_ns": 200}), ESTAVEL)
+        # Sem sobreposição, mas abaixo do limiar
+        self.assertEqual(classificar(base, {"mediana_ns": 108, "q1_ns": 106, "q3_ns": 110}), ESTAVEL)
+        self.assertEqual(classificar(base, {"erro": "RecursionError"}), REGRESSAO)
+        self.assertEqual(classificar({"erro": "RecursionError"}, base), MELHORA)
+
+    def test_comparar_e_linha_de_comando(self):
+        """
+        Testa a comparação entre arquivos e o código de saída do comando comparar.
+        """
+        antigo = self.resultados({"mediana_ns": 100, "q1_ns": 95, "q3_ns": 105},
+                                 {"mediana_ns": 100, "q1_ns": 95, "q3_ns": 105})
+        novo = self.resultados({"mediana_ns": 100, "q1_ns": 96, "q3_ns": 104},
+                               {"mediana_ns": 300, "q1_ns": 290, "q3_ns": 310})
+        comparacoes = comparar(antigo, novo)
+        self.assertEqual([c["situacao"] for c in comparacoes], [ESTAVEL, REGRESSAO])
+        self.assertAlmostEqual(comparacoes[1]["razao"], 3.0)
+
+        with tempfile.TemporaryDirectory() as pasta:
+            caminhos = []
+            for nome, dados in (("antigo", antigo), ("novo", novo)):
+                caminhos.append(os.path.join(pasta, nome + ".json"))
+                with open(caminhos[-1], "w", encoding="utf-8") as arquivo:
+                    json.dump(dados, arquivo)
+            self.assertEqual(main(["comparar", caminhos[0], caminhos[1]]), 1)
+            self.assertEqual(main(["comparar", caminhos[0], caminhos[0]]), 0)
+
+    def test_comparar_com_melhor(self):
+        """
+        Testa a razão entre a ordenação adaptativa e a melhor escolha fixa de
+        cada entrada, ignorando a referência sorted() e os erros.
+        """
+        dados = {"resultados": [
+            dict(grupo="sort", algoritmo="merge_sort", entrada="aleatoria", n=100, mediana_ns=300),
+            dict(grupo="sort", algoritmo="quick_sort", entrada="aleatoria", n=100, mediana_ns=200),
+            dict(grupo="sort", algoritmo="sorted (referência)", entrada="aleatoria", n=100, mediana_ns=10),
+            dict(grupo="sort", algoritmo="ordenar (adaptativo)", entrada="aleatoria", n=100, mediana_ns=250),
+            dict(grupo="sort", algoritmo="quick_sort", entrada="ordenada", n=100, erro="RecursionError"),
+            dict(grupo="sort", algoritmo="ordenar (adaptativo)", entrada="ordenada", n=100, mediana_ns=5),
+        ]}
+        comparacoes = comparar_com_melhor(dados)
+        self.assertEqual(len(comparacoes), 1)
+        self.assertEqual((comparacoes[0]["melhor"], comparacoes[0]["razao"]), ("quick_sort", 1.25))
+        
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "resultados.json")
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                json.dump(dados, arquivo)
+            self.assertEqual(main(["adaptativo", caminho]), 0)
+            self.assertEqual(main(["adaptativo", caminho, "--limite", "1.1"]), 1)
+
+    def test_executar_grava_json(self):
+        """
+        Testa o comando executar de ponta a ponta, com saída em JSON.
+        """
+        with tempfile.TemporaryDirectory() as pasta:
+            saida = os.path.join(pasta, "resultados.json")
+            self.assertEqual(main(["executar", "--grupos", "search", "--tamanhos", "100",
+                                   "--repeticoes", "2", "--saida", saida]), 0)
+            with open(saida, encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+        self.assertEqual(dados["parametros"]["repeticoes"], 2)
+        self.assertEqual(len(dados["resultados"]), 6)  # 3 buscas x 2 entradas
+        self.assertEqual(comparar(dados, dados)[0]["situacao"], ESTAVEL)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,1321 @@
+"""
+Módulo de testes para o sistema de biblioteca digital.
+
+Este módulo contém testes para verificar a corretude das estruturas de dados
+usadas pelo sistema em biblioteca/.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+# Os módulos da biblioteca usam importações locais (ex.: "from livro import Livro")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "biblioteca"))
+
+from acervo import Acervo
+from arvore_radix import ArvoreRadix
+from bst import BST
+from catalogo_mmap import CatalogoMapeado, gravar_catalogo
+from livro import Livro
+from usuario import Usuario
+from grafo import Grafo
+from indice_textual import IndiceTextual, normalizar
+from fila_prioridade import FilaPrioridade, prioridade_emprestimo
+from pilha import Pilha
+from persistencia import salvar, carregar
+from recomendador import Recomendador
+from servico import Biblioteca
+from servidor import MAX_CORPO, ServidorBiblioteca, gerar_carga, percentis, requisitar
+from wal import LogEscrita, ler
+
+
+class TestRegistrosCompactos(unittest.TestCase):
+    """
+    Classe de testes para o layout compacto de Livro e Usuario.
+    """
+
+    def test_sem_dict_por_instancia(self):
+        """
+        Testa se Livro e Usuario usam __slots__ em vez de __dict__.
+        """
+        self.assertFalse(hasattr(Livro("1984", "George Orwell", "L001"), "__dict__"))
+        self.assertFalse(hasattr(Usuario("Ana", "U001"), "__dict__"))
+
+    def test_fila_espera_preguicosa_e_autor_internado(self):
+        """
+        Testa se a fila de espera só é alocada no acesso e se o autor é compartilhado.
+        """
+        autor = "".join(["Machado", " de Assis"])
+        livro1 = Livro("Dom Casmurro", autor, "L002")
+        livro2 = Livro("Memórias Póstumas", "".join(["Machado de", " Assis"]), "L006")
+        self.assertIs(livro1.autor, livro2.autor)
+
+        self.assertIsNone(livro1._fila_espera)
+        livro1.fila_espera.append("U001")
+        self.assertEqual(livro1.fila_espera, ["U001"])
+        self.assertEqual(str(livro1), "Dom Casmurro (Machado de Assis) [Código: L002]")
+
+    def test_autor_que_nao_e_str(self):
+        """
+        Testa se um autor que não é str (ex.: None) é aceito sem ser internado.
+        """
+        livro = Livro("Anônimo", None, "L009")
+        self.assertIsNone(livro.autor)
+        self.assertEqual(str(livro), "Anônimo (None) [Código: L009]")
+
+
+class TestAcervo(unittest.TestCase):
+    """
+    Classe de testes para o armazenamento colunar do catálogo.
+    """
+
+    def setUp(self):
+        """
+        Configura um acervo com livros de autores repetidos.
+        """
+        self.dados = [
+            ("Neuromancer", "William Gibson", "L005"),
+            ("Dom Casmurro", "Machado de Assis", "L002"),
+            ("O Cortiço", "Aluísio Azevedo", "L003"),
+            ("1984", "George Orwell", "L001"),
+            ("Memórias Póstumas de Brás Cubas", "Machado de Assis", "L006"),
+        ]
+        self.acervo = Acervo.de_livros(Livro(*d) for d in self.dados)
+
+    def test_visoes(self):
+        """
+        Testa se as visões devolvem as colunas originais, inclusive com acentos.
+        """
+        self.assertEqual(len(self.acervo), 5)
+        self.assertEqual(len(self.acervo.autores), 4)
+        for i, (titulo, autor, codigo) in enumerate(self.dados):
+            visao = self.acervo[i]
+            self.assertEqual((visao.titulo, visao.autor, visao.codigo), (titulo, autor, codigo))
+        self.assertEqual(str(self.acervo[2]), str(Livro(*self.dados[2])))
+        with self.assertRaises(IndexError):
+            self.acervo[5]
+
+    def test_ordenacao_e_busca_por_coluna(self):
+        """
+        Testa a ordenação por índices e a busca binária sobre as colunas.
+        """
+        titulos = [v.titulo for v in self.acervo.em_ordem("titulo")]
+        self.assertEqual(titulos, sorted(d[0] for d in self.dados))
+        codigos = [v.codigo for v in self.acervo.em_ordem("codigo")]
+        self.assertEqual(codigos, sorted(d[2] for d in self.dados))
+
+        self.assertEqual(self.acervo.buscar("titulo", "O Cortiço").codigo, "L003")
+        self.assertEqual(self.acervo.buscar("codigo", "L001").titulo, "1984")
+        self.assertIsNone(self.acervo.buscar("titulo", "Inexistente"))
+
+        # Uma nova inserção invalida as ordens em cache
+        self.acervo.adicionar("A Hora da Estrela", "Clarice Lispector", "L007")
+        self.assertEqual(next(self.acervo.em_ordem()).titulo, "1984")
+        self.assertEqual(self.acervo.buscar("titulo", "A Hora da Estrela").codigo, "L007")
+
+        with self.assertRaises(ValueError):
+            self.acervo.ordenar_por("editora")
+
+
+class TestGrafoPonderado(unittest.TestCase):
+    """
+    Classe de testes para o grafo de empréstimos conjuntos com pesos.
+    """
+
+    def test_pesos_e_ranking(self):
+        """
+        Testa o acúmulo de pesos e a ordenação das recomendações.
+        """
+        grafo = Grafo()
+        for codigo, vezes in [("L002", 3), ("L003", 1), ("L004", 5), ("L005", 3)]:
+            for _ in range(vezes):
+                grafo.adicionar_relacao("L001", codigo)
+        grafo.adicionar_relacao("L001", "L001")
+
+        self.assertEqual(grafo.peso("L001", "L004"), 5)
+        self.assertEqual(grafo.peso("L004", "L001"), 5)
+        self.assertEqual(grafo.peso("L001", "L001"), 0)
+        self.assertEqual(grafo.recomendar("L001"), ["L004", "L002", "L005", "L003"])
+        self.assertEqual(grafo.recomendar("L001", 2), ["L004", "L002"])
+        self.assertEqual(grafo.recomendar("L999"), [])
+
+    def test_top_k_aleatorio(self):
+        """
+        Compara o top-k com a ordenação completa dos vizinhos.
+        """
+        random.seed(42)
+        grafo = Grafo()
+        for i in range(2000):
+            grafo.adicionar_relacao("L0", f"L{i + 1}", random.randint(1, 50))
+        esperado = sorted(grafo.livros["L0"], key=lambda c: (-grafo.livros["L0"][c], c))
+        for k in [1, 10, 100, 2000, 5000]:
+            self.assertEqual(grafo.recomendar("L0", k), esperado[:k])
+
+    def test_cache_invalidado(self):
+        """
+        Testa se o cache de top-k é invalidado quando uma relação muda.
+        """
+        grafo = Grafo(cache_k=2)
+        grafo.adicionar_relacao("L001", "L002", 2)
+        grafo.adicionar_relacao("L001", "L003", 1)
+        grafo.precomputar_top_k()
+        self.assertEqual(grafo.recomendar("L001", 2), ["L002", "L003"])
+
+        grafo.adicionar_relacao("L003", "L001", 5)
+        self.assertEqual(grafo.recomendar("L001", 2), ["L003", "L002"])
+        self.assertEqual(grafo.recomendar("L002"), ["L001"])
+
+        with self.assertRaises(ValueError):
+            Grafo().precomputar_top_k()
+
+
+class TestGrafoEmLote(unittest.TestCase):
+    """
+    Classe de testes para a inserção de arestas em lote.
+    """
+
+    def test_relacoes_em_lote_equivalem_as_individuais(self):
+        """
+        Testa se adicionar_relacoes produz o mesmo grafo que chamadas individuais.
+        """
+        random.seed(42)
+        relacoes = [(f"L{random.randrange(30)}", f"L{random.randrange(30)}") for _ in range(2000)]
+        relacoes += [(f"L{random.randrange(30)}", f"L{random.randrange(30)}", 3) for _ in range(200)]
+
+        individual = Grafo()
+        for relacao in relacoes:
+            individual.adicionar_relacao(*relacao)
+        lote = Grafo()
+        lote.adicionar_relacoes(iter(relacoes))
+        self.assertEqual(lote.livros, individual.livros)
+
+    def test_cestas(self):
+        """
+        Testa se cada par dentro de uma cesta ganha +1, ignorando repetições na cesta.
+        """
+        grafo = Grafo(cache_k=2)
+        grafo.adicionar_relacao("A", "B")
+        self.assertEqual(grafo.recomendar("A"), ["B"])
+        grafo.adicionar_cestas([["A", "B", "C"], ["B", "C", "C"], ["D"]])
+        self.assertEqual(grafo.peso("A", "B"), 2)
+        self.assertEqual(grafo.peso("B", "C"), 2)
+        self.assertEqual(grafo.peso("A", "C"), 1)
+        self.assertEqual(grafo.peso("C", "C"), 0)
+        self.assertIn("D", grafo.livros)
+        self.assertEqual(grafo.recomendar("A"), ["B", "C"])
+
+    def test_recomendador_em_lote(self):
+        """
+        Testa se repetir um log em lote gera o mesmo grafo que o registro individual.
+        """
+        random.seed(7)
+        emprestimos = [(f"U{random.randrange(10)}", f"L{random.randrange(20)}") for _ in range(500)]
+        individual = Recomendador(Grafo(), janela=5)
+        for id_usuario, codigo in emprestimos:
+            individual.registrar_emprestimo(id_usuario, codigo)
+        lote = Recomendador(Grafo(), janela=5)
+        lote.registrar_emprestimos(emprestimos)
+        self.assertEqual(lote.grafo.livros, individual.grafo.livros)
+        self.assertEqual(lote.historicos, individual.historicos)
+
+
+class TestGrafoCSR(unittest.TestCase):
+    """
+    Classe de testes para o snapshot CSR do grafo de recomendações.
+    """
+
+    def setUp(self):
+        """
+        Configura um grafo pequeno com pesos.
+        """
+        self.grafo = Grafo()
+        for c1, c2, peso in [("A", "B", 2), ("A", "C", 1), ("B", "C", 3), ("C", "D", 1), ("B", "D", 1)]:
+            self.grafo.adicionar_relacao(c1, c2, peso)
+
+    def test_layout_csr(self):
+        """
+        Testa se indptr/indices/pesos reproduzem as listas de adjacência.
+        """
+        csr = self.grafo.congelar()
+        self.assertEqual(len(csr.indptr), len(self.grafo.livros) + 1)
+        for codigo, vizinhos in self.grafo.livros.items():
+            indices, pesos = csr.vizinhos(codigo)
+            self.assertIsInstance(indices, memoryview)
+            self.assertEqual({csr.codigos[j]: p for j, p in zip(indices, pesos)}, vizinhos)
+            self.assertEqual(list(indices), sorted(indices))
+        self.assertEqual(len(csr.vizinhos("Z")[0]), 0)
+
+    def test_recomendar_pelo_snapshot(self):
+        """
+        Testa se recomendar lê do snapshot e se ele é descartado após mudanças.
+        """
+        esperado = self.grafo.recomendar("B")
+        csr = self.grafo.congelar()
+        self.assertIs(self.grafo.snapshot, csr)
+        self.assertEqual(self.grafo.recomendar("B"), esperado)
+        self.assertEqual(self.grafo.recomendar("B", 1), ["C"])
+
+        self.grafo.adicionar_relacao("B", "D", 5)
+        self.assertIsNone(self.grafo.snapshot)
+        self.assertEqual(self.grafo.recomendar("B", 1), ["D"])
+
+    def test_similaridades(self):
+        """
+        Compara cosseno e Jaccard com o cálculo direto pelas definições.
+        """
+        csr = self.grafo.congelar()
+        livros = self.grafo.livros
+        for c1 in livros:
+            cossenos = csr.similaridades(c1, "cosseno")
+            jaccards = csr.similaridades(c1, "jaccard")
+            for c2 in livros:
+                if c2 == c1:
+                    continue
+                comuns = set(livros[c1]) & set(livros[c2])
+                dot = sum(livros[c1][v] * livros[c2][v] for v in comuns)
+                norma = (sum(p * p for p in livros[c1].values()) * sum(p * p for p in livros[c2].values())) ** 0.5
+                self.assertAlmostEqual(cossenos.get(c2, 0.0), dot / norma)
+                jaccard = len(comuns) / len(set(livros[c1]) | set(livros[c2]))
+                self.assertAlmostEqual(jaccards.get(c2, 0.0), jaccard)
+
+        lote = dict(csr.similares_em_lote(k=2, medida="jaccard"))
+        self.assertEqual(set(lote), set(livros))
+        self.assertEqual(lote["A"], csr.similares("A", 2, "jaccard"))
+        with self.assertRaises(ValueError):
+            csr.similaridades("A", "euclidiana")
+
+
+class TestRecomendador(unittest.TestCase):
+    """
+    Classe de testes para o motor de recomendações com PageRank personalizado.
+    """
+
+    def setUp(self):
+        """
+        Configura um histórico de empréstimos de três usuários.
+        """
+        self.grafo = Grafo()
+        self.recomendador = Recomendador(self.grafo)
+        for id_usuario, codigos in [("U1", ["A", "B"]), ("U2", ["B", "C"]), ("U3", ["C", "D", "E"])]:
+            for codigo in codigos:
+                self.recomendador.registrar_emprestimo(id_usuario, codigo)
+
+    def test_arestas_do_historico(self):
+        """
+        Testa se as arestas ligam apenas livros emprestados pelo mesmo usuário.
+        """
+        self.assertEqual(self.grafo.peso("A", "B"), 1)
+        self.assertEqual(self.grafo.peso("A", "C"), 0)
+        self.assertEqual(self.grafo.peso("D", "E"), 1)
+
+    def test_recomendacao_multi_saltos(self):
+        """
+        Testa se livros a mais de um salto aparecem, atrás dos vizinhos diretos.
+        """
+        recomendados = self.recomendador.recomendar("A", k=10)
+        self.assertEqual(recomendados[:2], ["B", "C"])
+        self.assertNotIn("A", recomendados)
+        self.assertEqual(self.recomendador.recomendar("A", k=1), ["B"])
+        self.assertEqual(self.recomendador.recomendar("Z"), [])
+
+    def test_recomendacao_para_usuario(self):
+        """
+        Testa se a recomendação por usuário exclui o que ele já emprestou.
+        """
+        recomendados = self.recomendador.recomendar_para_usuario("U1", k=3)
+        self.assertEqual(recomendados[0], "C")
+        self.assertFalse({"A", "B"} & set(recomendados))
+        self.assertEqual(self.recomendador.recomendar_para_usuario("U9"), [])
+
+    def test_janela_limita_historico(self):
+        """
+        Testa se só os últimos livros da janela recebem novas arestas.
+        """
+        recomendador = Recomendador(Grafo(), janela=2)
+        for codigo in ["A", "B", "C", "D"]:
+            recomendador.registrar_emprestimo("U1", codigo)
+        self.assertEqual(recomendador.grafo.peso("D", "C"), 1)
+        self.assertEqual(recomendador.grafo.peso("D", "B"), 1)
+        self.assertEqual(recomendador.grafo.peso("D", "A"), 0)
+
+    def test_desfazer_emprestimo(self):
+        """
+        Testa se desfazer_emprestimo, com o retorno de registrar_emprestimo,
+        restaura grafo e histórico quando o livro já estava no histórico e quando
+        a janela cheia descartou o mais antigo.
+        """
+        recomendador = Recomendador(Grafo(), janela=3)
+        for codigo in ["A", "B", "C"]:
+            recomendador.registrar_emprestimo("U1", codigo)
+        for id_usuario, codigo, esperado in [("U1", "B", (1, None)), ("U1", "D", (None, "A")),
+                                             ("U2", "A", (None, None))]:
+            grafo = {c: dict(v) for c, v in recomendador.grafo.livros.items()}
+            historicos = {i: list(h) for i, h in recomendador.historicos.items()}
+            delta = recomendador.registrar_emprestimo(id_usuario, codigo)
+            self.assertEqual(delta, esperado)
+            recomendador.desfazer_emprestimo(id_usuario, codigo, *delta)
+            self.assertEqual({c: v for c, v in recomendador.grafo.livros.items() if v or c in grafo},
+                             grafo)
+            self.assertEqual({i: list(h) for i, h in recomendador.historicos.items()}, historicos)
+
+
+class TestIndiceTextual(unittest.TestCase):
+    """
+    Classe de testes para o índice invertido de títulos e autores.
+    """
+
+    def setUp(self):
+        """
+        Configura um índice com alguns títulos em português.
+        """
+        self.indice = IndiceTextual()
+        for titulo, autor, codigo in [
+            ("Dom Casmurro", "Machado de Assis", "L002"),
+            ("O Cortiço", "Aluísio Azevedo", "L003"),
+            ("Memórias Póstumas de Brás Cubas", "Machado de Assis", "L006"),
+            ("Dom Quixote", "Miguel de Cervantes", "L007"),
+            ("Neuromancer", "William Gibson", "L005"),
+        ]:
+            self.indice.adicionar(codigo, titulo, autor)
+
+    def test_normalizacao(self):
+        """
+        Testa a remoção de acentos e de maiúsculas.
+        """
+        self.assertEqual(normalizar("O Cortiço"), "o cortico")
+        self.assertEqual(normalizar("MEMÓRIAS Póstumas"), "memorias postumas")
+
+    def test_prefixo_e_acentos(self):
+        """
+        Testa consultas parciais, sem acentos e com o último termo incompleto.
+        """
+        self.assertEqual(self.indice.buscar("dom casm"), ["L002"])
+        self.assertEqual(self.indice.buscar("cortico"), ["L003"])
+        self.assertEqual(self.indice.buscar("o cortiço"), ["L003"])
+        self.assertEqual(sorted(self.indice.buscar("dom")), ["L002", "L007"])
+        self.assertEqual(sorted(self.indice.buscar("machado")), ["L002", "L006"])
+        self.assertEqual(self.indice.buscar("bras cubas machado"), ["L006"])
+        self.assertEqual(self.indice.buscar("dom zzz"), [])
+        self.assertEqual(self.indice.buscar(""), [])
+        self.assertEqual(self.indice.completar("Mem"), ["memorias"])
+
+    def test_busca_aproximada(self):
+        """
+        Testa a tolerância a erros de digitação (1 erro, e 2 em termos longos).
+        """
+        self.assertEqual(self.indice.buscar("neuromancr"), ["L005"])
+        self.assertEqual(self.indice.buscar("casmuro dom"), ["L002"])
+        self.assertEqual(self.indice.buscar("nevromamcer"), ["L005"])
+        self.assertEqual(self.indice.buscar("nevromamcer", max_erros=1), [])
+        # Termos curtos não aceitam erros
+        self.assertEqual(self.indice.buscar("dam casmurro"), [])
+
+    def test_limite_e_remocao(self):
+        """
+        Testa o limite de resultados e a remoção de livros do índice.
+        """
+        self.assertEqual(len(self.indice.buscar("de", limite=2)), 2)
+        self.indice.remover("L002")
+        self.assertEqual(self.indice.buscar("casmurro"), [])
+        self.assertNotIn("casmurro", self.indice.vocabulario)
+        self.assertEqual(self.indice.buscar("dom"), ["L007"])
+        self.indice.adicionar("L002", "Dom Casmurro", "Machado de Assis")
+        self.assertEqual(self.indice.buscar("casmuro"), ["L002"])
+
+    def test_construcao_em_lote_igual_a_insercao(self):
+        """
+        Testa se construir() gera o mesmo índice que adicionar() livro a livro.
+        """
+        random.seed(3)
+        palavras = ["".join(random.choices("abcçé", k=random.randint(1, 6))) for _ in range(200)]
+        itens = [(f"L{i:03d}", " ".join(random.choices(palavras, k=3)), f"Autor {i % 7}") for i in range(300)]
+        em_lote = IndiceTextual.construir(itens)
+        avulso = IndiceTextual()
+        for codigo, titulo, autor in itens:
+            avulso.adicionar(codigo, titulo, autor)
+        self.assertEqual(em_lote.postings, avulso.postings)
+        self.assertEqual(em_lote.tokens, avulso.tokens)
+        self.assertEqual(em_lote.vocabulario, avulso.vocabulario)
+        self.assertEqual(em_lote.delecoes, avulso.delecoes)
+        for consulta in ["abc", "autor 3 ab", "cabacé", "aaaabbbb", "ççç"]:
+            self.assertEqual(em_lote.buscar(consulta), avulso.buscar(consulta))
+        em_lote.remover("L000")
+        avulso.remover("L000")
+        self.assertEqual(em_lote.delecoes, avulso.delecoes)
+        self.assertEqual(em_lote.buscar("aaaabbbbc"), avulso.buscar("aaaabbbbc"))
+
+
+class TestArvoreRadix(unittest.TestCase):
+    """
+    Classe de testes para a árvore radix de títulos (autocompletar).
+    """
+
+    def setUp(self):
+        """
+        Configura livros com prefixos em comum e um título repetido.
+        """
+        self.livros = [
+            Livro("Dom Casmurro", "Machado de Assis", "L002"),
+            Livro("Dom Quixote", "Miguel de Cervantes", "L007"),
+            Livro("Dom", "Autor Teste", "L010"),
+            Livro("Dom Casmurro", "Machado de Assis", "L011"),
+            Livro("O Cortiço", "Aluísio Azevedo", "L003"),
+            Livro("O Alienista", "Machado de Assis", "L008"),
+            Livro("1984", "George Orwell", "L001"),
+        ]
+        self.ordenados = sorted(self.livros, key=lambda l: (l.titulo, l.codigo))
+
+    def test_completar_em_ordem(self):
+        """
+        Testa se as completações saem em ordem alfabética e respeitam o limite k.
+        """
+        arvore = ArvoreRadix.construir(self.ordenados)
+        self.assertEqual(len(arvore), 7)
+        self.assertEqual(arvore.completar("Dom"), [
+            ("Dom", "L010"), ("Dom Casmurro", "L002"), ("Dom Casmurro", "L011"), ("Dom Quixote", "L007"),
+        ])
+        self.assertEqual(arvore.completar("Dom C", k=1), [("Dom Casmurro", "L002")])
+        self.assertEqual([t for t, _ in arvore.completar("O ")], ["O Alienista", "O Cortiço"])
+        self.assertEqual(arvore.completar("Do"), arvore.completar("Dom"))
+        self.assertEqual(arvore.completar("Dom X"), [])
+        self.assertEqual(arvore.completar("Dom Casmurros"), [])
+        self.assertEqual(len(arvore.completar("", k=100)), 7)
+
+    def test_construcao_em_lote_igual_a_insercao(self):
+        """
+        Testa se a construção a partir de títulos ordenados equivale a inserir um a um.
+        """
+        random.seed(7)
+        titulos = ["".join(random.choices("ab ", k=random.randint(1, 6))) for _ in range(300)]
+        livros = [Livro(t, "Autor", f"L{i:03d}") for i, t in enumerate(titulos)]
+        em_lote = ArvoreRadix.construir(sorted(livros, key=lambda l: l.titulo))
+        avulsa = ArvoreRadix()
+        for livro in livros:
+            avulsa.inserir(livro.titulo, livro.codigo)
+        for prefixo in ["", "a", "ab", "b a", " ", "bbb"]:
+            esperado = sorted((l.titulo, l.codigo) for l in livros if l.titulo.startswith(prefixo))
+            self.assertEqual(sorted(em_lote.completar(prefixo, 1000)), esperado)
+            self.assertEqual(sorted(avulsa.completar(prefixo, 1000)), esperado)
+            titulos_em_ordem = [t for t, _ in em_lote.completar(prefixo, 20)]
+            self.assertEqual(titulos_em_ordem, [t for t, _ in esperado[:20]])
+            self.assertEqual([t for t, _ in avulsa.completar(prefixo, 20)], titulos_em_ordem)
+
+    def test_entrada_fora_de_ordem(self):
+        """
+        Testa se a construção em lote rejeita livros fora de ordem.
+        """
+        with self.assertRaises(ValueError):
+            ArvoreRadix.construir(self.livros)
+
+    def test_remocao_recompacta(self):
+        """
+        Testa a remoção de títulos e a fusão das arestas que ficam com um só filho.
+        """
+        arvore = ArvoreRadix()
+        for livro in self.livros:
+            arvore.inserir(livro.titulo, livro.codigo)
+        self.assertTrue(arvore.remover("Dom Casmurro", "L011"))
+        self.assertTrue(arvore.remover("Dom", "L010"))
+        self.assertFalse(arvore.remover("Dom", "L010"))
+        self.assertFalse(arvore.remover("Dom Quixot", "L007"))
+        self.assertTrue(arvore.remover("Dom Casmurro", "L002"))
+        self.assertEqual(arvore.completar("Do"), [("Dom Quixote", "L007")])
+        # Após as remoções, "Dom Quixote" volta a ser uma única aresta a partir da raiz
+        self.assertEqual(arvore.raiz.filhos["D"].rotulo, "Dom Quixote")
+        self.assertEqual(len(arvore), 4)
+
+    def test_em_ordem_em_arvore_degenerada(self):
+        """
+        Testa se o percurso em ordem da BST (entrada da construção em lote) funciona
+        em uma árvore degenerada.
+        """
+        bst = BST()
+        titulos = [f"Título {i:05d}" for i in range(500)]
+        # Inserções em ordem degeneram a BST em uma lista encadeada
+        for titulo in titulos:
+            bst.inserir(Livro(titulo, "Autor", titulo))
+        arvore = ArvoreRadix.construir(bst.em_ordem())
+        self.assertEqual([t for t, _ in arvore.completar("Título 0049", 3)],
+                         ["Título 00490", "Título 00491", "Título 00492"])
+
+
+class TestPersistencia(unittest.TestCase):
+    """
+    Classe de testes para o snapshot binário do estado da biblioteca.
+    """
+
+    def test_salvar_e_carregar(self):
+        """
+        Testa se livros, usuários, BST, grafo, filas e históricos voltam iguais.
+        """
+        livros = [Livro(f"Título {i % 40:02d}", f"Autor {i % 7}", f"L{i:03d}") for i in range(100)]
+        random.seed(3)
+        random.shuffle(livros)
+        bst = BST()
+        for livro in livros:
+            bst.inserir(livro)
+        usuarios = {f"U{i}": Usuario(f"Usuário {i}", f"U{i}", docente=i % 3 == 0, em_atraso=i % 4 == 0)
+                    for i in range(20)}
+        grafo = Grafo()
+        recomendador = Recomendador(grafo, janela=5)
+        filas = {livro.codigo: FilaPrioridade() for livro in livros}
+        for _ in range(300):
+            usuario = usuarios[f"U{random.randrange(20)}"]
+            codigo = f"L{random.randrange(100):03d}"
+            recomendador.registrar_emprestimo(usuario.id, codigo)
+            if usuario not in filas[codigo]:
+                filas[codigo].enfileirar(usuario, prioridade_emprestimo(usuario))
+        filas["L000"].extrair()
+        # Usuário removido do cadastro (desfeito) mas ainda presente numa fila
+        filas["L001"].enfileirar(usuarios.pop("U19"), 2)
+
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "biblioteca.snap")
+            salvar(caminho, livros, usuarios, bst, grafo, filas, recomendador, lsn=42)
+            livros2, usuarios2, bst2, grafo2, filas2 = [], {"X": None}, BST(), Grafo(), {}
+            recomendador2 = Recomendador(grafo2, janela=5)
+            lsn = carregar(caminho, livros2, usuarios2, bst2, grafo2, filas2, recomendador2)
+
+        self.assertEqual(lsn, 42)
+        self.assertEqual([(l.titulo, l.autor, l.codigo) for l in livros2],
+                         [(l.titulo, l.autor, l.codigo) for l in livros])
+        self.assertEqual([l.codigo for l in bst2.em_ordem()], [l.codigo for l in bst.em_ordem()])
+        self.assertEqual(bst2.buscar("Título 07").titulo, "Título 07")
+        self.assertEqual({i: (u.nome, u.docente, u.em_atraso) for i, u in usuarios2.items()},
+                         {i: (u.nome, u.docente, u.em_atraso) for i, u in usuarios.items()})
+        self.assertEqual(grafo2.livros, grafo.livros)
+        for codigo, fila in filas.items():
+            self.assertEqual([(u.id, u.nome) for u in filas2[codigo].itens], [(u.id, u.nome) for u in fila.itens])
+            self.assertEqual(filas2[codigo].contador, fila.contador)
+        # As entradas da fila apontam para os mesmos objetos do cadastro
+        usuario = filas2["L001"].primeiro()
+        if usuario.id in usuarios2:
+            self.assertIs(usuario, usuarios2[usuario.id])
+        self.assertEqual({i: list(h) for i, h in recomendador2.historicos.items()},
+                         {i: list(h) for i, h in recomendador.historicos.items()})
+        self.assertEqual(grafo2.recomendar("L010", 5), grafo.recomendar("L010", 5))
+
+    def test_autor_none(self):
+        """
+        Testa se livros sem autor (None) voltam com None, distintos de autor "".
+        """
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "biblioteca.snap")
+            with Biblioteca(caminho) as biblioteca:
+                biblioteca.cadastrar_livro("Anônimo", None, "L001")
+                biblioteca.cadastrar_livro("Sem Nome", "", "L002")
+                biblioteca.cadastrar_livro("Dom Casmurro", "Machado de Assis", "L003")
+            with Biblioteca(caminho) as biblioteca:
+                self.assertEqual([(l.codigo, l.autor) for l in biblioteca.livros],
+                                 [("L001", None), ("L002", ""), ("L003", "Machado de Assis")])
+                self.assertEqual([l.codigo for l in biblioteca.buscar("anonimo").livros], ["L001"])
+
+    def test_bst_balanceada(self):
+        """
+        Testa se a BST montada a partir de dados ordenados tem altura logarítmica.
+        """
+        livros = [Livro(f"Título {i:05d}", "Autor", f"L{i}") for i in range(10000)]
+        bst = BST()
+        bst.construir_balanceada(livros)
+
+        def altura(nodo):
+            return 0 if nodo is None else 1 + max(altura(nodo.esq), altura(nodo.dir))
+        self.assertEqual(altura(bst.raiz), 14)
+        self.assertEqual(bst.em_ordem(), livros)
+        self.assertEqual(bst.buscar("Título 04321").codigo, "L4321")
+        self.assertIsNone(bst.buscar("Título 99999"))
+
+    def test_arquivo_invalido(self):
+        """
+        Testa se um arquivo que não é snapshot é rejeitado.
+        """
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "outro.bin")
+            with open(caminho, "wb") as arquivo:
+                arquivo.write(b"qualquer coisa")
+            with self.assertRaises(ValueError):
+                carregar(caminho, [], {}, BST(), Grafo(), {}, Recomendador(Grafo()))
+
+
+class TestLogEscrita(unittest.TestCase):
+    """
+    Classe de testes para o log de escrita antecipada (WAL).
+    """
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, "biblioteca.wal")
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_commit_em_grupo(self):
+        """
+        Testa se os registros são lidos de volta em ordem e gravados em grupos.
+        """
+        log = LogEscrita(self.caminho, max_grupo=10, max_atraso=60)
+        registros = [["emprestimo", f"U{i}", f"L{i % 7}"] for i in range(95)]
+        lsns = [log.registrar(r) for r in registros]
+        self.assertEqual(lsns, list(range(1, 96)))
+        self.assertEqual(log.confirmado, 90)
+        self.assertEqual(log.fsyncs, 9)
+        log.fechar()
+        self.assertEqual(log.fsyncs, 10)
+        self.assertEqual(list(ler(self.caminho)), list(zip(lsns, registros)))
+        self.assertEqual([lsn for lsn, _ in ler(self.caminho, apos_lsn=90)], [91, 92, 93, 94, 95])
+
+    def test_grupo_gravado_sem_novos_registros(self):
+        """
+        Testa se o último grupo vai para o disco em max_atraso mesmo com o log ocioso.
+        """
+        log = LogEscrita(self.caminho, max_atraso=0.02)
+        log.registrar(["devolucao", "L1"])
+        log.registrar(["devolucao", "L2"])
+        limite = time.monotonic() + 5
+        while log.confirmado < 2 and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertEqual(log.confirmado, 2)
+        self.assertEqual(log.fsyncs, 1)
+        self.assertEqual([r for _, r in ler(self.caminho)], [["devolucao", "L1"], ["devolucao", "L2"]])
+        log.fechar()
+        self.assertFalse(log.descarregador.is_alive())
+
+    def test_registro_incompleto_descartado(self):
+        """
+        Testa se um registro cortado por uma queda é descartado na reabertura.
+        """
+        log = LogEscrita(self.caminho)
+        for i in range(5):
+            log.registrar(["livro", f"Título {i}", "Autor", f"L{i}"])
+        log.fechar()
+        tamanho = os.path.getsize(self.caminho)
+        with open(self.caminho, "ab") as arquivo:
+            arquivo.write(b"\x06\x00\x00\x00\x00\x00\x00\x00\xff")
+        self.assertEqual(len(list(ler(self.caminho))), 5)
+
+        log = LogEscrita(self.caminho)
+        self.assertEqual(os.path.getsize(self.caminho), tamanho)
+        self.assertEqual(log.registrar(["usuario", "Ana", "U1", True]), 6)
+        log.fechar()
+        self.assertEqual(list(ler(self.caminho))[-1], (6, ["usuario", "Ana", "U1", True]))
+
+    def test_checkpoint(self):
+        """
+        Testa se após reiniciar (checkpoint) os números de sequência continuam.
+        """
+        log = LogEscrita(self.caminho)
+        for i in range(3):
+            log.registrar(["devolucao", f"L{i}"])
+        log.reiniciar()
+        log.fechar()
+        self.assertEqual(list(ler(self.caminho)), [])
+        log = LogEscrita(self.caminho, lsn_inicial=3)
+        self.assertEqual(log.registrar(["devolucao", "L9"]), 4)
+        log.fechar()
+
+    def test_escritores_concorrentes(self):
+        """
+        Testa se várias threads confirmando ao mesmo tempo compartilham os fsyncs.
+        """
+        log = LogEscrita(self.caminho, max_atraso=60)
+
+        def escrever(t):
+            for i in range(50):
+                log.confirmar(log.registrar(["emprestimo", f"U{t}", f"L{i}"]))
+        threads = [threading.Thread(target=escrever, args=(t,)) for t in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        log.fechar()
+        lidos = list(ler(self.caminho))
+        self.assertEqual([lsn for lsn, _ in lidos], list(range(1, 401)))
+        for t in range(8):
+            self.assertEqual([r[2] for _, r in lidos if r[1] == f"U{t}"], [f"L{i}" for i in range(50)])
+        self.assertLessEqual(log.fsyncs, 400)
+
+
+class TestCatalogoMapeado(unittest.TestCase):
+    """
+    Classe de testes para o catálogo somente leitura mapeado em memória.
+    """
+
+    def setUp(self):
+        """
+        Grava um catálogo com títulos repetidos e acentuados em um arquivo temporário.
+        """
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.pasta.name, "catalogo.cat")
+        self.livros = [Livro(f"Título {i:04d}", f"Autor {i % 9}", f"L{i:04d}") for i in range(2000)]
+        self.livros += [
+            Livro("O Cortiço", "Aluísio Azevedo", "L9003"),
+            Livro("Dom Casmurro", "Machado de Assis", "L9002"),
+            Livro("Dom Casmurro", "Machado de Assis", "L9011"),
+        ]
+        random.seed(5)
+        random.shuffle(self.livros)
+        gravar_catalogo(self.caminho, self.livros)
+        self.catalogo = CatalogoMapeado(self.caminho)
+
+    def tearDown(self):
+        self.catalogo.fechar()
+        self.pasta.cleanup()
+
+    def test_busca_por_titulo(self):
+        """
+        Testa a busca binária no índice de títulos e a busca por prefixo.
+        """
+        self.assertEqual(len(self.catalogo), 2003)
+        livro = self.catalogo.buscar("O Cortiço")
+        self.assertEqual((livro.autor, livro.codigo), ("Aluísio Azevedo", "L9003"))
+        self.assertEqual(self.catalogo.buscar("Título 1234").codigo, "L1234")
+        self.assertIsNone(self.catalogo.buscar("Inexistente"))
+        self.assertEqual(sorted(l.codigo for l in self.catalogo.com_prefixo("Dom")), ["L9002", "L9011"])
+        self.assertEqual([l.titulo for l in self.catalogo.com_prefixo("Título 19", k=3)],
+                         ["Título 1900", "Título 1901", "Título 1902"])
+        self.assertEqual(self.catalogo.com_prefixo("Z"), [])
+
+    def test_busca_por_codigo(self):
+        """
+        Testa o índice hash de códigos para todos os livros e para códigos ausentes.
+        """
+        for livro in self.livros:
+            self.assertEqual(self.catalogo.por_codigo(livro.codigo).titulo, livro.titulo)
+        self.assertIsNone(self.catalogo.por_codigo("L5555"))
+        self.assertIsNone(self.catalogo.por_codigo(""))
+
+    def test_em_ordem(self):
+        """
+        Testa se o percurso segue a ordem dos títulos.
+        """
+        titulos = [livro.titulo for livro in self.catalogo.em_ordem()]
+        self.assertEqual(titulos, sorted(livro.titulo for livro in self.livros))
+
+    def test_arquivo_invalido(self):
+        """
+        Testa se um arquivo que não é catálogo é rejeitado.
+        """
+        caminho = os.path.join(self.pasta.name, "outro.bin")
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(b"x" * 100)
+        with self.assertRaises(ValueError):
+            CatalogoMapeado(caminho)
+
+
+class TestServicoBiblioteca(unittest.TestCase):
+    """
+    Classe de testes para a fachada Biblioteca (camada de serviço).
+    """
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.snapshot = os.path.join(self.pasta.name, "biblioteca.snap")
+        self.wal = os.path.join(self.pasta.name, "biblioteca.wal")
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def popular(self, biblioteca):
+        for titulo, autor, codigo in [
+            ("1984", "George Orwell", "L001"),
+            ("Dom Casmurro", "Machado de Assis", "L002"),
+            ("Dom Quixote", "Miguel de Cervantes", "L003"),
+            ("O Cortiço", "Aluísio Azevedo", "L004"),
+        ]:
+            self.assertTrue(biblioteca.cadastrar_livro(titulo, autor, codigo).ok)
+        self.assertTrue(biblioteca.cadastrar_usuario("Ana", "U1").ok)
+        self.assertTrue(biblioteca.cadastrar_usuario("Carlos", "U2", docente=True).ok)
+        for id_usuario, codigo in [("U1", "L001"), ("U2", "L001"), ("U1", "L002"), ("U2", "L003")]:
+            self.assertTrue(biblioteca.emprestar(id_usuario, codigo).ok)
+
+    def test_operacoes(self):
+        """
+        Testa cadastros, buscas, empréstimos, devoluções e recomendações.
+        """
+        biblioteca = Biblioteca()
+        self.popular(biblioteca)
+        self.assertFalse(biblioteca.cadastrar_livro("Outro", "Autor", "L001").ok)
+        self.assertFalse(biblioteca.cadastrar_usuario("Outra", "U1").ok)
+        self.assertFalse(biblioteca.emprestar("U1", "L001").ok)
+        self.assertFalse(biblioteca.emprestar("U9", "L001").ok)
+
+        resultado = biblioteca.buscar("1984")
+        self.assertTrue(resultado.exato)
+        self.assertEqual([l.codigo for l in resultado.livros], ["L001"])
+        resultado = biblioteca.buscar("Dom")
+        self.assertFalse(resultado.exato)
+        self.assertEqual([l.codigo for l in resultado.livros], ["L002", "L003"])
+        self.assertEqual([l.codigo for l in biblioteca.buscar("cortico").livros], ["L004"])
+        self.assertFalse(biblioteca.buscar("inexistente").ok)
+
+        self.assertEqual([u.id for u in biblioteca.fila("L001")], ["U2", "U1"])
+        devolucao = biblioteca.devolver("L001")
+        self.assertTrue(devolucao.ok)
+        self.assertEqual(devolucao.usuario.id, "U2")
+        self.assertFalse(biblioteca.devolver("L004").ok)
+        # L003 está a dois saltos de L002 (via L001)
+        self.assertEqual([l.codigo for l in biblioteca.recomendar("L002", 2)], ["L001", "L003"])
+        self.assertEqual([l.titulo for l in biblioteca.listar_livros()],
+                         ["1984", "Dom Casmurro", "Dom Quixote", "O Cortiço"])
+
+    def test_desfazer(self):
+        """
+        Testa se desfazer reverte as operações na ordem inversa.
+        """
+        biblioteca = Biblioteca()
+        self.popular(biblioteca)
+        biblioteca.devolver("L001")
+        self.assertEqual(biblioteca.desfazer().acao, "devolucao")
+        self.assertEqual([u.id for u in biblioteca.fila("L001")], ["U2", "U1"])
+        self.assertEqual(biblioteca.desfazer().acao, "emprestimo")
+        self.assertEqual(biblioteca.fila("L003"), [])
+        for _ in range(3):
+            biblioteca.desfazer()
+        self.assertEqual(biblioteca.desfazer().acao, "usuario")
+        self.assertEqual(biblioteca.desfazer().acao, "usuario")
+        resultado = biblioteca.desfazer()
+        self.assertEqual((resultado.ok, resultado.acao), (True, "livro"))
+        self.assertIsNone(biblioteca.livro("L004"))
+        self.assertFalse(biblioteca.buscar("O Cortiço").ok)
+        self.assertEqual(len(biblioteca.listar_livros()), 3)
+        for _ in range(3):
+            biblioteca.desfazer()
+        self.assertFalse(biblioteca.desfazer().ok)
+
+    def test_desfazer_emprestimo_reverte_recomendacoes(self):
+        """
+        Testa que desfazer um empréstimo remove as arestas que ele criou no grafo
+        de recomendações e restaura o histórico do usuário, também ao repetir o log.
+        """
+        biblioteca = Biblioteca(self.snapshot, self.wal)
+        self.popular(biblioteca)
+        historico_antes = list(biblioteca.recomendador.historicos["U1"])
+        self.assertTrue(biblioteca.emprestar("U1", "L004").ok)
+        self.assertEqual(biblioteca.grafo.peso("L004", "L001"), 1)
+        self.assertIn("L004", [l.codigo for l in biblioteca.recomendar("L002")])
+
+        self.assertEqual(biblioteca.desfazer().acao, "emprestimo")
+        self.assertEqual(biblioteca.grafo.peso("L004", "L001"), 0)
+        self.assertEqual(biblioteca.grafo.peso("L004", "L002"), 0)
+        self.assertNotIn("L004", [l.codigo for l in biblioteca.recomendar("L002")])
+        self.assertEqual(list(biblioteca.recomendador.historicos["U1"]), historico_antes)
+        # Arestas que existiam antes do empréstimo desfeito continuam
+        self.assertEqual(biblioteca.grafo.peso("L001", "L002"), 1)
+        biblioteca.wal.confirmar()
+
+        recuperada = Biblioteca(self.snapshot, self.wal)
+        self.assertEqual(recuperada.grafo.livros, biblioteca.grafo.livros)
+        self.assertEqual(recuperada.recomendador.historicos, biblioteca.recomendador.historicos)
+        recuperada.fechar()
+
+    def test_recuperacao_apos_queda(self):
+        """
+        Testa se o estado é reconstruído do snapshot e do log quando o processo
+        termina sem fechar a biblioteca, inclusive desfazendo ações anteriores
+        ao último checkpoint.
+        """
+        biblioteca = Biblioteca(self.snapshot, self.wal, checkpoint_a_cada=5)
+        self.popular(biblioteca)
+        biblioteca.devolver("L001")
+        self.assertTrue(os.path.exists(self.snapshot))
+        biblioteca.desfazer()
+        biblioteca.desfazer()
+        biblioteca.wal.confirmar()
+        # Sem fechar(): simula uma queda
+        recuperada = Biblioteca(self.snapshot, self.wal, checkpoint_a_cada=5)
+        self.assertGreater(recuperada.recuperados, 0)
+        for codigo in ("L001", "L002", "L003", "L004"):
+            self.assertEqual([u.id for u in recuperada.fila(codigo)], [u.id for u in biblioteca.fila(codigo)])
+        self.assertEqual(sorted(recuperada.usuarios), ["U1", "U2"])
+        self.assertEqual([l.codigo for l in recuperada.buscar("Dom").livros], ["L002", "L003"])
+        self.assertEqual(recuperada.grafo.livros, biblioteca.grafo.livros)
+        self.assertEqual(recuperada.recomendador.historicos, biblioteca.recomendador.historicos)
+        recuperada.fechar()
+
+        reaberta = Biblioteca(self.snapshot, self.wal)
+        self.assertEqual(reaberta.recuperados, 0)
+        self.assertEqual([u.id for u in reaberta.fila("L001")], ["U2", "U1"])
+        reaberta.fechar()
+
+
+class TestServidor(unittest.IsolatedAsyncioTestCase):
+    """
+    Classe de testes para o servidor HTTP/JSON, contra localhost.
+    """
+
+    async def asyncSetUp(self):
+        self.biblioteca = Biblioteca()
+        for titulo, autor, codigo in [
+            ("1984", "George Orwell", "L001"),
+            ("Dom Casmurro", "Machado de Assis", "L002"),
+            ("Dom Quixote", "Miguel de Cervantes", "L003"),
+        ]:
+            self.biblioteca.cadastrar_livro(titulo, autor, codigo)
+        self.biblioteca.cadastrar_usuario("Ana", "U1")
+        self.biblioteca.cadastrar_usuario("Carlos", "U2", docente=True)
+        self.servidor = await ServidorBiblioteca(self.biblioteca, porta=0).iniciar()
+
+    async def asyncTearDown(self):
+        await self.servidor.parar()
+
+    async def get(self, caminho):
+        return await requisitar(self.servidor.host, self.servidor.porta, "GET", caminho)
+
+    async def test_consultas(self):
+        """
+        Testa as rotas de consulta e as respostas de erro.
+        """
+        status, dados = await self.get("/livros/L002")
+        self.assertEqual(status, 200)
+        self.assertEqual(dados, {"titulo": "Dom Casmurro", "autor": "Machado de Assis", "codigo": "L002"})
+        status, dados = await self.get("/usuarios/U2")
+        self.assertEqual((status, dados["nome"], dados["docente"]), (200, "Carlos", True))
+
+        status, dados = await self.get("/buscar?titulo=Dom%20Quixote")
+        self.assertTrue(dados["exato"])
+        self.assertEqual([l["codigo"] for l in dados["livros"]], ["L003"])
+        status, dados = await self.get("/buscar?titulo=Dom&limite=1")
+        self.assertFalse(dados["exato"])
+        self.assertEqual(len(dados["livros"]), 1)
+
+        self.assertEqual((await self.get("/livros/L999"))[0], 404)
+        self.assertEqual((await self.get("/inexistente"))[0], 404)
+        status, _ = await requisitar(self.servidor.host, self.servidor.porta, "DELETE", "/livros/L001")
+        self.assertEqual(status, 405)
+
+    async def test_alteracoes(self):
+        """
+        Testa empréstimo, devolução, desfazer e recomendação pela rede.
+        """
+        host, porta = self.servidor.host, self.servidor.porta
+        for id_usuario, codigo in [("U1", "L001"), ("U1", "L002"), ("U2", "L001")]:
+            status, dados = await requisitar(host, porta, "POST", "/emprestimos",
+                                             {"usuario": id_usuario, "livro": codigo})
+            self.assertEqual(status, 201)
+            self.assertTrue(dados["ok"])
+        status, _ = await requisitar(host, porta, "POST", "/emprestimos", {"usuario": "U1", "livro": "L001"})
+        self.assertEqual(status, 409)
+
+        _, dados = await self.get("/recomendar/L001")
+        self.assertEqual([l["codigo"] for l in dados["livros"]], ["L002"])
+
+        # O docente (U2) tem prioridade na fila de L001
+        status, dados = await requisitar(host, porta, "POST", "/devolucoes", {"livro": "L001"})
+        self.assertEqual((status, dados["usuario"]["id"]), (200, "U2"))
+        status, dados = await requisitar(host, porta, "POST", "/desfazer")
+        self.assertTrue(dados["ok"])
+        self.assertEqual(len(self.biblioteca.fila("L001")), 2)
+
+        status, _ = await requisitar(host, porta, "POST", "/devolucoes", {"livro": "L003"})
+        self.assertEqual(status, 409)
+
+    async def test_alteracoes_com_commit_em_grupo(self):
+        """
+        Testa que, com log, as alterações simultâneas são respondidas só depois
+        de gravadas e compartilham o fsync, feito fora do event loop.
+        """
+        with tempfile.TemporaryDirectory() as pasta:
+            biblioteca = Biblioteca(arquivo_wal=os.path.join(pasta, "biblioteca.wal"))
+            for i in range(10):
+                biblioteca.cadastrar_usuario(f"Usuário {i}", f"U{i}")
+            biblioteca.cadastrar_livro("1984", "George Orwell", "L001")
+            servidor = await ServidorBiblioteca(biblioteca, porta=0).iniciar()
+            try:
+                self.assertFalse(biblioteca.confirmar_cada_operacao)
+                fsyncs = biblioteca.wal.fsyncs
+                thread_do_loop = threading.get_ident()
+                threads = []
+                original = biblioteca.wal.confirmar
+                biblioteca.wal.confirmar = lambda lsn=None: threads.append(threading.get_ident()) or original(lsn)
+
+                conexoes = [await asyncio.open_connection(servidor.host, servidor.porta) for _ in range(10)]
+                for i, (_, writer) in enumerate(conexoes):
+                    corpo = f'{{"usuario": "U{i}", "livro": "L001"}}'.encode()
+                    writer.write(b"POST /emprestimos HTTP/1.1\r\nConnection: close\r\n"
+                                 + f"Content-Length: {len(corpo)}\r\n\r\n".encode() + corpo)
+                respostas = await asyncio.gather(*(reader.read() for reader, _ in conexoes))
+                for _, writer in conexoes:
+                    writer.close()
+
+                self.assertTrue(all(r.startswith(b"HTTP/1.1 201") for r in respostas))
+                self.assertEqual(biblioteca.wal.confirmado, biblioteca.wal.ultimo_lsn)
+                self.assertLess(biblioteca.wal.fsyncs - fsyncs, 10)
+                self.assertTrue(threads)
+                self.assertNotIn(thread_do_loop, threads)
+            finally:
+                await servidor.parar()
+                biblioteca.fechar()
+
+    async def test_consultas_durante_checkpoint(self):
+        """
+        Testa que o checkpoint automático roda fora do event loop: as consultas
+        continuam sendo respondidas e as alterações esperam ele terminar.
+        """
+        with tempfile.TemporaryDirectory() as pasta:
+            biblioteca = Biblioteca(os.path.join(pasta, "biblioteca.snap"),
+                                    os.path.join(pasta, "biblioteca.wal"), checkpoint_a_cada=5)
+            biblioteca.cadastrar_livro("1984", "George Orwell", "L001")
+            for i in range(3):
+                biblioteca.cadastrar_usuario(f"Usuário {i}", f"U{i}")
+            iniciado, liberado = threading.Event(), threading.Event()
+            original = biblioteca.checkpoint
+
+            def checkpoint_lento():
+                iniciado.set()
+                liberado.wait(10)
+                original()
+            biblioteca.checkpoint = checkpoint_lento
+            servidor = await ServidorBiblioteca(biblioteca, porta=0).iniciar()
+            host, porta = servidor.host, servidor.porta
+            try:
+                status, _ = await requisitar(host, porta, "POST", "/emprestimos", {"usuario": "U0", "livro": "L001"})
+                self.assertEqual(status, 201)
+                await asyncio.get_running_loop().run_in_executor(None, iniciado.wait, 10)
+                self.assertIsNotNone(servidor.checkpoint)
+
+                alteracao = asyncio.ensure_future(
+                    requisitar(host, porta, "POST", "/emprestimos", {"usuario": "U1", "livro": "L001"}))
+                for _ in range(5):
+                    status, dados = await requisitar(host, porta, "GET", "/livros/L001")
+                    self.assertEqual((status, dados["codigo"]), (200, "L001"))
+                self.assertFalse(alteracao.done())
+                self.assertEqual([u.id for u in biblioteca.fila("L001")], ["U0"])
+
+                liberado.set()
+                self.assertEqual((await alteracao)[0], 201)
+                self.assertEqual([u.id for u in biblioteca.fila("L001")], ["U0", "U1"])
+                self.assertEqual(servidor.metricas()["checkpoints"], 1)
+                # O snapshot tem as 5 primeiras operações; o log, só a feita depois
+                self.assertEqual(biblioteca.lsn_snapshot, 5)
+                self.assertEqual([lsn for lsn, _ in ler(os.path.join(pasta, "biblioteca.wal"))], [6])
+            finally:
+                liberado.set()
+                await servidor.parar()
+                self.assertEqual(biblioteca.checkpoint_a_cada, 5)
+                biblioteca.fechar()
+
+    async def test_requisicao_invalida(self):
+        """
+        Testa JSON inválido, corpo que não é um objeto e linha de requisição
+        malformada.
+        """
+        reader, writer = await asyncio.open_connection(self.servidor.host, self.servidor.porta)
+        writer.write(b"POST /emprestimos HTTP/1.1\r\nContent-Length: 3\r\n\r\n{{{")
+        self.assertIn(b"400", await reader.readline())
+        writer.close()
+        reader, writer = await asyncio.open_connection(self.servidor.host, self.servidor.porta)
+        writer.write(b"lixo\r\n\r\n")
+        self.assertIn(b"400", await reader.readline())
+        writer.close()
+        for corpo in ([], "x", 3, None):
+            status, dados = await requisitar(self.servidor.host, self.servidor.porta, "POST", "/emprestimos", corpo)
+            self.assertEqual(status, 400 if corpo is not None else 409, corpo)
+
+    async def test_corpo_grande_demais(self):
+        """
+        Testa que um corpo acima de MAX_CORPO é recusado com 413 sem ser lido.
+        """
+        reader, writer = await asyncio.open_connection(self.servidor.host, self.servidor.porta)
+        writer.write(f"POST /emprestimos HTTP/1.1\r\nContent-Length: {10 ** 12}\r\n\r\n".encode())
+        self.assertIn(b"413", await reader.readline())
+        writer.close()
+        status, _ = await requisitar(self.servidor.host, self.servidor.porta, "POST", "/emprestimos",
+                                     {"usuario": "x" * MAX_CORPO})
+        self.assertEqual(status, 413)
+
+    async def test_coalescencia_e_lote(self):
+        """
+        Testa que consultas simultâneas são processadas em lote e que as idênticas
+        executam uma única vez.
+        """
+        chamadas = []
+        original = self.biblioteca.buscar
+        self.biblioteca.buscar = lambda *args: chamadas.append(args) or original(*args)
+
+        # Conexões já abertas: as requisições chegam ao servidor no mesmo ciclo
+        conexoes = [await asyncio.open_connection(self.servidor.host, self.servidor.porta) for _ in range(20)]
+        lotes = self.servidor.estatisticas["lotes"]
+        for i, (_, writer) in enumerate(conexoes):
+            caminho = "/buscar?titulo=Dom" if i % 2 else f"/livros/L00{i % 3 + 1}"
+            writer.write(f"GET {caminho} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+        respostas = await asyncio.gather(*(reader.read() for reader, _ in conexoes))
+        for _, writer in conexoes:
+            writer.close()
+
+        self.assertTrue(all(r.startswith(b"HTTP/1.1 200") for r in respostas))
+        self.assertEqual(len(chamadas), 1)
+        self.assertEqual(self.servidor.estatisticas["coalescidas"], 16)  # 20 - 1 busca - 3 livros
+        self.assertLess(self.servidor.estatisticas["lotes"] - lotes, 20)
+
+    async def test_metricas_e_carga(self):
+        """
+        Testa o gerador de carga e os percentis de latência em /metricas.
+        """
+        caminhos = ["/livros/L001", "/usuarios/U1", "/buscar?titulo=Dom"]
+        carga = await gerar_carga(self.servidor.host, self.servidor.porta, caminhos, conexoes=5, total=200)
+        self.assertEqual((carga["requisicoes"], carga["erros"]), (200, 0))
+        self.assertGreater(carga["req_s"], 0)
+        self.assertLessEqual(carga["p50"], carga["p99"])
+
+        _, metricas = await self.get("/metricas")
+        self.assertEqual(metricas["requisicoes"], 200)
+        self.assertEqual(sum(r["n"] for r in metricas["latencias_ms"].values()), 200)
+        for rota in ("GET /livros", "GET /usuarios", "GET /buscar"):
+            latencias = metricas["latencias_ms"][rota]
+            self.assertLessEqual(latencias["p50"], latencias["p90"])
+            self.assertLessEqual(latencias["p90"], latencias["p99"])
+
+    def test_percentis(self):
+        """
+        Testa o cálculo de percentis por posição na amostra ordenada.
+        """
+        self.assertEqual(percentis(range(100, 0, -1)), {"p50": 51, "p90": 91, "p99": 100})
+        self.assertEqual(percentis([7]), {"p50": 7, "p90": 7, "p99": 7})
+        self.assertEqual(percentis([]), {})
+
+
+class TestFilaPrioridade(unittest.TestCase):
+    """
+    Classe de testes para a fila de empréstimo com prioridade.
+    """
+
+    def setUp(self):
+        """
+        Configura os usuários para os testes.
+        """
+        self.aluno = Usuario("Ana", "U001")
+        self.docente = Usuario("Carlos", "U002", docente=True)
+        self.atrasado = Usuario("Maria", "U003", em_atraso=True)
+        self.aluno2 = Usuario("João", "U004")
+
+    def test_prioridade_e_desempate_estavel(self):
+        """
+        Testa se docentes saem primeiro e se empates respeitam a ordem de chegada.
+        """
+        fila = FilaPrioridade()
+        for usuario in [self.atrasado, self.aluno, self.docente, self.aluno2]:
+            fila.enfileirar(usuario, prioridade_emprestimo(usuario))
+
+        self.assertEqual(fila.itens, [self.docente, self.aluno, self.aluno2, self.atrasado])
+        ordem = [fila.desenfileirar() for _ in range(4)]
+        self.assertEqual(ordem, [self.docente, self.aluno, self.aluno2, self.atrasado])
+        self.assertTrue(fila.vazio())
+        self.assertIsNone(fila.desenfileirar())
+
+    def test_alterar_prioridade_e_cancelar(self):
+        """
+        Testa a alteração de prioridade e o cancelamento via índice de posições.
+        """
+        fila = FilaPrioridade()
+        for usuario in [self.aluno, self.aluno2, self.atrasado]:
+            fila.enfileirar(usuario, prioridade_emprestimo(usuario))
+
+        self.assertTrue(fila.alterar_prioridade(self.atrasado, 0))
+        self.assertEqual(fila.primeiro(), self.atrasado)
+
+        self.assertTrue(fila.cancelar(self.aluno))
+        self.assertFalse(fila.cancelar(self.aluno))
+        self.assertNotIn(self.aluno, fila)
+        self.assertEqual(fila.itens, [self.atrasado, self.aluno2])
+
+        with self.assertRaises(ValueError):
+            fila.enfileirar(self.aluno2)
+
+    def test_extrair_e_reinserir(self):
+        """
+        Testa se uma entrada extraída volta exatamente para a mesma posição.
+        """
+        fila = FilaPrioridade()
+        for usuario in [self.aluno, self.aluno2, self.docente]:
+            fila.enfileirar(usuario, prioridade_emprestimo(usuario))
+
+        usuario, prioridade, ordem = fila.extrair()
+        self.assertEqual(usuario, self.docente)
+        fila.reinserir(usuario, prioridade, ordem)
+        self.assertEqual(fila.itens, [self.docente, self.aluno, self.aluno2])
+
+    def test_invariante_heap_aleatorio(self):
+        """
+        Compara a fila com uma ordenação de referência após operações aleatórias.
+        """
+        random.seed(42)
+        fila = FilaPrioridade()
+        referencia = {}
+        for i in range(300):
+            item = f"U{i}"
+            prioridade = random.randint(0, 5)
+            fila.enfileirar(item, prioridade)
+            referencia[item] = (prioridade, i)
+        for item in random.sample(list(referencia), 100):
+            fila.cancelar(item)
+            del referencia[item]
+        for item in random.sample(list(referencia), 50):
+            nova = random.randint(0, 5)
+            fila.alterar_prioridade(item, nova)
+            referencia[item] = (nova, referencia[item][1])
+
+        esperado = sorted(referencia, key=referencia.get)
+        self.assertEqual([fila.desenfileirar() for _ in range(len(fila))], esperado)
+
+
+class TestPilhaLimitada(unittest.TestCase):
+    """
+    Classe de testes para o histórico limitado da Pilha.
+    """
+
+    def test_sem_limite(self):
+        """
+        Testa se a Pilha sem limite mantém o comportamento original.
+        """
+        pilha = Pilha()
+        for i in range(100):
+            pilha.empilhar(("livro", f"L{i}"))
+        self.assertEqual(len(pilha), 100)
+        self.assertEqual(pilha.topo(), ("livro", "L99"))
+        self.assertEqual(pilha.desempilhar(), ("livro", "L99"))
+
+    def test_buffer_circular_descarta_antigos(self):
+        """
+        Testa se, sem arquivo de log, os registros mais antigos são descartados.
+        """
+        pilha = Pilha(max_itens=3)
+        for i in range(10):
+            pilha.empilhar(("usuario", f"U{i}"))
+        self.assertEqual(len(pilha), 3)
+        self.assertEqual([pilha.desempilhar() for _ in range(4)],
+                         [("usuario", "U9"), ("usuario", "U8"), ("usuario", "U7"), None])
+        self.assertTrue(pilha.vazio())
+
+    def test_registros_antigos_vao_para_o_disco(self):
+        """
+        Testa se os registros excedentes são gravados em disco e lidos de volta em ordem.
+        """
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = os.path.join(pasta, "historico.log")
+            pilha = Pilha(max_itens=4, arquivo_log=caminho)
+            registros = [("devolucao", f"U{i}", "L001", i % 3, i) for i in range(50)]
+            for registro in registros:
+                pilha.empilhar(registro)
+
+            self.assertEqual(len(pilha.itens), 4)
+            self.assertEqual(len(pilha), 50)
+            self.assertTrue(os.path.exists(caminho))
+
+            desfeitos = []
+            while not pilha.vazio():
+                self.assertEqual(pilha.topo(), registros[len(registros) - 1 - len(desfeitos)])
+                desfeitos.append(pilha.desempilhar())
+            self.assertEqual(desfeitos, registros[::-1])
+            self.assertEqual(os.path.getsize(caminho), 0)
+
+            pilha.fechar()
+            self.assertFalse(os.path.exists(caminho))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,9 @@ algoritmos de busca implementados no módulo search_algorithms.py.
 import unittest
 import time
 import random
+from math import log2
 from search.search_algorithms import busca_sequencial, busca_binaria, busca_binaria_recursiva
+from sort.instrumentation import medir_operacoes
 
 
 class TestAlgoritmosBusca(unittest.TestCase):
@@ -138,5 +140,30 @@ class TestAlgoritmosBusca(unittest.TestCase):
         self.assertEqual(busca_binaria_recursiva([1], 5), -1)
 
 
+class TestContagemBusca(unittest.TestCase):
+    """
+    Classe de testes que confere as comparações feitas pelas buscas contra a
+    complexidade documentada.
+    """
+    
+    def test_comparacoes(self):
+        """
+        Testa que a busca sequencial faz no máximo n comparações e as binárias
+        no máximo 2(log n + 1), sem recursão além de log n na versão recursiva.
+        """
+        n = 1000
+        lista = list(range(0, 2 * n, 2))
+        for item in (0, 998, 1998, 1999, -1):
+            _, relatorio = medir_operacoes(busca_sequencial, lista, item, memoria=False)
+            self.assertLessEqual(relatorio.comparacoes, n)
+            for busca in (busca_binaria, busca_binaria_recursiva):
+                resultado, relatorio = medir_operacoes(busca, lista, item, memoria=False)
+                self.assertEqual(resultado, lista.index(item) if item in lista else -1)
+                self.assertLessEqual(relatorio.comparacoes, 2 * (int(log2(n)) + 1), busca.__name__)
+                self.assertLessEqual(relatorio.profundidade_maxima, int(log2(n)) + 2, busca.__name__)
+        _, relatorio = medir_operacoes(busca_sequencial, lista, -1, memoria=False)
+        self.assertEqual(relatorio.comparacoes, n)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -6,17 +6,40 @@ algoritmos de ordenação implementados nos módulos:
 - simple_sorts.py (Selection Sort e Bubble Sort)
 - insertion_sorts.py (Insertion Sort e Shell Sort)
 - divide_and_conquer_sorts.py (Merge Sort e Quick Sort)
+- adaptive_sort.py (ordenação adaptativa)
+- parallel_sorts.py (Merge Sort em vários processos)
+- external_sort.py (ordenação externa, em arquivos)
+- kway_merge.py (mescla de k vias)
+- partial_sorts.py (seleção e ordenação parcial)
+- radix_sorts.py (Counting Sort e Radix Sort)
 """
 
 import unittest
 import time
 import random
 import copy
+import sys
+import os
+import tempfile
+from enum import IntEnum
+from math import log2
 
 # Importação dos algoritmos de ordenação
 from sort.simple_sorts import selection_sort, bubble_sort, bubble_sort_otimizado
 from sort.insertion_sorts import insertion_sort, shell_sort, insertion_sort_binario
-from sort.divide_and_conquer_sorts import merge_sort, quick_sort, quick_sort_mediana_de_tres
+from sort.divide_and_conquer_sorts import merge_sort, merge_sort_in_place, quick_sort, quick_sort_mediana_de_tres
+from sort.adaptive_sort import caracterizar, escolher, ordenar
+from sort.parallel_sorts import merge_sort_paralelo
+from sort.external_sort import ordenar_arquivo, ordenar_externo
+from sort.kway_merge import mesclar_k
+from sort.partial_sorts import k_esimo, selecionar_k_menores, sort_parcial
+from sort.radix_sorts import counting_sort, radix_sort_lsd, radix_sort_msd
+
+# Geradores de entradas de pior caso
+from benchmarks.geradores import CHAVE_LIVRO, FORMATOS, gerar_lista
+
+# Contagem de operações
+from sort.instrumentation import medir_operacoes, registrar_decisao, tabela
 
 
 class TestAlgoritmosOrdenacao(unittest.TestCase):
@@ -162,6 +185,18 @@ class TestAlgoritmosOrdenacao(unittest.TestCase):
         # Para a maioria dos casos, o Quick Sort com mediana de três é mais
         # eficiente para listas já ordenadas, mas não garantimos isso no teste
     
+    def test_merge_sort_com_key(self):
+        """
+        Testa o Merge Sort com função de chave, incluindo a estabilidade.
+        """
+        pares = [(3, "a"), (1, "b"), (3, "c"), (2, "d"), (1, "e")]
+        self.assertEqual(merge_sort(pares, key=lambda p: p[0]),
+                         [(1, "b"), (1, "e"), (2, "d"), (3, "a"), (3, "c")])
+        
+        # Também funciona com sequências que não são listas (ex.: range de índices)
+        valores = [30, 10, 20]
+        self.assertEqual(merge_sort(range(3), key=valores.__getitem__), [1, 2, 0])
+    
     def test_caso_de_borda(self):
         """
         Testa casos de borda, como listas vazias ou com um único elemento.
@@ -212,5 +247,619 @@ class TestAlgoritmosOrdenacao(unittest.TestCase):
                         print(f"{algo.ljust(20)}: {tempo:.6f} segundos")
 
 
+class TestPioresCasos(unittest.TestCase):
+    """
+    Classe de testes para os algoritmos de ordenação nas entradas que expõem o
+    pior caso de cada um (ver benchmarks/geradores.py).
+    """
+    
+    algoritmos = {
+        "selection": selection_sort,
+        "bubble": bubble_sort,
+        "bubble_otimizado": bubble_sort_otimizado,
+        "insertion": insertion_sort,
+        "shell": shell_sort,
+        "insertion_binario": insertion_sort_binario,
+        "merge": merge_sort,
+        "quick": quick_sort,
+        "quick_mediana": quick_sort_mediana_de_tres
+    }
+    
+    def test_todos_os_formatos_e_tipos(self):
+        """
+        Testa cada algoritmo em cada formato de entrada, com inteiros, floats e strings.
+        """
+        for formato in FORMATOS:
+            for tipo in ("int", "float", "str"):
+                lista = gerar_lista(formato, 200, tipo)
+                esperado = sorted(lista)
+                for nome, func in self.algoritmos.items():
+                    self.assertEqual(func(lista[:]), esperado, f"{nome} em {formato} ({tipo})")
+    
+    def test_registros_livro(self):
+        """
+        Testa a ordenação de registros Livro por título, com títulos repetidos:
+        o Merge Sort mantém a ordem de entrada entre títulos iguais.
+        """
+        livros = gerar_lista("poucos_unicos", 500, "livro")
+        ordenados = merge_sort(livros, key=CHAVE_LIVRO)
+        self.assertEqual(ordenados, sorted(livros, key=CHAVE_LIVRO))
+        codigos = [int(livro.codigo[1:]) for livro in ordenados]
+        for anterior, atual, livro_anterior, livro in zip(codigos, codigos[1:], ordenados, ordenados[1:]):
+            if livro_anterior.titulo == livro.titulo:
+                self.assertLess(anterior, atual)
+    
+    def test_merge_sort_in_place_sem_buffer(self):
+        """
+        Testa o Merge Sort in-place sem buffer em todos os formatos, a
+        estabilidade (chaves iguais, elementos distinguíveis) e que o pico de
+        memória fica bem abaixo do da mescla com cópia das metades.
+        """
+        for formato in FORMATOS:
+            for n in (0, 1, 2, 3, 50, 2000):
+                lista = gerar_lista(formato, n)
+                copia = lista[:]
+                merge_sort_in_place(copia, sem_buffer=True)
+                self.assertEqual(copia, sorted(lista), f"{formato} ({n})")
+        
+        class Registro:
+            def __init__(self, chave, posicao):
+                self.chave = chave
+                self.posicao = posicao
+            
+            def __lt__(self, outro):
+                return self.chave < outro.chave
+            
+            def __le__(self, outro):
+                return self.chave <= outro.chave
+        
+        for formato in ("aleatoria", "poucos_unicos", "dente_de_serra", "inversa"):
+            registros = [Registro(v % 17, i) for i, v in enumerate(gerar_lista(formato, 3000))]
+            merge_sort_in_place(registros, sem_buffer=True)
+            self.assertEqual([(r.chave, r.posicao) for r in registros],
+                             sorted((r.chave, r.posicao) for r in registros), formato)
+        
+        lista = gerar_lista("aleatoria", 3000)
+        _, com_buffer = medir_operacoes(merge_sort_in_place, lista[:], comparacoes=False)
+        _, sem_buffer = medir_operacoes(merge_sort_in_place, lista[:], sem_buffer=True, comparacoes=False)
+        self.assertLess(sem_buffer.memoria_pico * 5, com_buffer.memoria_pico)
+    
+    def test_quick_sort_sem_estouro_de_pilha(self):
+        """
+        Testa que o pior caso do Quick Sort (lista ordenada, inversa ou com todos
+        os elementos iguais) continua quadrático no tempo, mas não na pilha.
+        """
+        n = 2 * sys.getrecursionlimit()
+        for formato in ("ordenada", "inversa", "todos_iguais"):
+            lista = gerar_lista(formato, n)
+            self.assertEqual(quick_sort(lista), sorted(lista), formato)
+    
+    def test_matador_da_mediana_de_tres(self):
+        """
+        Testa que a entrada gerada pelo adversário de McIlroy leva o Quick Sort
+        com mediana de três a um número quadrático de comparações.
+        """
+        class Contador:
+            comparacoes = 0
+            
+            def __init__(self, valor):
+                self.valor = valor
+            
+            def __lt__(self, outro):
+                Contador.comparacoes += 1
+                return self.valor < outro.valor
+            
+            def __gt__(self, outro):
+                Contador.comparacoes += 1
+                return self.valor > outro.valor
+        
+        n = 1000
+        for formato, minimo, maximo in (("matador_mediana_de_tres", n * n // 5, n * n),
+                                        ("aleatoria", 0, 20 * n * 10)):
+            Contador.comparacoes = 0
+            resultado = quick_sort_mediana_de_tres([Contador(v) for v in gerar_lista(formato, n)])
+            self.assertEqual([c.valor for c in resultado], sorted(gerar_lista(formato, n)))
+            self.assertGreaterEqual(Contador.comparacoes, minimo, formato)
+            self.assertLess(Contador.comparacoes, maximo, formato)
+
+
+class TestInstrumentacao(unittest.TestCase):
+    """
+    Classe de testes que confere as contagens de operações da instrumentação
+    contra os limites de complexidade documentados em cada algoritmo.
+    """
+    
+    n = 256
+    
+    def setUp(self):
+        self.aleatoria = gerar_lista("aleatoria", self.n)
+        self.ordenada = list(range(self.n))
+        self.inversa = self.ordenada[::-1]
+    
+    def test_simple_sorts(self):
+        """
+        Testa o Selection Sort (n(n-1)/2 comparações e no máximo n-1 trocas) e o
+        Bubble Sort otimizado em lista ordenada (uma passada de n-1 comparações).
+        """
+        n = self.n
+        resultado, relatorio = medir_operacoes(selection_sort, self.aleatoria)
+        self.assertEqual(resultado, sorted(self.aleatoria))
+        self.assertEqual(relatorio.comparacoes, n * (n - 1) // 2)
+        self.assertLessEqual(relatorio.movimentos, 2 * (n - 1))  # cada troca escreve duas posições
+        self.assertEqual(relatorio.profundidade_maxima, 1)
+        
+        _, relatorio = medir_operacoes(bubble_sort_otimizado, self.ordenada)
+        self.assertEqual((relatorio.comparacoes, relatorio.movimentos), (n - 1, 0))
+        _, relatorio = medir_operacoes(bubble_sort, self.inversa)
+        self.assertLessEqual(relatorio.comparacoes, n * (n - 1) // 2)
+        self.assertEqual(relatorio.movimentos, n * (n - 1))
+    
+    def test_insertion_sorts(self):
+        """
+        Testa o Insertion Sort no melhor caso (n-1 comparações) e no pior (n(n-1)/2),
+        e a versão binária com O(n log n) comparações.
+        """
+        n = self.n
+        _, melhor = medir_operacoes(insertion_sort, self.ordenada)
+        _, pior = medir_operacoes(insertion_sort, self.inversa)
+        self.assertEqual(melhor.comparacoes, n - 1)
+        self.assertEqual(pior.comparacoes, n * (n - 1) // 2)
+        _, binario = medir_operacoes(insertion_sort_binario, self.inversa)
+        self.assertLessEqual(binario.comparacoes, n * log2(n))
+        _, shell = medir_operacoes(shell_sort, self.aleatoria)
+        self.assertLess(shell.comparacoes, n ** 1.5)
+    
+    def test_divisao_e_conquista(self):
+        """
+        Testa o Merge Sort (no máximo n log n comparações e profundidade log n) e
+        a profundidade O(log n) do Quick Sort mesmo nas entradas de pior caso.
+        """
+        n = self.n
+        for lista in (self.aleatoria, self.ordenada, self.inversa):
+            resultado, relatorio = medir_operacoes(merge_sort, lista)
+            self.assertEqual(resultado, sorted(lista))
+            self.assertLessEqual(relatorio.comparacoes, n * log2(n))
+            self.assertLessEqual(relatorio.profundidade_maxima, log2(n) + 2)
+            self.assertGreater(relatorio.memoria_pico, 0)
+        
+        for func in (quick_sort, quick_sort_mediana_de_tres):
+            for formato in ("aleatoria", "ordenada", "todos_iguais", "matador_mediana_de_tres"):
+                lista = gerar_lista(formato, n)
+                resultado, relatorio = medir_operacoes(func, lista)
+                self.assertEqual(resultado, sorted(lista))
+                self.assertLessEqual(relatorio.profundidade_maxima, log2(n) + 3, f"{func.__name__} em {formato}")
+                self.assertLessEqual(relatorio.comparacoes, n * n, f"{func.__name__} em {formato}")
+    
+    def test_key_e_entrada_preservada(self):
+        """
+        Testa que comparações entre chaves são contadas e que a lista original
+        não é modificada.
+        """
+        livros = gerar_lista("aleatoria", 64, "livro")
+        copia = livros[:]
+        resultado, relatorio = medir_operacoes(merge_sort, livros, key=CHAVE_LIVRO)
+        self.assertEqual(resultado, sorted(livros, key=CHAVE_LIVRO))
+        self.assertEqual(livros, copia)
+        # Os pares (chave, posição) comparam as chaves com == e depois com <=
+        self.assertLessEqual(relatorio.comparacoes, 2 * 64 * 6)
+    
+    def test_desligada_sem_custo(self):
+        """
+        Testa que a instrumentação não deixa ganchos instalados, que as decisões
+        só são registradas durante uma medição e que o relatório é exportável.
+        """
+        rastreio, perfil = sys.gettrace(), sys.getprofile()
+        
+        def decide(lista):
+            registrar_decisao("ordenar", n=len(lista))
+            return sorted(lista)
+        
+        registrar_decisao("fora de uma medição")
+        _, relatorio = medir_operacoes(decide, [2, 1], memoria=False)
+        self.assertEqual((sys.gettrace(), sys.getprofile()), (rastreio, perfil))
+        self.assertEqual(relatorio.decisoes, [{"descricao": "ordenar", "n": 2}])
+        self.assertIsNone(relatorio.como_dict()["memoria_pico"])
+        self.assertIn("decide", tabela([relatorio]))
+
+
+class TestOrdenacaoAdaptativa(unittest.TestCase):
+    """
+    Classe de testes para a ordenação adaptativa (sort/adaptive_sort.py).
+    """
+    
+    def test_todos_os_formatos_e_tipos(self):
+        """
+        Testa a corretude em cada formato de entrada, com vários tipos e
+        tamanhos, sem modificar a lista original.
+        """
+        for n in (0, 1, 20, 1000):
+            for formato in FORMATOS:
+                for tipo in ("int", "float", "str"):
+                    lista = gerar_lista(formato, n, tipo)
+                    copia = lista[:]
+                    self.assertEqual(ordenar(lista), sorted(lista), f"{formato} ({tipo}, n={n})")
+                    self.assertEqual(lista, copia)
+        self.assertEqual(ordenar(range(5, 0, -1)), [1, 2, 3, 4, 5])
+    
+    def test_estabilidade(self):
+        """
+        Testa que elementos com chaves iguais mantêm a ordem de entrada em todos
+        os métodos, inclusive no Introsort.
+        """
+        for formato in FORMATOS:
+            livros = gerar_lista(formato, 600, "livro")
+            self.assertEqual(ordenar(livros, key=CHAVE_LIVRO), sorted(livros, key=CHAVE_LIVRO), formato)
+            # Chave com muitas repetições: só o primeiro dígito do título
+            chave = lambda livro: livro.titulo[-1]
+            self.assertEqual(ordenar(livros, key=chave), sorted(livros, key=chave), formato)
+    
+    def test_decisoes(self):
+        """
+        Testa o método escolhido para cada formato de entrada, registrado na
+        instrumentação com as características medidas.
+        """
+        esperado = {
+            "aleatoria": "introsort",
+            "ordenada": "copia",
+            "inversa": "inversao",
+            "quase_ordenada": "separacao",
+            "tubo_de_orgao": "corridas",
+            "poucos_unicos": "agrupamento",
+            "todos_iguais": "copia",
+            "matador_mediana_de_tres": "introsort",
+        }
+        for formato, metodo in esperado.items():
+            lista = gerar_lista(formato, 2000)
+            _, relatorio = medir_operacoes(ordenar, lista, memoria=False)
+            self.assertEqual(len(relatorio.decisoes), 1)
+            decisao = relatorio.decisoes[0]
+            self.assertEqual(decisao["descricao"], metodo, formato)
+            self.assertEqual(decisao["n"], 2000)
+        
+        # Poucas trocas entre vizinhos: poucas inversões, Insertion Sort
+        lista = list(range(5000))
+        for i in range(0, 5000, 500):
+            lista[i], lista[i + 1] = lista[i + 1], lista[i]
+        self.assertEqual(escolher(caracterizar(lista)), "insercao")
+        self.assertEqual(escolher(caracterizar(gerar_lista("aleatoria", 20))), "insercao")
+        self.assertIsNone(caracterizar([[1], [0]])["distintas"])  # listas não são hasheáveis
+    
+    def test_sem_pior_caso_quadratico(self):
+        """
+        Testa que a entrada matadora da mediana de três, quadrática para
+        quick_sort_mediana_de_tres, fica em O(n log n) comparações.
+        """
+        n = 4000
+        lista = gerar_lista("matador_mediana_de_tres", n)
+        resultado, relatorio = medir_operacoes(ordenar, lista, memoria=False)
+        self.assertEqual(resultado, sorted(lista))
+        # quick_sort_mediana_de_tres faz mais de n²/5 (ver TestPioresCasos)
+        self.assertLess(relatorio.comparacoes, 6 * n * log2(n))
+
+
+class TestOrdenacaoParalela(unittest.TestCase):
+    """
+    Classe de testes para a ordenação em vários processos (sort/parallel_sorts.py).
+    """
+    
+    def test_memoria_compartilhada_e_serializada(self):
+        """
+        Testa inteiros e floats (pela memória compartilhada), strings e inteiros
+        acima de 64 bits (serializados), em vários números de processos.
+        """
+        for tipo in ("int", "float", "str"):
+            for formato in ("aleatoria", "inversa", "poucos_unicos"):
+                lista = gerar_lista(formato, 3001, tipo)
+                copia = lista[:]
+                for processos in (2, 3):
+                    resultado = merge_sort_paralelo(lista, processos=processos, limite_serial=0)
+                    self.assertEqual(resultado, sorted(lista), f"{formato} ({tipo}, {processos} processos)")
+                self.assertEqual(lista, copia)
+        grandes = [x * 10 ** 20 for x in gerar_lista("aleatoria", 1000)]
+        self.assertEqual(merge_sort_paralelo(grandes, processos=2, limite_serial=0), sorted(grandes))
+        mistos = [1.5, 2, -3, 0.25] * 10
+        self.assertEqual(merge_sort_paralelo(mistos, processos=2, limite_serial=0), sorted(mistos))
+    
+    def test_key_estavel(self):
+        """
+        Testa a ordenação com key: estável entre trechos de processos diferentes.
+        """
+        livros = gerar_lista("poucos_unicos", 2000, "livro")
+        resultado = merge_sort_paralelo(livros, key=CHAVE_LIVRO, processos=4, limite_serial=0)
+        self.assertEqual(resultado, sorted(livros, key=CHAVE_LIVRO))
+        self.assertEqual([id(x) for x in resultado], [id(x) for x in sorted(livros, key=CHAVE_LIVRO)])
+    
+    def test_caminho_serial(self):
+        """
+        Testa listas abaixo do limite, vazias ou menores que o número de processos.
+        """
+        self.assertEqual(merge_sort_paralelo([3, 1, 2]), [1, 2, 3])
+        self.assertEqual(merge_sort_paralelo([], processos=4, limite_serial=0), [])
+        self.assertEqual(merge_sort_paralelo([2, 1], processos=4, limite_serial=0), [1, 2])
+        self.assertEqual(merge_sort_paralelo(range(10, 0, -1), processos=1, limite_serial=0), list(range(1, 11)))
+
+
+class TestOrdenacaoExterna(unittest.TestCase):
+    """
+    Classe de testes para a ordenação externa (sort/external_sort.py).
+    """
+    
+    def setUp(self):
+        # Registros "emprestimo,posição": muitas chaves repetidas
+        self.registros = [f"{x},{i}" for i, x in enumerate(gerar_lista("zipf", 3000))]
+        self.chave = lambda registro: int(registro.split(",")[0])
+        self.pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(self.pasta.cleanup)
+    
+    def test_corridas_e_passadas(self):
+        """
+        Testa a ordenação com várias corridas, com e sem passadas intermediárias
+        (fan-in menor que o número de corridas), e a estabilidade com key.
+        """
+        esperado = sorted(self.registros, key=self.chave)
+        for memoria_max, fan_in in ((10 ** 9, 64), (20000, 64), (20000, 3), (2000, 2)):
+            resultado = list(ordenar_externo(self.registros, key=self.chave, memoria_max=memoria_max,
+                                             fan_in=fan_in, pasta=self.pasta.name))
+            self.assertEqual(resultado, esperado, (memoria_max, fan_in))
+        self.assertEqual(list(ordenar_externo(iter(self.registros), memoria_max=5000)), sorted(self.registros))
+        self.assertEqual(list(ordenar_externo([])), [])
+        with self.assertRaises(ValueError):
+            list(ordenar_externo(self.registros, fan_in=1))
+    
+    def test_retorno_de_carro_nos_registros(self):
+        """
+        Testa que um "\r" dentro de um registro não o divide quando as corridas
+        vão para disco: o resultado não depende do orçamento de memória.
+        """
+        registros = ["b\rx", "a", "c\r", "\r", "a\r\rb"]
+        for memoria_max in (10 ** 9, 1):
+            resultado = list(ordenar_externo(registros, memoria_max=memoria_max, fan_in=2, pasta=self.pasta.name))
+            self.assertEqual(resultado, sorted(registros), memoria_max)
+    
+    def test_arquivos_temporarios(self):
+        """
+        Testa que as corridas vão para disco só quando a entrada passa do
+        orçamento e que são apagadas ao fim, mesmo se o gerador for abandonado.
+        """
+        gerador = ordenar_externo(self.registros, memoria_max=10000, pasta=self.pasta.name)
+        next(gerador)
+        (diretorio,) = os.listdir(self.pasta.name)
+        self.assertGreater(len(os.listdir(os.path.join(self.pasta.name, diretorio))), 1)
+        gerador.close()
+        self.assertEqual(os.listdir(self.pasta.name), [])
+        
+        gerador = ordenar_externo(self.registros, pasta=self.pasta.name)
+        next(gerador)
+        (diretorio,) = os.listdir(self.pasta.name)
+        self.assertEqual(os.listdir(os.path.join(self.pasta.name, diretorio)), [])
+        list(gerador)
+        self.assertEqual(os.listdir(self.pasta.name), [])
+    
+    def test_arquivo_para_arquivo(self):
+        """
+        Testa a ordenação de um arquivo em outro e no próprio arquivo de entrada.
+        """
+        entrada = os.path.join(self.pasta.name, "emprestimos.csv")
+        saida = os.path.join(self.pasta.name, "ordenado.csv")
+        with open(entrada, "w", encoding="utf-8") as arquivo:
+            arquivo.write("\n".join(self.registros))  # sem quebra de linha no fim
+        self.assertEqual(ordenar_arquivo(entrada, saida, key=self.chave, memoria_max=20000), 3000)
+        with open(saida, encoding="utf-8") as arquivo:
+            self.assertEqual(arquivo.read().splitlines(), sorted(self.registros, key=self.chave))
+        self.assertEqual(ordenar_arquivo(entrada, entrada, memoria_max=20000), 3000)
+        with open(entrada, encoding="utf-8") as arquivo:
+            self.assertEqual(arquivo.read().splitlines(), sorted(self.registros))
+
+        # "\r" dentro dos registros (e o de um "\r\n") sai como entrou
+        registros = ["b\rx", "a", "c\r", "\r", "a\r\rb", "d"]
+        with open(entrada, "wb") as arquivo:
+            arquivo.write("\n".join(registros).encode("utf-8") + b"\n")
+        for memoria_max in (10 ** 9, 1):
+            self.assertEqual(ordenar_arquivo(entrada, saida, memoria_max=memoria_max, fan_in=2), 6)
+            with open(saida, "rb") as arquivo:
+                self.assertEqual(arquivo.read(), "".join(r + "\n" for r in sorted(registros)).encode("utf-8"))
+
+
+class TestMesclaKVias(unittest.TestCase):
+    """
+    Classe de testes para a mescla de k vias (sort/kway_merge.py).
+    """
+    
+    def test_mescla(self):
+        """
+        Testa a mescla de listas, geradores e sequências vazias.
+        """
+        rng = random.Random(3)
+        for k in (0, 1, 2, 5, 40):
+            sequencias = [sorted(rng.randrange(100) for _ in range(rng.randrange(30))) for _ in range(k)]
+            esperado = sorted(x for s in sequencias for x in s)
+            self.assertEqual(list(mesclar_k(*sequencias)), esperado, k)
+            self.assertEqual(list(mesclar_k(*(iter(s) for s in sequencias))), esperado, k)
+        self.assertEqual(list(mesclar_k([], [1], [])), [1])
+    
+    def test_estabilidade_com_key(self):
+        """
+        Testa que elementos de chave igual saem na ordem das sequências e, dentro
+        de cada uma, na ordem original, sem comparar os elementos em si.
+        """
+        filiais = [[(chave, filial, i) for i, chave in enumerate(sorted(random.Random(filial).choices(range(10), k=50)))]
+                   for filial in range(6)]
+        chave = lambda registro: registro[0]
+        resultado = list(mesclar_k(*filiais, key=chave))
+        self.assertEqual(resultado, sorted((r for f in filiais for r in f), key=chave))
+        livros = [merge_sort(gerar_lista("poucos_unicos", 100, "livro", semente), key=CHAVE_LIVRO) for semente in (1, 2)]
+        self.assertEqual(list(mesclar_k(*livros, key=CHAVE_LIVRO)), sorted(livros[0] + livros[1], key=CHAVE_LIVRO))
+    
+    def test_sob_demanda(self):
+        """
+        Testa que a mescla funciona com sequências infinitas e lê no máximo um
+        elemento à frente de cada sequência.
+        """
+        lidos = [0, 0, 0]
+        
+        def multiplos(passo, indice):
+            x = 0
+            while True:
+                lidos[indice] += 1
+                yield x
+                x += passo
+        
+        mescla = mesclar_k(multiplos(2, 0), multiplos(3, 1), multiplos(5, 2))
+        primeiros = [next(mescla) for _ in range(10)]
+        self.assertEqual(primeiros, [0, 0, 0, 2, 3, 4, 5, 6, 6, 8])
+        self.assertLessEqual(sum(lidos), 10 + 3)
+
+
+class TestSelecao(unittest.TestCase):
+    """
+    Classe de testes para a seleção e a ordenação parcial (sort/partial_sorts.py).
+    """
+    
+    def test_k_esimo(self):
+        """
+        Testa k_esimo contra a lista ordenada em todos os formatos de entrada.
+        """
+        for formato in FORMATOS:
+            lista = gerar_lista(formato, 500)
+            copia = list(lista)
+            ordenada = sorted(lista)
+            for k in (0, 1, 250, 498, 499):
+                self.assertEqual(k_esimo(lista, k), ordenada[k], (formato, k))
+            self.assertEqual(lista, copia)
+        with self.assertRaises(IndexError):
+            k_esimo([1, 2, 3], 3)
+        with self.assertRaises(IndexError):
+            k_esimo([], 0)
+    
+    def test_sort_parcial(self):
+        """
+        Testa sort_parcial e selecionar_k_menores nos dois caminhos (heap para k
+        pequeno, Introselect para k grande) e com k nas bordas.
+        """
+        for formato in FORMATOS:
+            lista = gerar_lista(formato, 1000)
+            ordenada = sorted(lista)
+            for k in (0, 1, 10, 300, 999, 1000, 1500):
+                self.assertEqual(sort_parcial(lista, k), ordenada[:k], (formato, k))
+                self.assertEqual(sorted(selecionar_k_menores(lista, k)), ordenada[:k], (formato, k))
+    
+    def test_estabilidade_com_key(self):
+        """
+        Testa que, com key, o resultado é o mesmo de sorted(lista, key=key)[:k],
+        inclusive entre chaves iguais na fronteira.
+        """
+        livros = gerar_lista("poucos_unicos", 600, "livro")
+        for k in (5, 100, 400):
+            esperado = sorted(livros, key=CHAVE_LIVRO)[:k]
+            self.assertEqual(sort_parcial(livros, k, key=CHAVE_LIVRO), esperado, k)
+            self.assertEqual(k_esimo(livros, k, key=CHAVE_LIVRO), sorted(livros, key=CHAVE_LIVRO)[k], k)
+            selecionados = selecionar_k_menores(livros, k, key=CHAVE_LIVRO)
+            # Sem ordem entre eles: compara quais livros foram selecionados
+            self.assertEqual({id(livro) for livro in selecionados}, {id(livro) for livro in esperado}, k)
+    
+    def test_iteravel_sem_tamanho(self):
+        """
+        Testa que geradores são aceitos (seleção por heap).
+        """
+        self.assertEqual(sort_parcial((x * 7 % 101 for x in range(101)), 5), [0, 1, 2, 3, 4])
+        self.assertEqual(sorted(selecionar_k_menores(iter([3, 1, 2]), 2)), [1, 2])
+    
+    def test_pior_caso_linear(self):
+        """
+        Testa que o número de comparações de k_esimo cresce linearmente, mesmo nas
+        entradas que levam o Quickselect a O(n²) (todos iguais, matador da
+        mediana de três, tubo de órgão).
+        """
+        for formato in ("todos_iguais", "matador_mediana_de_tres", "tubo_de_orgao", "aleatoria"):
+            n = 2000
+            lista = gerar_lista(formato, n)
+            resultado, relatorio = medir_operacoes(k_esimo, lista, n // 2, memoria=False)
+            self.assertEqual(resultado, sorted(lista)[n // 2])
+            self.assertLessEqual(relatorio.comparacoes, 30 * n, formato)
+
+
+class TestOrdenacaoSemComparacao(unittest.TestCase):
+    """
+    Classe de testes para o Counting Sort e os Radix Sorts (sort/radix_sorts.py).
+    """
+    
+    def test_inteiros(self):
+        """
+        Testa counting_sort e radix_sort_lsd em todos os formatos de entrada,
+        com negativos, com inteiros além de 64 bits e com listas triviais.
+        """
+        for formato in FORMATOS:
+            lista = gerar_lista(formato, 1000)
+            copia = list(lista)
+            for valores in (lista, [x - 5000 for x in lista]):
+                self.assertEqual(counting_sort(valores), sorted(valores), formato)
+                self.assertEqual(radix_sort_lsd(valores), sorted(valores), formato)
+                self.assertEqual(radix_sort_lsd(valores, bits=3), sorted(valores), formato)
+            self.assertEqual(lista, copia)
+        rng = random.Random(5)
+        grandes = [rng.randrange(-2 ** 80, 2 ** 80) for _ in range(500)]
+        self.assertEqual(radix_sort_lsd(grandes), sorted(grandes))
+        self.assertEqual(radix_sort_lsd(grandes, key=abs), sorted(grandes, key=abs))
+        for funcao in (counting_sort, radix_sort_lsd, radix_sort_msd):
+            self.assertEqual(funcao([]), [])
+        self.assertEqual(counting_sort([7]), [7])
+        self.assertEqual(radix_sort_lsd([7, 7, 7]), [7, 7, 7])
+    
+    def test_strings(self):
+        """
+        Testa radix_sort_msd em todos os formatos, com prefixos comuns, chaves
+        que são prefixo de outras e bytes.
+        """
+        for formato in FORMATOS:
+            lista = gerar_lista(formato, 1000, "str")
+            self.assertEqual(radix_sort_msd(lista), sorted(lista), formato)
+        rng = random.Random(6)
+        palavras = ["".join(rng.choice("abc") for _ in range(rng.randrange(7))) for _ in range(3000)]
+        self.assertEqual(radix_sort_msd(palavras), sorted(palavras))
+        codigos = [f"L{i:03d}" for i in range(500)] + ["L", "L0", "L00", "A", ""]
+        rng.shuffle(codigos)
+        self.assertEqual(radix_sort_msd(codigos), sorted(codigos))
+        self.assertEqual(radix_sort_msd([p.encode() for p in palavras]), sorted(p.encode() for p in palavras))
+    
+    def test_estabilidade_com_key(self):
+        """
+        Testa que, com key, o resultado é o mesmo de sorted(lista, key=key),
+        inclusive na ordem entre chaves iguais.
+        """
+        livros = gerar_lista("poucos_unicos", 2000, "livro")
+        for chave in (CHAVE_LIVRO, lambda livro: livro.autor):
+            self.assertEqual(radix_sort_msd(livros, key=chave), sorted(livros, key=chave))
+        numero = lambda livro: int(livro.titulo.split()[1])
+        for funcao in (counting_sort, radix_sort_lsd):
+            self.assertEqual(funcao(livros, key=numero), sorted(livros, key=numero))
+            self.assertEqual(funcao(livros, key=lambda livro: -numero(livro) % 7),
+                             sorted(livros, key=lambda livro: -numero(livro) % 7))
+        palavras = ["b", "A", "a", "B", "ab", "Ab"] * 20
+        self.assertEqual(radix_sort_msd(palavras, key=str.lower), sorted(palavras, key=str.lower))
+    
+    def test_subclasses_de_int(self):
+        """
+        Testa que, sem key, bool e IntEnum voltam como os próprios elementos,
+        com o tipo preservado e na ordem estável de sorted.
+        """
+        Prioridade = IntEnum("Prioridade", [("BAIXA", 1), ("ALTA", 3)])
+        mistura = [Prioridade.ALTA, True, 2, False, Prioridade.BAIXA, 1, 3]
+        for funcao in (counting_sort, radix_sort_lsd):
+            resultado = funcao([True, False])
+            self.assertEqual(resultado, [False, True])
+            self.assertTrue(all(type(x) is bool for x in resultado))
+            resultado = funcao(mistura)
+            self.assertEqual(resultado, sorted(mistura))
+            self.assertEqual(list(map(type, resultado)), list(map(type, sorted(mistura))))
+    
+    def test_chaves_invalidas(self):
+        """
+        Testa que chaves não inteiras são rejeitadas pelos algoritmos de inteiros.
+        """
+        for funcao in (counting_sort, radix_sort_lsd):
+            with self.assertRaises(TypeError):
+                funcao([1.5, 0.5, 2.5])
+
+
 if __name__ == "__main__":
     unittest.main()